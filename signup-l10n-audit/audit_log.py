@@ -0,0 +1,62 @@
+"""
+Audit Logging
+One levelled logger tree ("l10n_audit") for everything the audit reports
+
+Messages keep the audit's own markers ([+], [X], [!], [i], [DEBUG]) and are
+written without level/time prefixes, so the console looks the same as before.
+What changes is that the level decides what is written at all:
+- DEBUG: candidate lists, raw LLM answers, pattern counts (off by default)
+- INFO: the audit narrative and the final report
+- WARNING/ERROR: failures of the audit itself (LLM errors, exceptions)
+Arguments are %-formatted only when a record is actually emitted, so disabled
+DEBUG lines cost one level check.
+
+The default handler writes to whatever sys.stdout is at emit time, so the
+parallel runner's per-thread capture (_ThreadOutput) keeps working.
+"""
+
+import logging
+import sys
+
+LOGGER_NAME = 'l10n_audit'
+
+_root = logging.getLogger(LOGGER_NAME)
+
+
+class _CurrentStdout(logging.StreamHandler):
+    """StreamHandler bound to sys.stdout as it is when each record is written"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure(level=logging.INFO, stream=None):
+    """
+    Set the audit's log level and destination (replaces any earlier configuration)
+    Args:
+        level: logging level or name ('DEBUG', 'INFO', 'WARNING', ...)
+        stream: File-like to write to (default: the current sys.stdout)
+    """
+    for handler in list(_root.handlers):
+        _root.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream) if stream is not None else _CurrentStdout()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _root.addHandler(handler)
+    _root.setLevel(level.upper() if isinstance(level, str) else level)
+    _root.propagate = False
+
+
+def get_logger(name=None):
+    """Logger under the audit tree; configures INFO to stdout on first use if nobody else did"""
+    if not _root.handlers:
+        configure()
+    return _root.getChild(name) if name else _root
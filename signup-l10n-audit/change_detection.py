@@ -0,0 +1,180 @@
+"""
+Change Detection for Incremental Re-Audits
+Reuses a site's stored result when its homepage and signup page haven't changed
+
+After every completed audit, the homepage and the discovered signup URL are
+fingerprinted over plain HTTP (same Accept-Language as the audit): ETag,
+Last-Modified and a hash of the normalised page (visible text, <html lang>,
+hreflang alternates; digits collapsed so dates, counters and cache-busters
+don't count as changes). The next run asks each page conditionally - a 304 or
+an identical hash on every page means the stored result and verdict still hold,
+and only sites that changed go through the browser again.
+
+Results older than max_age_days are re-audited regardless, and failed audits
+(ERROR/TIMEOUT/KILLED) are never reused.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import http_precheck
+from checkpoint import RETRY_STATUSES
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'page_fingerprints.sqlite')
+
+DIGITS = re.compile(r'\d+')
+
+
+def normalised_hash(html_lang, hreflang, text):
+    """Hash of what the audit looks at, ignoring markup, scripts and digit runs"""
+    payload = json.dumps({
+        'lang': (html_lang or '').lower(),
+        'hreflang': sorted((hreflang or {}).keys()),
+        'text': DIGITS.sub('0', text)
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def fingerprint(url, locale, previous=None, session=None, timeout=10, max_bytes=1_000_000):
+    """
+    Conditional GET of url as a visitor preferring locale
+    Returns: {'etag', 'last_modified', 'hash'} (previous itself on 304), or None when the
+             page can't be fetched (treated as changed)
+    """
+    session = session or http_precheck.get_session()
+    headers = {'Accept-Language': http_precheck.accept_language(locale)}
+    if previous:
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+
+    try:
+        response = session.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=True)
+        if response.status_code == 304 and previous:
+            response.close()
+            return previous
+        body = b''
+        for chunk in response.iter_content(chunk_size=65536):
+            body += chunk
+            if len(body) >= max_bytes:
+                break
+        response.close()
+    except requests.RequestException:
+        return None
+
+    if response.status_code != 200:
+        return None
+
+    parser = http_precheck._PageParser(max_chars=100_000)
+    try:
+        parser.feed(http_precheck.decode_body(body, response.headers.get('Content-Type', '')))
+    except Exception:
+        pass  # Broken markup: hash whatever was parsed
+
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'hash': normalised_hash(parser.html_lang or response.headers.get('Content-Language'),
+                                parser.hreflang, parser.text)
+    }
+
+
+class ChangeDetector:
+    """
+    Usage:
+        detector = ChangeDetector()
+        unchanged = detector.check_many(sites, locale)   # {site: stored result}
+        ... audit the other sites ...
+        detector.store(site, locale, result)             # after each completed audit
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_age_days=7, concurrency=16):
+        """
+        Args:
+            path: SQLite file (':memory:' for a throwaway store)
+            max_age_days: Stored results older than this are re-audited even if nothing changed
+            concurrency: Sites checked at once by check_many()
+        """
+        self.max_age = max_age_days * 86400
+        self.concurrency = concurrency
+        self.reused = 0
+        self.changed = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                site TEXT NOT NULL,
+                locale TEXT NOT NULL,
+                pages TEXT NOT NULL,
+                record TEXT NOT NULL,
+                audited REAL NOT NULL,
+                PRIMARY KEY (site, locale)
+            )
+        """)
+        self._db.commit()
+
+    @staticmethod
+    def _pages_of(site, result):
+        homepage = site if site.startswith(('http://', 'https://')) else f"https://{site}"
+        pages = [homepage]
+        if result.get('signup_url') and result['signup_url'] != homepage:
+            pages.append(result['signup_url'])
+        return pages
+
+    def store(self, site, locale, result):
+        """Fingerprint the audited pages and keep result for reuse (failed audits are skipped)"""
+        if result.get('status') in RETRY_STATUSES:
+            return
+
+        pages = {}
+        for url in self._pages_of(site, result):
+            page = fingerprint(url, locale)
+            if page is None:
+                return  # Can't tell later whether it changed; don't offer it for reuse
+            pages[url] = page
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fingerprints (site, locale, pages, record, audited) VALUES (?, ?, ?, ?, ?)",
+                (site, locale, json.dumps(pages), json.dumps(result, ensure_ascii=False, default=str), time.time())
+            )
+            self._db.commit()
+
+    def check(self, site, locale):
+        """Stored result if every fingerprinted page is unchanged and it is fresh enough, else None"""
+        with self._lock:
+            row = self._db.execute("SELECT pages, record, audited FROM fingerprints WHERE site = ? AND locale = ?",
+                                   (site, locale)).fetchone()
+        if row is None or time.time() - row[2] > self.max_age:
+            return None
+
+        pages = json.loads(row[0])
+        for url, previous in pages.items():
+            current = fingerprint(url, locale, previous)
+            if current is None or current['hash'] != previous['hash']:
+                return None
+        return json.loads(row[1])
+
+    def check_many(self, sites, locale):
+        """check() for many sites concurrently; returns {site: stored result} for the unchanged ones"""
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='change-check') as pool:
+            stored = dict(zip(sites, pool.map(lambda site: self.check(site, locale), sites)))
+
+        unchanged = {site: record for site, record in stored.items() if record is not None}
+        self.reused += len(unchanged)
+        self.changed += len(sites) - len(unchanged)
+        return unchanged
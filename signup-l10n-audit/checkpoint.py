@@ -0,0 +1,164 @@
+"""
+Suite Run Checkpoints
+Durable per-site results, so a crashed or interrupted suite run resumes where it stopped
+
+Every finished site is written (and committed) to SQLite the moment its audit
+ends, keyed by (run_id, site, locale). Restarting with the same run id skips
+the sites that already have a final result and retries the failed ones:
+ERROR/TIMEOUT/KILLED results are retried up to max_attempts times, each retry waiting
+backoff * backoff_factor^(attempts - 1) seconds after the last failure.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import audit_log
+
+log = audit_log.get_logger('checkpoint')
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'suite_runs.sqlite')
+
+# Results worth another attempt; everything else (EXCELLENT, POOR, UNKNOWN, ...) is final
+RETRY_STATUSES = {'ERROR', 'TIMEOUT', 'KILLED'}
+
+
+def latest_run(path=DEFAULT_PATH):
+    """Id of the most recently updated run in path, or None"""
+    if path != ':memory:' and not os.path.exists(path):
+        return None
+    db = sqlite3.connect(path)
+    try:
+        row = db.execute("SELECT run_id FROM sites ORDER BY updated DESC LIMIT 1").fetchone()
+    except sqlite3.OperationalError:
+        row = None  # No table yet
+    finally:
+        db.close()
+    return row[0] if row else None
+
+
+class SuiteCheckpoint:
+    """
+    Usage:
+        checkpoint = SuiteCheckpoint(run_id=latest_run() if resume else None)
+        for batch in checkpoint.rounds(sites, locale):   # waits out retry backoff between rounds
+            for site in batch:
+                checkpoint.record(site, locale, audit(site))
+        results = checkpoint.results(sites, locale)
+    """
+
+    def __init__(self, path=DEFAULT_PATH, run_id=None, max_attempts=3, backoff=30.0, backoff_factor=2.0):
+        """
+        Args:
+            path: SQLite file (':memory:' keeps retries but nothing survives the process)
+            run_id: Run to resume; None starts a new, timestamped one
+            max_attempts: Attempts per site before an ERROR/TIMEOUT/KILLED result is accepted as final
+            backoff: Seconds to wait after a site's first failure before retrying it
+            backoff_factor: Multiplier for the wait after each further failure
+        """
+        self.path = path
+        self.run_id = run_id or time.strftime('%Y%m%d_%H%M%S')
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sites (
+                run_id TEXT NOT NULL,
+                site TEXT NOT NULL,
+                locale TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                record TEXT NOT NULL,
+                updated REAL NOT NULL,
+                next_attempt REAL,
+                PRIMARY KEY (run_id, site, locale)
+            )
+        """)
+        self._db.commit()
+
+    def record(self, site, locale, result):
+        """Store a finished audit's result dict (committed before returning)"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT attempts FROM sites WHERE run_id = ? AND site = ? AND locale = ?",
+                (self.run_id, site, locale)
+            ).fetchone()
+            attempts = (row[0] if row else 0) + 1
+
+            next_attempt = None
+            if result['status'] in RETRY_STATUSES and attempts < self.max_attempts:
+                next_attempt = now + self.backoff * self.backoff_factor ** (attempts - 1)
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO sites (run_id, site, locale, status, attempts, record, updated, next_attempt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, site, locale, result['status'], attempts,
+                 json.dumps(result, ensure_ascii=False, default=str), now, next_attempt)
+            )
+            self._db.commit()
+
+    def _rows(self, locale):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT site, status, attempts, next_attempt FROM sites WHERE run_id = ? AND locale = ?",
+                (self.run_id, locale)
+            ).fetchall()
+        return {site: (status, attempts, next_attempt) for site, status, attempts, next_attempt in rows}
+
+    def pending(self, sites, locale):
+        """Sites still needing an attempt: never run, or failed with attempts left (in `sites` order)"""
+        rows = self._rows(locale)
+        return [site for site in sites if site not in rows or rows[site][2] is not None]
+
+    def seconds_until_due(self, sites, locale):
+        """How long until the earliest of these sites may be (re)tried; 0 if any never ran"""
+        rows = self._rows(locale)
+        due = [self._due(rows, site) for site in sites]
+        return max(0.0, min(due) - time.time()) if due else 0.0
+
+    @staticmethod
+    def _due(rows, site):
+        return (rows[site][2] or 0) if site in rows else 0
+
+    def rounds(self, sites, locale):
+        """
+        Yield batches of sites to audit until every site has a final result;
+        sleeps out the retry backoff between rounds. Record each result before asking for the next batch.
+        """
+        while True:
+            pending = self.pending(sites, locale)
+            if not pending:
+                return
+            wait = self.seconds_until_due(pending, locale)
+            if wait:
+                log.info("Retrying %s failed site(s), next in %.0fs...", len(pending), wait)
+                time.sleep(wait)
+            rows, now = self._rows(locale), time.time()
+            yield [site for site in pending if self._due(rows, site) <= now]
+
+    def results(self, sites, locale):
+        """{site: latest result dict} for the sites of this run that have one"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT site, record FROM sites WHERE run_id = ? AND locale = ?",
+                (self.run_id, locale)
+            ).fetchall()
+        records = {site: json.loads(record) for site, record in rows}
+        return {site: records[site] for site in sites if site in records}
+
+    def progress(self, sites, locale):
+        """{'done', 'retrying', 'not_started'} counts for these sites"""
+        rows = self._rows(locale)
+        retrying = sum(1 for site in sites if site in rows and rows[site][2] is not None)
+        done = sum(1 for site in sites if site in rows) - retrying
+        return {'done': done, 'retrying': retrying, 'not_started': len(sites) - done - retrying}
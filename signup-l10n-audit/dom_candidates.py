@@ -0,0 +1,127 @@
+"""
+Batched DOM Candidate Extraction
+Collects button/link/select candidates in ONE execute_script round trip
+
+Calling is_displayed(), .text, tag_name and get_attribute() per element costs
+one WebDriver HTTP round trip each, which is thousands of calls on a large
+page. Here the browser does the filtering and returns a compact list; each
+candidate carries a handle (a data attribute stamped on the element) that
+resolve() turns back into a WebElement only for the one we actually click.
+"""
+
+from selenium.webdriver.common.by import By
+
+HANDLE_ATTR = 'data-l10n-id'
+
+# Shared helpers: visibility roughly matching Selenium's is_displayed(),
+# and a handle stamped on the element so it can be found again later.
+HELPERS_JS = """
+var HANDLE = '%s';
+window.__l10nHandleSeq = window.__l10nHandleSeq || 0;
+function visible(el) {
+    if (el.checkVisibility && !el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})) return false;
+    var r = el.getBoundingClientRect();
+    if (r.width <= 0 || r.height <= 0) return false;
+    var s = window.getComputedStyle(el);
+    return s.visibility !== 'hidden' && s.display !== 'none' && parseFloat(s.opacity) > 0;
+}
+function handle(el) {
+    var h = el.getAttribute(HANDLE);
+    if (!h) { h = String(++window.__l10nHandleSeq); el.setAttribute(HANDLE, h); }
+    return h;
+}
+function box(el) {
+    var r = el.getBoundingClientRect();
+    return [Math.round(r.left + window.scrollX), Math.round(r.top + window.scrollY),
+            Math.round(r.width), Math.round(r.height)];
+}
+""" % HANDLE_ATTR
+
+CLICKABLES_JS = HELPERS_JS + """
+var minLen = arguments[0], maxLen = arguments[1], out = [];
+['button', 'a'].forEach(function (tag) {
+    var els = document.getElementsByTagName(tag);
+    for (var i = 0; i < els.length; i++) {
+        var el = els[i];
+        if (!visible(el)) continue;
+        var text = (el.innerText || '').split(/\\s+/).join(' ').trim();
+        if (text.length < minLen || text.length > maxLen) continue;
+        out.push({
+            text: text,
+            tag: tag,
+            href: tag === 'a' ? el.href || null : null,
+            box: box(el),
+            aria: el.getAttribute('aria-label'),
+            handle: handle(el)
+        });
+    }
+});
+return out;
+"""
+
+SELECTS_JS = HELPERS_JS + """
+var maxOptions = arguments[0], out = [];
+var els = document.getElementsByTagName('select');
+for (var i = 0; i < els.length; i++) {
+    var el = els[i], options = [];
+    for (var j = 0; j < el.options.length && options.length < maxOptions; j++) {
+        options.push((el.options[j].text || '').trim());
+    }
+    if (!options.length) continue;
+    out.push({
+        id: el.id || 'no-id',
+        name: el.getAttribute('name') || 'no-name',
+        options: options,
+        visible: visible(el),
+        aria: el.getAttribute('aria-label'),
+        handle: handle(el)
+    });
+}
+return out;
+"""
+
+# Same patterns (and order) as SignupLocalizationAudit.find_locale_selector used
+# to try one find_element() at a time
+LOCALE_SELECTORS_JS = HELPERS_JS + """
+var found = [], seen = [];
+function first(el) { if (el && seen.indexOf(el) < 0 && visible(el)) { seen.push(el); found.push(handle(el)); } }
+['country', 'country_code', 'language', 'locale'].forEach(function (id) { first(document.getElementById(id)); });
+['country', 'language', 'locale'].forEach(function (name) { first(document.getElementsByName(name)[0]); });
+['select[data-locale]', 'select[data-language]', 'select[data-country]',
+ "select[id*='lang']", "select[id*='country']"].forEach(function (css) { first(document.querySelector(css)); });
+return found;
+"""
+
+
+def extract_clickables(driver, min_length=3, max_length=100):
+    """
+    Visible <button> and <a> candidates in DOM order (buttons first, like the old loop)
+    Each: {'text', 'tag', 'href', 'box': [x, y, w, h], 'aria', 'handle'}
+    """
+    return driver.execute_script(CLICKABLES_JS, min_length, max_length) or []
+
+
+def extract_selects(driver, max_options=5):
+    """
+    <select> candidates with their first options
+    Each: {'id', 'name', 'options', 'visible', 'aria', 'handle'}
+    """
+    return driver.execute_script(SELECTS_JS, max_options) or []
+
+
+def extract_locale_selectors(driver):
+    """Handles of visible elements matching the standard country/language/locale patterns"""
+    return driver.execute_script(LOCALE_SELECTORS_JS) or []
+
+
+def select_options(driver, select_element):
+    """(value, text) of every option of a <select>, in one round trip"""
+    return driver.execute_script(
+        "return Array.prototype.map.call(arguments[0].options, function (o) { return [o.value, o.text]; });",
+        select_element
+    ) or []
+
+
+def resolve(driver, handle):
+    """WebElement for a candidate handle (raises NoSuchElementException if it left the DOM)"""
+    return driver.find_element(By.CSS_SELECTOR, f'[{HANDLE_ATTR}="{handle}"]')
@@ -0,0 +1,312 @@
+"""
+WebDriver Session Pool
+Keeps warm Chrome instances and leases them to audits instead of launching
+a new browser per site
+
+Browsers are keyed by locale because --lang and intl.accept_languages are
+fixed at launch. Between leases a browser is wiped (cookies, cache, extra
+tabs, and the storage of every origin it loaded a document from) and it is
+recycled after `max_uses` sites or when its process tree grows past `max_rss_mb`.
+"""
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+import audit_log
+
+try:
+    import psutil  # Optional: enables the memory-based recycling
+except ImportError:
+    psutil = None
+
+log = audit_log.get_logger('driver_pool')
+
+
+def build_chrome_options(locale=None, headless=False, profile_dir=None):
+    """Chrome options shared by direct launches and the pool"""
+    chrome_options = Options()
+    chrome_options.add_argument("--no-first-run")
+    chrome_options.add_argument("--no-default-browser-check")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+
+    # CDP Network events for readiness.PageReadiness (network-idle detection)
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
+
+    if profile_dir:
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+
+    if locale:
+        chrome_options.add_argument(f"--lang={locale}")
+        chrome_options.add_experimental_option('prefs', {
+            'intl.accept_languages': f'{locale},{locale}-{locale.upper()}'
+        })
+
+    return chrome_options
+
+
+def launch_chrome(locale=None, headless=False, profile_dir=None):
+    """Start a Chrome driver with the given locale preference"""
+    driver = webdriver.Chrome(options=build_chrome_options(locale, headless, profile_dir))
+    if not headless:
+        driver.maximize_window()
+    return driver
+
+
+def _origin(url):
+    """'https://accounts.site.com/signup?x=1' -> 'https://accounts.site.com' (None for about:, data:, ...)"""
+    parts = urlsplit(url or '')
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def driver_rss_mb(driver):
+    """Resident memory of chromedriver + all Chrome processes it spawned, in MB (None without psutil)"""
+    if psutil is None:
+        return None
+
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except Exception:
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except Exception:
+            continue  # Renderer exited while we were walking the tree
+    return total / (1024 * 1024)
+
+
+class _PooledDriver:
+    """Bookkeeping for one pooled browser"""
+
+    def __init__(self, driver, locale, profile_dir):
+        self.driver = driver
+        self.locale = locale
+        self.profile_dir = profile_dir
+        self.uses = 0
+        self.origins = set()  # Origins of documents loaded during the current lease (storage to wipe)
+        self.created = time.monotonic()
+        self.released = self.created
+
+
+class DriverPool:
+    """
+    Thread-safe pool of warm Chrome drivers keyed by locale
+
+    Usage:
+        pool = DriverPool(headless=True)
+        with pool.lease('es') as driver:
+            driver.get(url)
+        pool.close()
+    """
+
+    def __init__(self, headless=True, max_uses=25, max_rss_mb=1500, max_idle=4):
+        """
+        Args:
+            headless: Launch pooled browsers headless
+            max_uses: Recycle a browser after this many leases
+            max_rss_mb: Recycle a browser whose process tree exceeds this (needs psutil)
+            max_idle: Idle browsers kept across all locales; least recently used are closed
+        """
+        self.headless = headless
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.max_idle = max_idle
+
+        self._lock = threading.Lock()
+        self._idle = {}    # locale -> [_PooledDriver]
+        self._leased = {}  # id(driver) -> _PooledDriver
+        self._closed = False
+
+        self.stats = {'launched': 0, 'reused': 0, 'recycled': 0, 'reset_failures': 0}
+
+    def acquire(self, locale=None):
+        """Lease a browser for `locale`, reusing an idle one when possible"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DriverPool is closed")
+
+            idle = self._idle.get(locale)
+            entry = idle.pop() if idle else None
+            if entry:
+                self.stats['reused'] += 1
+                self._leased[id(entry.driver)] = entry
+
+        if entry:
+            return entry.driver
+
+        profile_dir = tempfile.mkdtemp(prefix='l10n-pool-')
+        try:
+            driver = launch_chrome(locale, self.headless, profile_dir)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+        entry = _PooledDriver(driver, locale, profile_dir)
+        with self._lock:
+            self.stats['launched'] += 1
+            self._leased[id(driver)] = entry
+
+        return driver
+
+    def release(self, driver):
+        """Return a leased browser; it is wiped and kept warm, or retired"""
+        with self._lock:
+            entry = self._leased.pop(id(driver), None)
+
+        if entry is None:
+            return
+
+        entry.uses += 1
+
+        if self._closed or not self._should_keep(entry) or not self._reset(entry):
+            self._retire(entry)
+            return
+
+        entry.released = time.monotonic()
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(entry.locale, []).append(entry)
+            evicted = self._evict_excess_idle()
+
+        for old in evicted:
+            self._retire(old)
+
+    def origin_recorder(self, driver):
+        """
+        Listener for PageReadiness.listeners: remembers the origin of every document (pages
+        and frames) the leased browser loads, so release() can wipe storage for all of them
+        """
+        with self._lock:
+            entry = self._leased.get(id(driver))
+
+        def record(method, params):
+            if entry is not None and method == 'Network.requestWillBeSent':
+                origin = _origin(params.get('documentURL'))
+                if origin:
+                    entry.origins.add(origin)
+
+        return record
+
+    @contextmanager
+    def lease(self, locale=None):
+        """Context manager around acquire()/release()"""
+        driver = self.acquire(locale)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit every idle browser; leased ones are quit when released"""
+        with self._lock:
+            self._closed = True
+            idle = [entry for entries in self._idle.values() for entry in entries]
+            self._idle.clear()
+
+        for entry in idle:
+            self._retire(entry, recycled=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _should_keep(self, entry):
+        if entry.uses >= self.max_uses:
+            return False
+
+        rss = driver_rss_mb(entry.driver)
+        if rss is not None and rss > self.max_rss_mb:
+            log.info("  [i] Recycling browser (%.0f MB after %s site(s))", rss, entry.uses)
+            return False
+
+        return True
+
+    def _reset(self, entry):
+        """Wipe all per-site state so the next audit starts like a fresh profile"""
+        driver = entry.driver
+        try:
+            # Close popups/new tabs opened by the last site
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # Storage of every origin the site touched: the ones recorded during the lease,
+            # the one we are on, and any still sitting in the undrained performance log.
+            # The audit can end on another origin (accounts.site.com) than the homepage's.
+            origins = set(entry.origins)
+            origins.add(_origin(driver.execute_script("return window.location.href")))
+            try:
+                for log_entry in driver.get_log('performance'):
+                    try:
+                        params = json.loads(log_entry['message'])['message'].get('params', {})
+                    except (KeyError, ValueError):
+                        continue
+                    origins.add(_origin(params.get('documentURL')))
+            except Exception:
+                pass
+            origins.discard(None)
+            for origin in origins:
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                    'origin': origin,
+                    'storageTypes': 'all'
+                })
+            entry.origins.clear()
+
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})  # ResourcePolicy of the last site
+
+            driver.get('about:blank')
+
+            # Drop the previous site's buffered CDP events so they don't skew network-idle
+            try:
+                driver.get_log('performance')
+            except Exception:
+                pass
+            return True
+
+        except Exception:
+            with self._lock:
+                self.stats['reset_failures'] += 1
+            return False
+
+    def _evict_excess_idle(self):
+        """Pop least recently released idle entries beyond max_idle (call with lock held)"""
+        idle = sorted((entry for entries in self._idle.values() for entry in entries),
+                      key=lambda entry: entry.released)
+        evicted = idle[:max(0, len(idle) - self.max_idle)]
+        for entry in evicted:
+            self._idle[entry.locale].remove(entry)
+        return evicted
+
+    def _retire(self, entry, recycled=True):
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass  # Browser already gone (crash or abort)
+        shutil.rmtree(entry.profile_dir, ignore_errors=True)
+        if recycled:
+            with self._lock:
+                self.stats['recycled'] += 1
@@ -0,0 +1,226 @@
+"""
+Embedding-Based Candidate Matcher
+Alternative to generative prompting for the signup button and language selector
+
+Candidate labels are embedded through Ollama's /api/embed and compared with
+multilingual prototype phrases ("sign up", "créer un compte", "language", ...)
+in one NumPy cosine-similarity batch. Vectors are cached per unique label on
+disk; button labels repeat heavily across sites, so after a few runs almost
+every lookup is a cache hit and no model call is made at all.
+"""
+
+import os
+import sqlite3
+import threading
+
+try:
+    import numpy as np  # Required for this matcher; the audit falls back to the LLM without it
+except ImportError:
+    np = None
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'embeddings.sqlite')
+DEFAULT_EMBED_MODEL = "paraphrase-multilingual"
+
+# What a signup control says, in the languages the audit targets
+SIGNUP_PROTOTYPES = [
+    'sign up', 'create account', 'register', 'get started', 'start free trial', 'join now',
+    'registrarse', 'crear cuenta', 'empezar gratis', 'prueba gratis',
+    "s'inscrire", 'créer un compte', 'essai gratuit',
+    'registrieren', 'konto erstellen', 'kostenlos testen',
+    'cadastre-se', 'criar conta', 'iscriviti', 'crea account',
+    '新規登録', 'アカウント作成', '注册', '회원가입', 'зарегистрироваться', 'إنشاء حساب'
+]
+
+# Close in embedding space but wrong: existing users, sales, navigation
+NEGATIVE_PROTOTYPES = [
+    'log in', 'sign in', 'iniciar sesión', 'se connecter', 'einloggen', 'entrar', 'accedi',
+    'ログイン', '登录', '로그인', 'войти', 'تسجيل الدخول',
+    'contact sales', 'pricing', 'learn more', 'about us', 'help'
+]
+
+LANGUAGE_PROTOTYPES = [
+    'language', 'select language', 'country', 'region', 'locale',
+    'English Español Français Deutsch', 'idioma', 'langue', 'Sprache', 'país', 'pays',
+    'en-US fr-FR es-ES', 'United States Canada France', '言語', '语言', '언어', 'язык'
+]
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(path=DEFAULT_PATH):
+    """Shared VectorStore per file"""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = VectorStore(path)
+        return _stores[path]
+
+
+class VectorStore:
+    """
+    Label -> embedding vector, per model, in SQLite (float32 blobs) with an
+    in-memory layer in front so repeated labels in one process never touch disk
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Args:
+            path: SQLite file (':memory:' for a throwaway store)
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS vectors (
+                model TEXT NOT NULL,
+                label TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, label)
+            )
+        """)
+        self._db.commit()
+
+    def get_many(self, model, labels):
+        """label -> vector for the labels already stored (missing ones are left out)"""
+        found = {}
+        with self._lock:
+            for label in labels:
+                vector = self._memory.get((model, label))
+                if vector is None:
+                    row = self._db.execute("SELECT vector FROM vectors WHERE model = ? AND label = ?",
+                                           (model, label)).fetchone()
+                    if row is not None:
+                        vector = np.frombuffer(row[0], dtype=np.float32)
+                        self._memory[(model, label)] = vector
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    found[label] = vector
+        return found
+
+    def put_many(self, model, vectors):
+        """Store {label: vector}"""
+        with self._lock:
+            for label, vector in vectors.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._memory[(model, label)] = vector
+                self._db.execute("INSERT OR REPLACE INTO vectors (model, label, vector) VALUES (?, ?, ?)",
+                                 (model, label, vector.tobytes()))
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
+
+
+class EmbeddingMatcher:
+    """
+    Usage:
+        matcher = EmbeddingMatcher(get_ollama_client(url))
+        match = matcher.pick_signup(candidates)  # (candidate, similarity) or None
+        match = matcher.pick_language_selector(selects)
+    """
+
+    def __init__(self, client, model=DEFAULT_EMBED_MODEL, store=None, min_similarity=0.55, min_margin=0.03):
+        """
+        Args:
+            client: OllamaClient (its embed() does the HTTP call)
+            model: Ollama embedding model (multilingual, so one prototype set covers all locales)
+            store: VectorStore (default: the shared on-disk store)
+            min_similarity: Best prototype similarity a candidate needs to be picked
+            min_margin: How much closer to the signup prototypes than to the negatives it must be
+        """
+        if np is None:
+            raise RuntimeError("The embedding matcher needs numpy (pip install numpy)")
+
+        self.client = client
+        self.model = model
+        self.store = store or get_vector_store()
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self._prototypes = {}
+
+    def vectors(self, labels):
+        """
+        Unit-length vectors for labels, shape (len(labels), dim)
+        Labels not in the store are embedded in one batch request and stored
+        """
+        unique = list(dict.fromkeys(labels))
+        found = self.store.get_many(self.model, unique)
+
+        missing = [label for label in unique if label not in found]
+        if missing:
+            embeddings = self.client.embed(missing, model=self.model)
+            if embeddings is None or len(embeddings) != len(missing):
+                raise RuntimeError(f"Embedding request failed for {len(missing)} label(s)")
+            new = dict(zip(missing, embeddings))
+            self.store.put_many(self.model, new)
+            found.update((label, np.asarray(vector, dtype=np.float32)) for label, vector in new.items())
+
+        matrix = np.stack([found[label] for label in labels])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def _prototype_matrix(self, name, phrases):
+        if name not in self._prototypes:
+            self._prototypes[name] = self.vectors(phrases)
+        return self._prototypes[name]
+
+    def signup_scores(self, labels):
+        """
+        (similarity to the closest signup prototype, same minus closest negative) per label,
+        both arrays of shape (len(labels),)
+        """
+        candidates = self.vectors(labels)
+        positive = (candidates @ self._prototype_matrix('signup', SIGNUP_PROTOTYPES).T).max(axis=1)
+        negative = (candidates @ self._prototype_matrix('negative', NEGATIVE_PROTOTYPES).T).max(axis=1)
+        return positive, positive - negative
+
+    def pick_signup(self, candidates):
+        """
+        Best signup candidate among extract_clickables() dicts
+        Returns: (candidate, similarity), or None if nothing is close enough
+        """
+        if not candidates:
+            return None
+
+        similarity, margin = self.signup_scores([c['text'] for c in candidates])
+
+        eligible = (similarity >= self.min_similarity) & (margin >= self.min_margin)
+        if not eligible.any():
+            return None
+
+        best = int(np.argmax(np.where(eligible, similarity, -np.inf)))
+        return candidates[best], float(similarity[best])
+
+    def pick_language_selector(self, selects):
+        """
+        Most language-like <select> among extract_selects() dicts
+        Returns: (select, similarity), or None
+        """
+        if not selects:
+            return None
+
+        labels = [f"{s['id']} {s['name']} {' '.join(s['options'][:5])}".strip() for s in selects]
+        similarity = (self.vectors(labels) @ self._prototype_matrix('language', LANGUAGE_PROTOTYPES).T).max(axis=1)
+
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.min_similarity:
+            return None
+        return selects[best], float(similarity[best])
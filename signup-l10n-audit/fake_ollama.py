@@ -0,0 +1,322 @@
+"""
+Fake Ollama Server
+Local stand-in for /api/generate and /api/embed, for offline testing and benchmarking
+
+Answers come from, in order:
+1. A replay file of recorded real responses (JSONL: {"key", "model", "prompt", "response"})
+2. Rules: the numbered list in the audit's prompts is scored with the same
+   kind of keyword lists the audit uses, so answers are deterministic
+   (structured requests - payload "format" set - get the combined JSON answer)
+Latency is configurable (fixed + jitter) so throughput numbers are repeatable.
+/api/embed returns deterministic hashed character-trigram vectors, so similar
+labels get similar vectors and the embedding matcher can run offline.
+
+Record real answers:
+    python fake_ollama.py --port 11435 --record recorded.jsonl --upstream http://localhost:11434
+Serve them (falling back to rules for unknown prompts):
+    python fake_ollama.py --replay recorded.jsonl --latency-ms 300
+Benchmark the client against it:
+    python fake_ollama.py --bench 200 --workers 8
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from llm_cache import cache_key
+
+# Numbered candidate lines in the audit prompts: "3. Sign up" / "2. ID: lang, Name: ..."
+NUMBERED_LINE = re.compile(r'^\s*(\d+)\.\s+(.+)$', re.MULTILINE)
+# Lettered lines in the combined page_classifier prompt: "S2. ID: lang, ..." / "B3. Sign up"
+LETTERED_LINE = re.compile(r'^\s*([SB])(\d+)\.\s+(.+)$', re.MULTILINE)
+
+SIGNUP_WORDS = ['sign up', 'signup', 'create account', 'register', 'get started', 'start free',
+                'try free', 'free trial', 'join', 'registrarse', 'crear cuenta', 'empezar',
+                "s'inscrire", 'créer un compte', 'commencer', 'démarrer', 'registrieren',
+                'konto erstellen', 'cadastrar', 'criar conta', 'inscrever-se']
+LOGIN_WORDS = ['log in', 'login', 'sign in', 'signin', 'iniciar sesión', 'se connecter', 'anmelden', 'entrar']
+SELECTOR_WORDS = ['language', 'country', 'locale', 'lang', 'english', 'español', 'français', 'deutsch',
+                  'português', '日本語', 'canada', 'france', 'españa', 'en-', 'fr-', 'es-']
+
+
+def _best_line(lines, is_selector):
+    """Number of the best-scoring (number, text) line, 0 if none scores"""
+    best, best_score = 0, 0
+
+    for number, text in lines:
+        text = text.lower()
+        if is_selector:
+            score = sum(1 for word in SELECTOR_WORDS if word in text)
+        else:
+            if any(word in text for word in LOGIN_WORDS):
+                continue
+            score = sum(2 if text.startswith(word) else 1 for word in SIGNUP_WORDS if word in text)
+
+        if score > best_score:
+            best, best_score = int(number), score
+
+    return best
+
+
+def rule_based_answer(prompt):
+    """
+    Pick a candidate number the way a well-behaved model would
+    Returns '0' when nothing matches (the audit treats that as "no match")
+    """
+    lines = NUMBERED_LINE.findall(prompt)
+    if not lines:
+        return "0"
+
+    is_selector_prompt = 'dropdown' in prompt.lower() or 'selector' in prompt.lower()
+    return str(_best_line(lines, is_selector_prompt))
+
+
+def rule_based_json(prompt):
+    """Combined structured answer for page_classifier prompts"""
+    lines = LETTERED_LINE.findall(prompt)
+    selectors = [(number, text) for kind, number, text in lines if kind == 'S']
+    buttons = [(number, text) for kind, number, text in lines if kind == 'B']
+    return json.dumps({
+        "language_selector": _best_line(selectors, is_selector=True),
+        "signup_button": _best_line(buttons, is_selector=False)
+    })
+
+
+def rule_based_responder(prompt, payload):
+    """JSON for structured requests, a bare number otherwise"""
+    if payload.get('format'):
+        return rule_based_json(prompt)
+    return rule_based_answer(prompt)
+
+
+def fake_embedding(text, dim=256):
+    """Unit-length hashed bag of character trigrams (stable across runs and processes)"""
+    vector = [0.0] * dim
+    padded = f"  {text.lower()}  "
+    for i in range(len(padded) - 2):
+        digest = hashlib.md5(padded[i:i+3].encode('utf-8')).digest()
+        vector[int.from_bytes(digest[:4], 'little') % dim] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeOllama:
+    """
+    Usage:
+        with FakeOllama(latency_ms=200) as fake:
+            client = OllamaClient(fake.url)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0, replay_path=None,
+                 responder=None, seed=0):
+        """
+        Args:
+            host, port: Bind address (port 0 picks a free port)
+            latency_ms: Fixed delay added to each /api/generate answer
+            jitter_ms: Extra uniform random delay (seeded, so runs are reproducible)
+            replay_path: JSONL of recorded responses to serve first
+            responder: Callable(prompt, payload) -> answer text, replaces the rules
+            seed: Seed for the jitter
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.responder = responder or rule_based_responder
+        self.recorded = load_recordings(replay_path) if replay_path else {}
+        self.requests = 0
+        self.replayed = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def answer(self, payload):
+        """Answer text for a generate payload (replay first, then the responder)"""
+        prompt = payload.get('prompt', '')
+        key = cache_key(payload.get('model'), prompt, payload.get('options'), format=payload.get('format'))
+
+        with self._lock:
+            self.requests += 1
+            delay = self.latency_ms + (self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+            recorded = self.recorded.get(key)
+            if recorded is not None:
+                self.replayed += 1
+
+        if delay:
+            time.sleep(delay / 1000)
+
+        return recorded if recorded is not None else self.responder(prompt, payload)
+
+    def embed(self, payload):
+        """Vectors for an embed payload ("input" is a string or a list of strings)"""
+        texts = payload.get('input', [])
+        texts = [texts] if isinstance(texts, str) else texts
+
+        with self._lock:
+            self.requests += 1
+
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        return [fake_embedding(text) for text in texts]
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    self._send(400, {'error': 'invalid JSON'})
+                    return
+
+                if self.path == '/api/generate':
+                    # An empty prompt is Ollama's "load the model" call
+                    answer = fake.answer(payload) if payload.get('prompt') else ''
+                    self._send(200, {'model': payload.get('model'), 'response': answer, 'done': True})
+                elif self.path == '/api/embed':
+                    self._send(200, {'model': payload.get('model'), 'embeddings': fake.embed(payload)})
+                else:
+                    self._send(404, {'error': f'unknown endpoint {self.path}'})
+
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    self._send(200, {'models': [{'name': 'llama3.2:latest'}]})
+                else:
+                    self._send(404, {'error': f'unknown endpoint {self.path}'})
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+
+def load_recordings(path):
+    """cache key -> recorded answer"""
+    recorded = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                recorded[entry['key']] = entry['response']
+    return recorded
+
+
+def recording_responder(upstream_url, record_path):
+    """Responder that forwards to a real Ollama and appends every answer to record_path"""
+    import requests
+
+    lock = threading.Lock()
+
+    def respond(prompt, payload):
+        response = requests.post(f"{upstream_url.rstrip('/')}/api/generate", json=payload, timeout=120)
+        answer = response.json().get('response', '')
+        entry = {
+            'key': cache_key(payload.get('model'), prompt, payload.get('options'), format=payload.get('format')),
+            'model': payload.get('model'),
+            'prompt': prompt,
+            'response': answer
+        }
+        with lock, open(record_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return answer
+
+    return respond
+
+
+def benchmark(url, requests_count=100, workers=8):
+    """
+    Throughput/latency of the pooled client against a server (fake or real), sending the
+    audit's own combined page_classifier request (same prompt, schema and options)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from llm_client import OllamaClient
+    import page_classifier
+
+    selectors = [
+        {'id': 'lang', 'name': 'language', 'options': ['English', 'Français', 'Español']},
+        {'id': 'sort', 'name': 'sort', 'options': ['Newest', 'Oldest', 'Popular']}
+    ]
+    pages = [
+        [{'text': text} for text in ('Log in', 'Pricing', f'Sign up {i}', 'Contact sales')]
+        for i in range(requests_count)
+    ]
+    expected = {'language_selector': 0, 'signup_button': 2}
+    client = OllamaClient(url, max_concurrency=workers)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        answers = list(pool.map(lambda buttons: page_classifier.classify(client, selectors, buttons)[0], pages))
+    elapsed = time.perf_counter() - started
+
+    correct = sum(1 for parsed in answers if parsed == expected)
+    print(f"{requests_count} requests, {workers} in flight: {elapsed:.2f}s "
+          f"({requests_count / elapsed:.1f} req/s), {correct}/{requests_count} correct")
+    print(client.histogram.report())
+    client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fake Ollama /api/generate server")
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--replay', help="JSONL of recorded responses to serve")
+    parser.add_argument('--record', help="Forward to --upstream and record answers to this JSONL")
+    parser.add_argument('--upstream', default="http://localhost:11434")
+    parser.add_argument('--bench', type=int, metavar='N', help="Run N requests against an in-process fake and exit")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    responder = recording_responder(args.upstream, args.record) if args.record else None
+
+    if args.bench:
+        with FakeOllama(port=0, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        replay_path=args.replay, responder=responder) as fake:
+            benchmark(fake.url, args.bench, args.workers)
+    else:
+        fake = FakeOllama(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          replay_path=args.replay, responder=responder)
+        print(f"Fake Ollama listening on {fake.url} (Ctrl+C to stop)")
+        try:
+            fake.server.serve_forever()
+        except KeyboardInterrupt:
+            fake.stop()
@@ -0,0 +1,196 @@
+"""
+Browserless HTTP Pre-Check
+Homepage localization signals from one plain HTTP request
+
+Fetches the page with Accept-Language set to the target locale (pooled,
+keep-alive session shared by all audit threads) and reads:
+- the redirect chain and final URL (culture codes, geo/language redirects)
+- the Content-Language header and <html lang>
+- <link rel="alternate" hreflang="..."> alternates
+- a bounded visible-text sample (script/style skipped) for language ID
+
+When the static HTML carries enough text, the audit decides the homepage tests
+from this alone and only starts Chrome for the signup-button step.
+"""
+
+import codecs
+import re
+import threading
+import time
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+CHARSET_PARAM = re.compile(r'charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+# <meta charset="..."> and <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size=16):
+    """Shared keep-alive session; the first caller sets the pool size"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+            _session.headers['User-Agent'] = USER_AGENT
+        return _session
+
+
+def accept_language(locale):
+    """'es' -> 'es,en;q=0.5'; 'fr-ca' -> 'fr-CA,fr;q=0.9,en;q=0.5'"""
+    parts = re.split(r'[-_]', locale)
+    language = parts[0].lower()
+    if len(parts) > 1:
+        return f"{language}-{parts[1].upper()},{language};q=0.9,en;q=0.5"
+    return f"{language},en;q=0.5"
+
+
+def decode_body(body, content_type=''):
+    """
+    Text of an HTML body. Not response.encoding: requests reports ISO-8859-1 for every
+    text/* response without a charset, which turns UTF-8 pages (CJK, Cyrillic, accents)
+    into mojibake. Order: BOM, Content-Type charset, <meta> charset in the first 4 KB,
+    UTF-8 when the bytes are valid UTF-8, then the detected encoding.
+    """
+    candidates = []
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'),
+                          (codecs.BOM_UTF16_BE, 'utf-16')):
+        if body.startswith(bom):
+            candidates.append(encoding)
+    match = CHARSET_PARAM.search(content_type or '')
+    if match:
+        candidates.append(match.group(1))
+    match = META_CHARSET.search(body[:4096])
+    if match:
+        candidates.append(match.group(1).decode('ascii', errors='ignore'))
+
+    for encoding in candidates:
+        try:
+            return body.decode(encoding, errors='replace')
+        except LookupError:
+            continue  # Unknown charset name
+
+    try:
+        # Incremental: a body cut at max_bytes may end mid-character
+        return codecs.getincrementaldecoder('utf-8')().decode(body, final=False)
+    except UnicodeDecodeError:
+        pass
+    detected = chardet.detect(body[:65536]).get('encoding') if chardet else None
+    try:
+        return body.decode(detected or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+class _PageParser(HTMLParser):
+    """Collects html[lang], hreflang alternates and up to max_chars of visible text"""
+
+    SKIP = {'script', 'style', 'noscript', 'template', 'svg'}
+
+    def __init__(self, max_chars):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.html_lang = ''
+        self.hreflang = {}
+        self.parts = []
+        self.length = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'html':
+            self.html_lang = (attrs.get('lang') or attrs.get('xml:lang') or '').strip()
+        elif tag == 'link' and 'alternate' in (attrs.get('rel') or '').lower().split() and attrs.get('hreflang'):
+            self.hreflang[attrs['hreflang'].strip().lower()] = attrs.get('href')
+        elif tag in self.SKIP:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth or self.length >= self.max_chars:
+            return
+        text = ' '.join(data.split())
+        if text:
+            self.parts.append(text)
+            self.length += len(text) + 1
+
+    @property
+    def text(self):
+        return ' '.join(self.parts)[:self.max_chars]
+
+
+def fetch_page(url, locale, session=None, timeout=10, max_bytes=1_000_000, max_chars=2000):
+    """
+    GET url as a visitor whose browser prefers locale (None: no Accept-Language at all)
+    Returns: dict with url, final_url, status, redirects, content_language,
+             html_lang, hreflang ({code: href}), text, elapsed; or 'error' on failure
+    """
+    session = session or get_session()
+    started = time.perf_counter()
+
+    try:
+        headers = {'Accept-Language': accept_language(locale)} if locale else {}
+        response = session.get(url, headers=headers,
+                               timeout=timeout, stream=True, allow_redirects=True)
+        body = b''
+        for chunk in response.iter_content(chunk_size=65536):
+            body += chunk
+            if len(body) >= max_bytes:
+                break
+        response.close()
+    except requests.RequestException as e:
+        return {'url': url, 'error': str(e), 'elapsed': time.perf_counter() - started}
+
+    parser = _PageParser(max_chars)
+    if 'html' in response.headers.get('Content-Type', 'text/html'):
+        try:
+            parser.feed(decode_body(body, response.headers.get('Content-Type', '')))
+        except Exception:
+            pass  # Broken markup: keep whatever was parsed
+
+    return {
+        'url': url,
+        'final_url': response.url,
+        'status': response.status_code,
+        'redirects': [r.headers.get('Location') or r.url for r in response.history],
+        'content_language': response.headers.get('Content-Language', '').split(',')[0].strip(),
+        'html_lang': parser.html_lang,
+        'hreflang': parser.hreflang,
+        'text': parser.text,
+        'elapsed': time.perf_counter() - started
+    }
+
+
+def is_conclusive(page, min_chars=200):
+    """
+    Whether the static HTML is enough to judge the page: a 200 with real text.
+    Client-rendered shells and bot walls (403/429/503) need the browser.
+    """
+    return 'error' not in page and page['status'] == 200 and len(page['text']) >= min_chars
+
+
+def hreflang_for(page, locale):
+    """Alternate URL the page declares for locale (exact code first, then its language), or None"""
+    locale = locale.lower().replace('_', '-')
+    alternates = page.get('hreflang') or {}
+    if locale in alternates:
+        return alternates[locale]
+    language = locale.split('-')[0]
+    for code, href in alternates.items():
+        if code.split('-')[0] == language:
+            return href
+    return None
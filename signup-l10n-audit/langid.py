@@ -0,0 +1,286 @@
+"""
+Character N-Gram Language Identification
+Compact language ID for check_page_language
+
+Each language has a character n-gram profile (trigrams, plus bigrams and
+unigrams for CJK), built once per process from the
+seed text below into a hashed (languages x buckets) NumPy array. A page sample
+is hashed the same way in a few vectorised operations and scored against every
+profile with one matrix-vector product, so telling Spanish from Portuguese or
+spotting Italian costs well under a millisecond per page.
+
+Benchmark against the labelled samples (accuracy + time per call):
+    python langid.py
+"""
+
+import re
+import time
+
+try:
+    import numpy as np  # Required for the n-gram engine; the audit keeps its keyword check without it
+except ImportError:
+    np = None
+
+BUCKETS = 1 << 14
+
+# Typical website copy (navigation, signup flows, marketing prose) per language
+SEED_TEXT = {
+    'en': """Home About us Products Pricing Contact Sign up Log in Create your free account today and get
+        started in minutes. Start your free trial, no credit card required. Learn more about our features,
+        read the latest news on the blog, and join thousands of businesses that trust us with their
+        payments. Privacy policy Terms of service Cookie settings Accept all cookies Help center Support
+        Careers Download the app. Manage your account, update your settings and choose the plan that is
+        right for you. We use cookies to improve your experience and to show you relevant content.
+        Enter your email address and password to continue. Already have an account? Sign in here.""",
+    'es': """Inicio Sobre nosotros Productos Precios Contacto Registrarse Iniciar sesión Crea tu cuenta
+        gratis hoy y empieza en pocos minutos. Comienza tu prueba gratuita, no se necesita tarjeta de
+        crédito. Obtén más información sobre nuestras funciones, lee las últimas noticias en el blog y
+        únete a miles de empresas que confían en nosotros para sus pagos. Política de privacidad Términos
+        del servicio Configuración de cookies Aceptar todas las cookies Centro de ayuda Soporte Empleo
+        Descarga la aplicación. Gestiona tu cuenta, actualiza la configuración y elige el plan que más te
+        conviene. Utilizamos cookies para mejorar tu experiencia y mostrarte contenido relevante.
+        Introduce tu correo electrónico y contraseña para continuar. ¿Ya tienes una cuenta? Inicia sesión.""",
+    'fr': """Accueil À propos Produits Tarifs Contact S'inscrire Se connecter Créez votre compte gratuit
+        dès aujourd'hui et commencez en quelques minutes. Démarrez votre essai gratuit, aucune carte de
+        crédit requise. En savoir plus sur nos fonctionnalités, lisez les dernières actualités sur le blog
+        et rejoignez des milliers d'entreprises qui nous font confiance pour leurs paiements. Politique de
+        confidentialité Conditions d'utilisation Paramètres des cookies Accepter tous les cookies Centre
+        d'aide Assistance Carrières Télécharger l'application. Gérez votre compte, mettez à jour vos
+        paramètres et choisissez l'offre qui vous convient. Nous utilisons des cookies pour améliorer votre
+        expérience. Saisissez votre adresse e-mail et votre mot de passe pour continuer. Vous avez déjà un
+        compte ? Connectez-vous ici.""",
+    'de': """Startseite Über uns Produkte Preise Kontakt Registrieren Anmelden Erstellen Sie noch heute Ihr
+        kostenloses Konto und legen Sie in wenigen Minuten los. Starten Sie Ihre kostenlose Testversion,
+        keine Kreditkarte erforderlich. Erfahren Sie mehr über unsere Funktionen, lesen Sie die neuesten
+        Nachrichten im Blog und schließen Sie sich tausenden Unternehmen an, die uns bei ihren Zahlungen
+        vertrauen. Datenschutzerklärung Nutzungsbedingungen Cookie-Einstellungen Alle Cookies akzeptieren
+        Hilfe Support Karriere Die App herunterladen. Verwalten Sie Ihr Konto, aktualisieren Sie Ihre
+        Einstellungen und wählen Sie den passenden Tarif. Wir verwenden Cookies, um Ihre Erfahrung zu
+        verbessern. Geben Sie Ihre E-Mail-Adresse und Ihr Passwort ein, um fortzufahren. Sie haben bereits
+        ein Konto? Hier einloggen.""",
+    'pt': """Início Sobre nós Produtos Preços Contato Cadastre-se Entrar Crie sua conta grátis hoje e
+        comece em poucos minutos. Inicie seu teste gratuito, não é necessário cartão de crédito. Saiba mais
+        sobre nossos recursos, leia as últimas notícias no blog e junte-se a milhares de empresas que
+        confiam em nós para seus pagamentos. Política de privacidade Termos de serviço Configurações de
+        cookies Aceitar todos os cookies Central de ajuda Suporte Carreiras Baixe o aplicativo. Gerencie
+        sua conta, atualize suas configurações e escolha o plano certo para você. Usamos cookies para
+        melhorar sua experiência e mostrar conteúdo relevante. Digite seu endereço de e-mail e sua senha
+        para continuar. Já tem uma conta? Faça login aqui. Não perca as ofertas, são ótimas opções.""",
+    'it': """Home Chi siamo Prodotti Prezzi Contatti Registrati Accedi Crea oggi il tuo account gratuito e
+        inizia in pochi minuti. Inizia la tua prova gratuita, non è richiesta la carta di credito. Scopri di
+        più sulle nostre funzionalità, leggi le ultime notizie sul blog e unisciti a migliaia di aziende che
+        si affidano a noi per i loro pagamenti. Informativa sulla privacy Termini di servizio Impostazioni
+        dei cookie Accetta tutti i cookie Centro assistenza Supporto Lavora con noi Scarica l'app. Gestisci
+        il tuo account, aggiorna le impostazioni e scegli il piano più adatto a te. Utilizziamo i cookie per
+        migliorare la tua esperienza e mostrarti contenuti pertinenti. Inserisci il tuo indirizzo email e la
+        password per continuare. Hai già un account? Accedi qui.""",
+    'ru': """Главная О нас Продукты Цены Контакты Зарегистрироваться Войти Создайте бесплатный аккаунт
+        сегодня и начните работу за несколько минут. Начните бесплатный пробный период, кредитная карта не
+        требуется. Узнайте больше о наших возможностях, читайте последние новости в блоге и присоединяйтесь
+        к тысячам компаний, которые доверяют нам свои платежи. Политика конфиденциальности Условия
+        использования Настройки файлов cookie Принять все Справочный центр Поддержка Вакансии Скачать
+        приложение. Управляйте своим аккаунтом, обновляйте настройки и выберите подходящий тариф. Мы
+        используем файлы cookie, чтобы улучшить ваш опыт. Введите адрес электронной почты и пароль, чтобы
+        продолжить. Уже есть аккаунт? Войдите здесь.""",
+    'ar': """الرئيسية من نحن المنتجات الأسعار اتصل بنا إنشاء حساب تسجيل الدخول أنشئ حسابك المجاني اليوم
+        وابدأ خلال دقائق. ابدأ فترتك التجريبية المجانية، لا حاجة لبطاقة ائتمان. تعرّف على المزيد حول
+        ميزاتنا، واقرأ آخر الأخبار في المدونة، وانضم إلى آلاف الشركات التي تثق بنا في مدفوعاتها. سياسة
+        الخصوصية شروط الخدمة إعدادات ملفات تعريف الارتباط قبول الكل مركز المساعدة الدعم الوظائف تنزيل
+        التطبيق. أدر حسابك، وحدّث إعداداتك، واختر الخطة المناسبة لك. نستخدم ملفات تعريف الارتباط لتحسين
+        تجربتك. أدخل بريدك الإلكتروني وكلمة المرور للمتابعة. هل لديك حساب بالفعل؟ سجّل الدخول هنا.""",
+    'ja': """ホーム 会社概要 製品 料金 お問い合わせ 新規登録 ログイン 今すぐ無料アカウントを作成して、数分で
+        始めましょう。無料トライアルを開始、クレジットカードは不要です。機能の詳細をご覧いただき、ブログで
+        最新のニュースをお読みください。決済を任せている何千もの企業に加わりましょう。プライバシーポリシー
+        利用規約 クッキーの設定 すべてのクッキーを受け入れる ヘルプセンター サポート 採用情報 アプリを
+        ダウンロード。アカウントを管理し、設定を更新して、最適なプランをお選びください。当社はお客様の体験を
+        向上させるためにクッキーを使用しています。続行するにはメールアドレスとパスワードを入力してください。
+        すでにアカウントをお持ちですか？こちらからログインしてください。""",
+    'zh': """首页 关于我们 产品 价格 联系我们 注册 登录 立即创建您的免费账户，几分钟内即可开始使用。开始免费
+        试用，无需信用卡。了解更多关于我们的功能，在博客上阅读最新消息，加入数千家信任我们处理付款的企业。
+        隐私政策 服务条款 Cookie 设置 接受所有 Cookie 帮助中心 支持 招聘 下载应用。管理您的账户，更新您的
+        设置，并选择适合您的方案。我们使用 Cookie 来改善您的体验并向您展示相关内容。请输入您的电子邮件地址
+        和密码以继续。已经有账户了？在这里登录。""",
+    'ko': """홈 회사 소개 제품 가격 문의하기 회원가입 로그인 지금 무료 계정을 만들고 몇 분 만에 시작하세요.
+        무료 체험을 시작하세요, 신용카드가 필요하지 않습니다. 기능에 대해 자세히 알아보고, 블로그에서 최신
+        소식을 읽고, 결제를 믿고 맡기는 수천 개의 기업과 함께하세요. 개인정보 처리방침 서비스 약관 쿠키 설정
+        모든 쿠키 허용 고객센터 지원 채용 앱 다운로드. 계정을 관리하고 설정을 업데이트하며 나에게 맞는 요금제를
+        선택하세요. 당사는 사용자 경험을 개선하기 위해 쿠키를 사용합니다. 계속하려면 이메일 주소와 비밀번호를
+        입력하세요. 이미 계정이 있으신가요? 여기에서 로그인하세요.""",
+}
+
+# Held-out page snippets (not part of the seed text) for the accuracy benchmark
+LABELLED_SAMPLES = [
+    ('en', "Shop the latest deals on electronics, fashion and home. Free delivery on orders over 25 dollars."),
+    ('en', "Your order has shipped and will arrive on Tuesday. Track your package from your account page."),
+    ('es', "Compra las últimas ofertas en electrónica, moda y hogar. Envío gratis en pedidos superiores a 25 euros."),
+    ('es', "Tu pedido ha sido enviado y llegará el martes. Sigue tu paquete desde la página de tu cuenta."),
+    ('pt', "Compre as últimas ofertas em eletrônicos, moda e casa. Frete grátis em pedidos acima de 25 reais."),
+    ('pt', "Seu pedido foi enviado e chegará na terça-feira. Acompanhe seu pacote na página da sua conta."),
+    ('fr', "Découvrez les dernières offres en électronique, mode et maison. Livraison gratuite dès 25 euros."),
+    ('fr', "Votre commande a été expédiée et arrivera mardi. Suivez votre colis depuis la page de votre compte."),
+    ('de', "Entdecken Sie die neuesten Angebote für Elektronik, Mode und Haushalt. Kostenloser Versand ab 25 Euro."),
+    ('de', "Ihre Bestellung wurde versandt und kommt am Dienstag an. Verfolgen Sie Ihr Paket in Ihrem Konto."),
+    ('it', "Scopri le ultime offerte su elettronica, moda e casa. Spedizione gratuita per ordini sopra i 25 euro."),
+    ('it', "Il tuo ordine è stato spedito e arriverà martedì. Segui il tuo pacco dalla pagina del tuo account."),
+    ('ru', "Покупайте новинки электроники, одежды и товаров для дома. Бесплатная доставка при заказе от 2000 рублей."),
+    ('ar', "تسوق أحدث العروض على الإلكترونيات والأزياء والمنزل. توصيل مجاني للطلبات التي تزيد عن 100 ريال."),
+    ('ja', "家電、ファッション、ホーム用品の最新セールをチェック。2500円以上のご注文で送料無料。"),
+    ('zh', "选购电子产品、时尚和家居的最新优惠。订单满100元免费送货。"),
+    ('ko', "전자제품, 패션, 홈 용품의 최신 할인을 확인하세요. 25,000원 이상 주문 시 무료 배송."),
+]
+
+# Locale codes used elsewhere in the audit that aren't ISO 639-1
+ALIASES = {'jp': 'ja', 'kr': 'ko'}
+
+_NON_LETTERS = re.compile(r'[\W\d_]+')
+
+# Calibrated on LABELLED_SAMPLES: every held-out snippet at page length (~200 chars per language)
+# scores >= 0.11, while 50/50 mixes of two Latin-script languages mostly score below 0.1
+MIN_CONFIDENCE = 0.1
+
+# Weighted letters a sample needs before it gets a label (a CJK/Hangul character counts 3:
+# it carries about a word). Button labels ("Sign up", "Registrarse") are too short to tell apart.
+MIN_LETTERS = 40
+
+# Largest share of the letters one script must hold; below it the sample is mixed-script
+MIN_SCRIPT_SHARE = 0.75
+
+# (first code point, last code point, script) for the scripts of SEED_TEXT; other letters are Latin
+_SCRIPTS = [(0x0400, 0x04FF, 'cyrillic'), (0x0600, 0x06FF, 'arabic'), (0x3040, 0x30FF, 'cjk'),
+            (0x3400, 0x9FFF, 'cjk'), (0xAC00, 0xD7AF, 'hangul')]
+_DENSE_SCRIPTS = {'cjk', 'hangul'}
+
+_identifier = None
+
+
+def get_identifier():
+    """Shared LanguageIdentifier (profiles are built once per process)"""
+    global _identifier
+    if _identifier is None:
+        _identifier = LanguageIdentifier()
+    return _identifier
+
+
+def base_language(locale):
+    """'es-MX' / 'pt_BR' / 'jp' -> 'es' / 'pt' / 'ja'"""
+    language = re.split(r'[-_]', locale.lower())[0]
+    return ALIASES.get(language, language)
+
+
+def _script_weights(text):
+    """{script: weighted letter count} of text"""
+    weights = {}
+    for char in text:
+        if not char.isalpha():
+            continue
+        code = ord(char)
+        script = next((name for first, last, name in _SCRIPTS if first <= code <= last), 'latin')
+        weights[script] = weights.get(script, 0) + (3 if script in _DENSE_SCRIPTS else 1)
+    return weights
+
+
+def _ngram_vector(text, buckets=BUCKETS):
+    """
+    Hashed counts of character trigrams, plus bigrams and unigrams (short CJK samples
+    share few trigrams with a profile but plenty of characters), of lowercased letters;
+    runs of anything else become one space
+    """
+    text = f" {_NON_LETTERS.sub(' ', text.lower()).strip()} "
+    if len(text) < 3:
+        return np.zeros(buckets, dtype=np.float32)
+
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    hashes = np.concatenate([
+        codes[:-2] * np.uint64(0x9E3779B1) ^ codes[1:-1] * np.uint64(0x85EBCA77) ^ codes[2:],
+        codes[:-1] * np.uint64(0xC2B2AE3D) ^ codes[1:] * np.uint64(0x27D4EB2F),
+        codes * np.uint64(0x165667B1)
+    ]) % np.uint64(buckets)
+    return np.bincount(hashes.astype(np.int64), minlength=buckets).astype(np.float32)
+
+
+class LanguageIdentifier:
+    """
+    Usage:
+        language, confidence = get_identifier().detect(page_text)
+    """
+
+    def __init__(self, seed_text=None, buckets=BUCKETS, max_chars=1000):
+        """
+        Args:
+            seed_text: {language: text} the profiles are built from (default: SEED_TEXT)
+            buckets: Hash buckets per profile
+            max_chars: Characters of a sample that are scored
+        """
+        if np is None:
+            raise RuntimeError("Language identification needs numpy (pip install numpy)")
+
+        seed_text = seed_text or SEED_TEXT
+        self.languages = list(seed_text)
+        self.buckets = buckets
+        self.max_chars = max_chars
+
+        # sqrt damps very frequent trigrams (" de", "the") so rarer, more telling ones count
+        profiles = np.stack([np.sqrt(_ngram_vector(seed_text[lang], buckets)) for lang in self.languages])
+        self.profiles = profiles / np.linalg.norm(profiles, axis=1, keepdims=True)
+
+    def scores(self, text):
+        """Cosine similarity of the sample to each profile, shape (len(languages),)"""
+        vector = np.sqrt(_ngram_vector(text[:self.max_chars], self.buckets))
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return np.zeros(len(self.languages), dtype=np.float32)
+        return self.profiles @ (vector / norm)
+
+    def detect(self, text):
+        """
+        Most likely language of text
+        Returns: (language code or None, confidence 0-1)
+        Confidence is how far the winner is ahead of the runner-up, relative to its score.
+        Too-short (under MIN_LETTERS) and mixed-script samples get no label.
+        """
+        weights = _script_weights(text[:self.max_chars])
+        total = sum(weights.values())
+        if total < MIN_LETTERS or max(weights.values()) < total * MIN_SCRIPT_SHARE:
+            return None, 0.0
+
+        scores = self.scores(text)
+        order = np.argsort(scores)[::-1]
+        best, second = float(scores[order[0]]), float(scores[order[1]])
+        if best <= 0:
+            return None, 0.0
+        return self.languages[order[0]], min(1.0, (best - second) / best * 2)
+
+    def is_language(self, text, locale, min_confidence=MIN_CONFIDENCE):
+        """
+        Whether text is mainly in locale's language
+        Returns: (matches, detected language, confidence)
+        """
+        language, confidence = self.detect(text)
+        return language == base_language(locale) and confidence >= min_confidence, language, confidence
+
+
+def benchmark(identifier=None, samples=None, repeat=200):
+    """Accuracy on labelled samples and mean time per detect() call"""
+    identifier = identifier or get_identifier()
+    samples = samples or LABELLED_SAMPLES
+
+    correct = 0
+    for expected, text in samples:
+        language, confidence = identifier.detect(text)
+        mark = '+' if language == expected else 'X'
+        correct += language == expected
+        print(f"  [{mark}] {expected} -> {language} ({confidence:.2f})  {text[:50]}")
+
+    page = ' '.join(text for _, text in samples)[:identifier.max_chars]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        identifier.detect(page)
+    per_call = (time.perf_counter() - started) / repeat
+
+    print(f"\nAccuracy: {correct}/{len(samples)} ({correct / len(samples) * 100:.0f}%)")
+    print(f"Time per page ({len(page)} chars): {per_call * 1e6:.0f} µs")
+    return correct / len(samples), per_call
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,136 @@
+"""
+Persistent LLM Response Cache
+Content-addressed SQLite cache for Ollama /api/generate answers
+
+Key = SHA-256 of (model, prompt, options), so an unchanged page produces the
+same prompt and skips the model entirely on repeat audits and regression runs.
+Entries expire after a TTL; the least recently used are evicted past max_entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'llm_responses.sqlite')
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_llm_cache(path=DEFAULT_PATH):
+    """Shared LLMResponseCache per file (one SQLite connection for all audit threads)"""
+    with _instances_lock:
+        if path not in _instances:
+            _instances[path] = LLMResponseCache(path)
+        return _instances[path]
+
+
+def cache_key(model, prompt, options=None, **extra):
+    """Stable content hash of everything that influences the answer"""
+    payload = json.dumps({'model': model, 'prompt': prompt, 'options': options or {}, **extra},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Usage:
+        cache = LLMResponseCache()
+        key = cache_key(model, prompt, options)
+        answer = cache.get(key)
+        if answer is None:
+            answer = call_model(...)
+            cache.put(key, model, answer)
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl_days=14, max_entries=50000):
+        """
+        Args:
+            path: SQLite file (':memory:' for a throwaway cache)
+            ttl_days: Answers older than this are treated as misses and purged
+            max_entries: Least recently used rows beyond this are evicted
+        """
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._db.commit()
+
+    def get(self, key):
+        """Cached answer or None (missing or expired)"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model, response):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, model, response, now, now)
+            )
+            self._evict()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self):
+        """{'hits', 'misses', 'hit_rate', 'entries'} for this process"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
+
+    def _evict(self):
+        """Drop expired rows, then the least recently used beyond max_entries (lock held)"""
+        self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
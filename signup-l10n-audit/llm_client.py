@@ -0,0 +1,253 @@
+"""
+Shared Ollama Client
+One pooled, rate-limited client per Ollama server for all audits in a process
+
+- Connection pooling: a requests.Session with keep-alive connections
+- Concurrency limit: one semaphore per server (shared by every client and
+  model pointed at it) caps in-flight requests, so parallel audits queue
+  instead of overloading one local Ollama
+- keep_alive + preload(): the model stays resident between calls; it is loaded
+  once per process, in the background
+- asyncio interface: agenerate()/agenerate_many() run on worker threads
+- embed(): batched /api/embed for the embedding matcher
+- Latency histogram of every call that actually reached the server
+"""
+
+import asyncio
+import bisect
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import audit_log
+import tracing
+from llm_cache import cache_key
+
+log = audit_log.get_logger('llm')
+
+DEFAULT_URL = "http://localhost:11434"
+DEFAULT_MODEL = "llama3.2"
+
+_clients = {}
+_clients_lock = threading.Lock()
+_server_limits = {}  # base_url -> BoundedSemaphore shared by all clients of that server
+_server_limits_lock = threading.Lock()
+
+
+def server_limit(base_url, max_concurrency=2):
+    """The in-flight request cap of one Ollama server; the first caller sets max_concurrency"""
+    base_url = base_url.rstrip('/')
+    with _server_limits_lock:
+        if base_url not in _server_limits:
+            _server_limits[base_url] = threading.BoundedSemaphore(max_concurrency)
+        return _server_limits[base_url]
+
+
+def get_ollama_client(base_url=DEFAULT_URL, model=DEFAULT_MODEL, max_concurrency=2):
+    """Shared OllamaClient per (server, model); the first caller of a server sets its max_concurrency"""
+    key = (base_url.rstrip('/'), model)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = OllamaClient(base_url, model, max_concurrency=max_concurrency)
+        return _clients[key]
+
+
+class LatencyHistogram:
+    """Fixed millisecond buckets plus a bounded sample window for percentiles"""
+
+    BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+    def __init__(self, window=1000):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+            self.samples.append(ms)
+
+    def percentile(self, p):
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def report(self):
+        """Bucket counts and p50/p95 as text"""
+        if not self.total:
+            return "  (no LLM calls)"
+
+        lines = []
+        lower = 0
+        for upper, count in zip(self.BUCKETS_MS + [None], self.counts):
+            label = f"{lower}-{upper} ms" if upper else f">{lower} ms"
+            if count:
+                lines.append(f"  {label:<16} {count:>5}  {'#' * min(40, count)}")
+            lower = upper
+        lines.append(f"  p50: {self.percentile(50):.0f} ms, p95: {self.percentile(95):.0f} ms, calls: {self.total}")
+        return '\n'.join(lines)
+
+
+class OllamaClient:
+    """
+    Usage:
+        client = get_ollama_client()
+        answer = client.generate(prompt)                  # blocking
+        answers = asyncio.run(client.agenerate_many(ps))  # concurrent, still capped
+    """
+
+    def __init__(self, base_url=DEFAULT_URL, model=DEFAULT_MODEL, max_concurrency=2,
+                 keep_alive="30m", timeout=30):
+        """
+        Args:
+            base_url: Ollama server
+            model: Model name used when a call doesn't override it
+            max_concurrency: Requests allowed in flight at once on this server, across all clients and
+                             models (Ollama serialises per model anyway); the first client of a server sets it
+            keep_alive: How long Ollama keeps the model loaded after a call
+            timeout: Per-request timeout in seconds (queueing for the semaphore not included)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.histogram = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+
+        self._semaphore = server_limit(self.base_url, max_concurrency)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(4, max_concurrency))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        self._preloaded = set()
+        self._preloading = set()  # Models preload_in_background() was already started for
+        self._preload_lock = threading.Lock()
+
+    def preload(self, model=None):
+        """
+        Load the model into memory once per process (an empty prompt only loads it),
+        so the first real call doesn't pay the load time. The lock only guards the
+        bookkeeping: callers never wait on another caller's load request.
+        """
+        model = model or self.model
+        with self._preload_lock:
+            if model in self._preloaded:
+                return True
+
+        try:
+            response = self._session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model, "prompt": "", "keep_alive": self.keep_alive},
+                timeout=120
+            )
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+
+        with self._preload_lock:
+            if ok:
+                self._preloaded.add(model)
+            self._preloading.discard(model)  # A failed load may be retried later
+        return ok
+
+    def preload_in_background(self, model=None):
+        """Start preload() on a daemon thread unless the model is loaded or already loading; never blocks"""
+        model = model or self.model
+        with self._preload_lock:
+            if model in self._preloaded or model in self._preloading:
+                return
+            self._preloading.add(model)
+        threading.Thread(target=self.preload, args=(model,), daemon=True, name='llm-preload').start()
+
+    def generate(self, prompt, options=None, model=None, cache=None, format=None, validate=None):
+        """
+        Blocking generate
+
+        Args:
+            prompt: Prompt text
+            options: Ollama options (temperature, num_predict, ...)
+            model: Override the client's model
+            cache: Optional LLMResponseCache consulted before and filled after the call
+            format: Ollama structured-output format ("json" or a JSON schema)
+            validate: Callable(answer) -> bool; answers failing it are not cached
+        Returns: the stripped answer text, or None on an API error
+        """
+        model = model or self.model
+        options = options or {}
+        key = cache_key(model, prompt, options, format=format) if cache else None
+
+        if cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": options,
+            "keep_alive": self.keep_alive
+        }
+        if format is not None:
+            payload["format"] = format
+
+        queued = time.perf_counter()
+        with self._semaphore:
+            started = time.perf_counter()
+            self.queue_wait.add(started - queued)
+            with tracing.span('llm: generate', 'llm', model=model):
+                response = self._session.post(f"{self.base_url}/api/generate", json=payload, timeout=self.timeout)
+            self.histogram.add(time.perf_counter() - started)
+
+        if response.status_code != 200:
+            log.warning("  [X] Ollama API error: HTTP %s", response.status_code)
+            return None
+
+        self._preloaded.add(model)
+        answer = response.json().get('response', '').strip()
+        if cache and (validate is None or validate(answer)):
+            cache.put(key, model, answer)
+        return answer
+
+    def embed(self, texts, model=None):
+        """
+        Embedding vectors for texts in one /api/embed request (same concurrency limit)
+        Returns: list of vectors in input order, or None on an API error
+        """
+        payload = {"model": model or self.model, "input": list(texts), "keep_alive": self.keep_alive}
+
+        queued = time.perf_counter()
+        with self._semaphore:
+            started = time.perf_counter()
+            self.queue_wait.add(started - queued)
+            with tracing.span('llm: embed', 'llm', labels=len(payload["input"])):
+                response = self._session.post(f"{self.base_url}/api/embed", json=payload, timeout=self.timeout)
+            self.histogram.add(time.perf_counter() - started)
+
+        if response.status_code != 200:
+            log.warning("  [X] Ollama embed error: HTTP %s", response.status_code)
+            return None
+
+        return response.json().get('embeddings')
+
+    async def agenerate(self, prompt, **kwargs):
+        """generate() for asyncio code; the semaphore still bounds concurrency"""
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
+    async def agenerate_many(self, prompts, **kwargs):
+        """Answers for several prompts, in order, issued concurrently up to the limit"""
+        return await asyncio.gather(*(self.agenerate(prompt, **kwargs) for prompt in prompts))
+
+    def close(self):
+        self._session.close()
@@ -0,0 +1,240 @@
+"""
+Locale Variant URL Probing
+Finds which URL variants of a site really serve a target locale
+
+Instead of one string replace and a full browser navigation, every common
+way sites expose a locale is generated and fetched concurrently over the
+pooled HTTP session (asyncio over worker threads):
+- path prefixes: /fr-ca/, /fr_CA/, /fr-CA/, /fr/ (replacing an existing culture segment)
+- subdomains: fr.site.com, fr-ca.site.com (replacing an existing subdomain;
+  culture segment dropped from the path)
+- query parameters: ?lang=fr, ?locale=fr-CA, ?hl=fr
+- country-code TLDs: site.ca, site.fr (site.co.uk -> site.ca)
+- hreflang alternates the page declares for the locale or its bare language
+Each variant's redirect chain is recorded and its text classified, so the
+whole check costs about one round trip instead of a page load per variant.
+
+Variants are fetched with the source locale's Accept-Language (or none), so a
+site that negotiates content can't make every URL look localized: the URL
+alone has to produce the locale. Each variant is scoped 'region' when it pins
+the locale's region (/fr-ca/, site.ca, hreflang fr-CA) and 'language' when it
+only names the language (/fr/, fr.site.com, hreflang fr) - French at /fr/ is
+not evidence of Canadian French. A regional candidate that redirects to a URL
+without the region (/fr-ca/ -> /fr/) is scored by where it landed.
+"""
+
+import asyncio
+import ipaddress
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit, urlencode, parse_qsl
+
+import http_precheck
+from scheduler import TWO_LABEL_SUFFIXES
+
+# Country-code TLD per locale region, or per language when no region is given
+LANGUAGE_TLDS = {
+    'es': 'es', 'fr': 'fr', 'de': 'de', 'it': 'it', 'pt': 'pt', 'ru': 'ru',
+    'ja': 'jp', 'ko': 'kr', 'zh': 'cn', 'ar': 'sa'
+}
+
+# A leading path segment that already is a culture code: /en/, /en-ca/, /en_US/
+CULTURE_SEGMENT = re.compile(r'^/([a-z]{2})(?:[-_]([a-z]{2}))?(?=/|$)', re.IGNORECASE)
+
+QUERY_PARAMS = ['lang', 'locale', 'hl']
+
+
+def _split_locale(locale):
+    parts = re.split(r'[-_]', locale.lower())
+    return parts[0], (parts[1] if len(parts) > 1 else None)
+
+
+def _split_host(host):
+    """'app.site.co.uk' -> (['app'], 'site', 'co.uk'); None for IP addresses and bare names"""
+    try:
+        ipaddress.ip_address(host)
+        return None
+    except ValueError:
+        pass
+
+    labels = host.lower().split('.')
+    suffix_length = 2 if '.'.join(labels[-2:]) in TWO_LABEL_SUFFIXES else 1
+    if len(labels) <= suffix_length:
+        return None
+    return labels[:-suffix_length - 1], labels[-suffix_length - 1], '.'.join(labels[-suffix_length:])
+
+
+def pins_region(url, language, region):
+    """
+    Whether url itself names language-region: a culture segment (/fr-ca/), a culture
+    subdomain (fr-ca.site.com), a locale/lang/hl query value (fr-CA) or the region's ccTLD
+    """
+    if not region:
+        return False
+    code = f"{language}-{region}"
+    parts = urlsplit(url)
+
+    match = CULTURE_SEGMENT.match(parts.path or '/')
+    if match and match.group(1).lower() == language and (match.group(2) or '').lower() == region:
+        return True
+
+    split_host = _split_host(parts.hostname or '')
+    if split_host:
+        subdomains, _, suffix = split_host
+        if suffix == region or (subdomains and subdomains[0].replace('_', '-') == code):
+            return True
+
+    return any(value.lower().replace('_', '-') == code
+               for param, value in parse_qsl(parts.query) if param in QUERY_PARAMS)
+
+
+def candidate_urls(url, locale, hreflang=None):
+    """
+    Every variant URL of `url` that could serve `locale`
+    Returns: list of (kind, url, scope) without duplicate URLs, in generation order;
+             scope is 'region' when the URL pins the locale's region, else 'language'
+    """
+    language, region = _split_locale(locale)
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    regional = 'region' if region else 'language'
+
+    candidates = []
+
+    # Path prefixes (replace /en-ca/ etc. rather than nesting /fr-ca/en-ca/)
+    rest = CULTURE_SEGMENT.sub('', path) or '/'
+    if not rest.startswith('/'):
+        rest = '/' + rest
+    codes = [(language, 'language')]
+    if region:
+        codes = [(f"{language}-{region}", 'region'), (f"{language}_{region.upper()}", 'region'),
+                 (f"{language}-{region.upper()}", 'region')] + codes
+    for code, scope in codes:
+        candidates.append(('path', urlunsplit((parts.scheme, parts.netloc, f"/{code}{rest}", parts.query, '')), scope))
+
+    host = parts.hostname or ''
+    split_host = _split_host(host)
+
+    # Subdomains (www.site.com/en-ca/x -> fr.site.com/x; app.site.com -> fr.site.com)
+    if split_host:
+        _, name, suffix = split_host
+        for code, scope in ([(language, 'language'), (f"{language}-{region}", 'region')] if region
+                            else [(language, 'language')]):
+            netloc = parts.netloc.replace(host, f"{code}.{name}.{suffix}", 1)
+            candidates.append(('subdomain', urlunsplit((parts.scheme, netloc, rest, parts.query, '')), scope))
+
+    # Query parameters
+    query = dict(parse_qsl(parts.query))
+    for param in QUERY_PARAMS:
+        if region and param == 'locale':
+            value, scope = f"{language}-{region.upper()}", 'region'
+        else:
+            value, scope = language, 'language'
+        candidates.append(('query', urlunsplit((parts.scheme, parts.netloc, rest, urlencode({**query, param: value}), '')), scope))
+
+    # Country-code TLD (site.com -> site.ca for fr-ca, site.co.uk -> site.ca)
+    tld = region or LANGUAGE_TLDS.get(language)
+    if tld and split_host and split_host[2] != tld:
+        subdomains, name, _ = split_host
+        netloc = parts.netloc.replace(host, '.'.join(subdomains + [name, tld]), 1)
+        candidates.append(('cctld', urlunsplit((parts.scheme, netloc, rest, parts.query, '')), regional))
+
+    # Declared alternates: the locale itself, or the bare language (not fr-FR for fr-CA)
+    for code, href in (hreflang or {}).items():
+        code_language, code_region = _split_locale(code)
+        if not href or code_language != language:
+            continue
+        if region and code_region == region:
+            candidates.append(('hreflang', urljoin(url, href), 'region'))
+        elif not code_region or not region:
+            candidates.append(('hreflang', urljoin(url, href), 'language'))
+
+    seen = set()
+    unique = []
+    for kind, candidate, scope in candidates:
+        if candidate not in seen and candidate.rstrip('/') != url.rstrip('/'):
+            seen.add(candidate)
+            unique.append((kind, candidate, scope))
+    return unique
+
+
+async def aprobe(url, locale, classify, hreflang=None, source_locale=None, max_concurrency=16, timeout=8,
+                 max_bytes=300_000):
+    """
+    Fetch all candidate URLs concurrently
+    Args:
+        classify: Callable(text, html_lang, language) -> (is_match, detected, evidence)
+        hreflang: Alternates already known for url; None fetches url first-round alongside the rest
+        source_locale: Accept-Language sent with every request (the locale the site was found in);
+                       None sends none. Never the target locale, or content negotiation would
+                       make every variant look localized.
+    Returns: list of variant dicts (kind, scope, url, final_url, redirects, status, serves, evidence)
+    """
+    language, region = _split_locale(locale)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(target):
+        async with semaphore:
+            return await asyncio.to_thread(http_precheck.fetch_page, target, source_locale,
+                                           timeout=timeout, max_bytes=max_bytes)
+
+    candidates = candidate_urls(url, locale, hreflang)
+    tasks = [fetch(candidate) for _, candidate, _ in candidates]
+    if hreflang is None:
+        tasks.append(fetch(url))
+
+    pages = await asyncio.gather(*tasks)
+
+    if hreflang is None:
+        # Second round only for alternates the page declared that we hadn't guessed
+        declared = pages.pop().get('hreflang') or {}
+        known = {candidate for _, candidate, _ in candidates}
+        extra = [(kind, candidate, scope) for kind, candidate, scope in candidate_urls(url, locale, declared)
+                 if kind == 'hreflang' and candidate not in known]
+        if extra:
+            candidates += extra
+            pages += await asyncio.gather(*(fetch(candidate) for _, candidate, _ in extra))
+
+    variants = []
+    for (kind, candidate, scope), page in zip(candidates, pages):
+        # /fr-ca/ redirecting to /fr/ only shows the language: judge the URL that was served
+        if scope == 'region' and page.get('redirects') and page.get('final_url') \
+                and not pins_region(page['final_url'], language, region):
+            scope = 'language'
+        variant = {
+            'kind': kind,
+            'scope': scope,
+            'url': candidate,
+            'final_url': page.get('final_url'),
+            'redirects': page.get('redirects', []),
+            'status': page.get('status'),
+            'elapsed': page['elapsed'],
+            'serves': False
+        }
+        if 'error' in page:
+            variant['evidence'] = f"Error: {page['error']}"
+        elif page['status'] != 200:
+            variant['evidence'] = f"HTTP {page['status']}"
+        else:
+            is_match, _, evidence = classify(page['text'], page['html_lang'] or page['content_language'], language)
+            variant['serves'] = is_match
+            variant['evidence'] = evidence
+        variants.append(variant)
+
+    return variants
+
+
+def probe(url, locale, classify, hreflang=None, **kwargs):
+    """Blocking aprobe() for code that isn't running an event loop (audit threads)"""
+    return asyncio.run(aprobe(url, locale, classify, hreflang=hreflang, **kwargs))
+
+
+def format_report(variants):
+    """One line per variant: verdict, kind, URL (-> final URL when redirected), evidence"""
+    lines = []
+    for v in variants:
+        mark = '[+]' if v['serves'] else '[X]'
+        hop = f" -> {v['final_url']}" if v['final_url'] and v['final_url'] != v['url'] else ''
+        evidence = v['evidence'] if len(v['evidence']) <= 80 else v['evidence'][:77] + '...'
+        scope = ' [language only]' if v.get('scope') == 'language' else ''
+        lines.append(f"    {mark} {v['kind']:<9} {v['url']}{hop}{scope} ({evidence})")
+    return '\n'.join(lines)
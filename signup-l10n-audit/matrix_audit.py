@@ -0,0 +1,241 @@
+"""
+Multi-Locale Matrix Audit
+Audits each site against many target locales in one run: a site x locale grid
+
+Per site, the first locale runs a normal audit that also discovers the signup
+page URL and the language selector. Every other locale then runs in parallel
+in its own pooled browser (Chrome's Accept-Language is per launch), opens the
+discovered signup URL directly instead of hunting for the button again, and
+reuses the identified selector without asking the LLM. A culture segment in
+the discovered URL (/en-ca/signup) is swapped for the cell's locale (or
+dropped); when neither URL resolves the cell finds the button itself.
+
+Usage:
+    python matrix_audit.py www.stripe.com www.shopify.com --locales es,fr,de,ja
+"""
+
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit, urlunsplit
+
+import audit_log
+import http_precheck
+import locale_probe
+import tracing
+from parallel_runner import ParallelAuditRunner, _ThreadOutput
+
+log = audit_log.get_logger('matrix')
+
+# Every non-English locale the audit knows (SignupLocalizationAudit.locale_names)
+DEFAULT_LOCALES = ['es', 'fr', 'de', 'pt', 'it', 'ja', 'zh', 'ko', 'ru', 'ar']
+
+SHORT_VERDICTS = {'EXCELLENT': 'EXC', 'PARTIAL': 'PART', 'POOR': 'POOR', 'UNKNOWN': '?',
+                  'TIMEOUT': 'T/O', 'ERROR': 'ERR'}
+
+
+def signup_urls_for(url, locale):
+    """
+    Shared signup URL rewritten for `locale`: '/en-ca/signup' -> ['/fr/signup', '/signup'] for 'fr'
+    Returns: candidate URLs, best first ([url] when it has no culture segment)
+    """
+    parts = urlsplit(url)
+    match = locale_probe.CULTURE_SEGMENT.match(parts.path)
+    if not match:
+        return [url]
+
+    rest = parts.path[match.end():] or '/'
+    language, *region = re.split(r'[-_]', locale.lower())
+    code = language
+    if region:
+        separator = match.group(0)[3] if match.group(2) else '-'
+        upper = bool(match.group(2)) and match.group(2).isupper()
+        code = f"{language}{separator}{region[0].upper() if upper else region[0]}"
+
+    localized = urlunsplit((parts.scheme, parts.netloc, f"/{code}{rest}", parts.query, parts.fragment))
+    neutral = urlunsplit((parts.scheme, parts.netloc, rest, parts.query, parts.fragment))
+    return [localized, neutral]
+
+
+class MatrixAuditRunner(ParallelAuditRunner):
+    """
+    Same options as ParallelAuditRunner; `workers` bounds the browsers running at once
+    across all (site, locale) cells
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.grid = {}  # site -> {locale: result}
+
+    def _run_cell(self, output, site_url, locale, **audit_options):
+        output.start_capture()
+        try:
+            if audit_options.get('signup_url'):
+                audit_options['signup_url'] = self._resolve_signup_url(audit_options['signup_url'], locale)
+            result = self.audit_site(site_url, locale, **audit_options)
+        finally:
+            captured = output.stop_capture()
+
+        with self._lock:
+            self.outputs[(site_url, locale)] = captured
+            self.grid.setdefault(site_url, {})[locale] = self._fill_defaults(result)
+
+        return result
+
+    def _resolve_signup_url(self, url, locale):
+        """First of signup_urls_for() that loads (HTTP < 400), or None to rediscover the button"""
+        candidates = signup_urls_for(url, locale)
+        if len(candidates) == 1:
+            return url  # No culture segment: the discovered URL is locale-neutral
+
+        for candidate in candidates:
+            page = http_precheck.fetch_page(candidate, locale, timeout=8, max_bytes=65536)
+            if 'error' not in page and page['status'] < 400:
+                return candidate
+
+        log.info("  [i] Shared signup URL %s has no %s equivalent; finding the button instead", url, locale)
+        return None
+
+    def run_matrix(self, sites, locales=None):
+        """
+        Audit every site for every locale
+        Returns: {site: {locale: result}} (also added to self.results as "site [locale]" rows)
+        """
+        locales = locales or DEFAULT_LOCALES
+        discovery_locale, other_locales = locales[0], locales[1:]
+
+        output = _ThreadOutput(sys.stdout)
+        sys.stdout = output
+        started = time.perf_counter()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='matrix') as pool:
+                # Phase 1: one discovery audit per site
+                discovery = {pool.submit(self._run_cell, output, site, discovery_locale): site for site in sites}
+                cells = {}
+
+                for future in as_completed(discovery):
+                    site = discovery[future]
+                    try:
+                        found = future.result()
+                    except Exception as e:
+                        found = {'site': site, 'status': 'ERROR', 'error': str(e)}
+                        self.grid.setdefault(site, {})[discovery_locale] = self._fill_defaults(found)
+                    log.info("[discovery] %s (%s): %s, signup page: %s", site, discovery_locale, found['status'],
+                             found.get('signup_url') or 'not found')
+
+                    # Phase 2: the other locales, fanned out as soon as this site's discovery is done
+                    shared = {'signup_url': found.get('signup_url'), 'language_selector': found.get('language_selector')}
+                    for locale in other_locales:
+                        cells[pool.submit(self._run_cell, output, site, locale, **shared)] = (site, locale)
+
+                for future in as_completed(cells):
+                    site, locale = cells[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'site': site, 'status': 'ERROR', 'error': str(e)}
+                        self.grid.setdefault(site, {})[locale] = self._fill_defaults(result)
+                    log.info("[%s] %s: %s", locale, site, result['status'])
+        finally:
+            sys.stdout = output._stream
+            if self.driver_pool:
+                self.driver_pool.close()
+
+        for site in sites:
+            for locale in locales:
+                result = self.grid.get(site, {}).get(locale)
+                if result:
+                    self.results.append({**result, 'site': f"{site} [{locale}]"})
+
+        elapsed = time.perf_counter() - started
+        print(f"\nAudited {len(sites)} site(s) x {len(locales)} locale(s) with {self.workers} worker(s) in {elapsed:.1f}s")
+        if self.driver_pool:
+            stats = self.driver_pool.stats
+            print(f"Browsers: {stats['launched']} launched, {stats['reused']} reused, {stats['recycled']} recycled")
+        if tracing.get_tracer().enabled:
+            print("Time per phase:")
+            print(tracing.get_tracer().report())
+
+        return self.grid
+
+    def format_grid(self, sites, locales=None):
+        """site x locale table of verdicts and passed/total"""
+        locales = locales or DEFAULT_LOCALES
+        width = max([len(site) for site in sites] + [4]) + 2
+        lines = [f"{'Site':<{width}}" + ''.join(f"{locale:>10}" for locale in locales)]
+        lines.append('-' * len(lines[0]))
+
+        for site in sites:
+            row = f"{site:<{width}}"
+            for locale in locales:
+                result = self.grid.get(site, {}).get(locale)
+                if not result:
+                    cell = '-'
+                elif result['tests_total']:
+                    cell = f"{SHORT_VERDICTS.get(result['status'], result['status'])} {result['tests_passed']}/{result['tests_total']}"
+                else:
+                    cell = SHORT_VERDICTS.get(result['status'], result['status'])
+                row += f"{cell:>10}"
+            lines.append(row)
+
+        return '\n'.join(lines)
+
+    def full_output(self, sites, locales=None):
+        """Captured output per (site, locale) cell, in grid order"""
+        locales = locales or DEFAULT_LOCALES
+        parts = []
+        for site in sites:
+            for locale in locales:
+                captured = self.outputs.get((site, locale))
+                if captured:
+                    parts.append(f"\n{'='*70}\n")
+                    parts.append(f"TEST: {site} [{locale}]\n")
+                    parts.append(f"{'='*70}\n")
+                    parts.append(captured)
+        return ''.join(parts)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Audit sites against many locales: one site x locale grid")
+    parser.add_argument('sites', nargs='+', help="Sites to audit")
+    parser.add_argument('--locales', default=','.join(DEFAULT_LOCALES),
+                        help="Comma-separated target locales; the first one runs discovery (default: all)")
+    parser.add_argument('-w', '--workers', type=int, default=4, help="Concurrent browsers (default: 4)")
+    parser.add_argument('-t', '--timeout', type=int, default=120, help="Per-cell timeout in seconds (default: 120)")
+    parser.add_argument('--headed', action='store_true', help="Show browser windows")
+    parser.add_argument('--ollama-url', default="http://localhost:11434")
+    parser.add_argument('--llm-concurrency', type=int, default=2, help="LLM requests in flight at once (default: 2)")
+    parser.add_argument('--matcher', choices=['llm', 'embedding'], default='llm')
+    parser.add_argument('--http-precheck', action='store_true',
+                        help="Test homepages over plain HTTP when possible; Chrome only for the signup step")
+    parser.add_argument('--trace', metavar='PATH', help="Write a Chrome trace of per-step timings to PATH")
+    args = parser.parse_args()
+    if args.trace:
+        tracing.enable()
+
+    locales = [locale.strip() for locale in args.locales.split(',') if locale.strip()]
+
+    runner = MatrixAuditRunner(
+        workers=args.workers,
+        timeout=args.timeout,
+        headless=not args.headed,
+        ollama_url=args.ollama_url,
+        llm_concurrency=args.llm_concurrency,
+        matcher=args.matcher,
+        http_precheck=args.http_precheck
+    )
+    runner.run_matrix(args.sites, locales)
+
+    print()
+    print(runner.format_grid(args.sites, locales))
+
+    runner.locale = ','.join(locales)
+    runner.write_results(full_output=runner.full_output(args.sites, locales))
+    print(f"\nResults saved to: {runner.output_file}")
+    if args.trace:
+        tracing.get_tracer().export_chrome_trace(args.trace)
+        print(f"Trace saved to: {args.trace}")
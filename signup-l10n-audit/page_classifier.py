@@ -0,0 +1,112 @@
+"""
+Combined Structured Page Classification
+One LLM request per page state for both questions the audit asks:
+which dropdown is the language selector, and which button is the signup button
+
+Uses Ollama's structured output (format = JSON schema), so the answer is a
+JSON object we validate instead of free text we regex for a number.
+"""
+
+import hashlib
+import json
+
+
+def build_schema(selector_count, button_count):
+    """JSON schema for the answer; 0 means "none of them\""""
+    return {
+        "type": "object",
+        "properties": {
+            "language_selector": {"type": "integer", "minimum": 0, "maximum": selector_count},
+            "signup_button": {"type": "integer", "minimum": 0, "maximum": button_count}
+        },
+        "required": ["language_selector", "signup_button"]
+    }
+
+
+def build_prompt(selectors, buttons):
+    """
+    Args:
+        selectors: dom_candidates.extract_selects() entries
+        buttons: dom_candidates.extract_clickables() entries (already shortlisted)
+    """
+    selector_lines = [
+        f"S{i+1}. ID: {s['id']}, Name: {s['name']}, Options: {', '.join(s['options'][:3])}"
+        for i, s in enumerate(selectors)
+    ] or ["(none)"]
+    button_lines = [f"B{i+1}. {b['text']}" for i, b in enumerate(buttons)] or ["(none)"]
+
+    return f"""You are analyzing one web page for a localization audit. Answer two questions.
+
+1. LANGUAGE SELECTOR: which dropdown lets the user pick a language or country?
+   Its options look like country names ("Canada", "France", "日本"), language names
+   ("English", "Français", "Español", "日本語") or locale codes ("en-CA", "fr-FR").
+
+2. SIGNUP BUTTON: which button creates a NEW account or starts a FREE trial?
+   e.g. Sign up, Register, Create account, Join, Get started, Start free, Try free,
+   Registrarse, Crear cuenta, Empezar, S'inscrire, Créer un compte, Démarrer.
+   NOT: Login/Sign in (existing users), Contact sales, Pricing, About, Products.
+
+Dropdowns:
+{chr(10).join(selector_lines)}
+
+Buttons:
+{chr(10).join(button_lines)}
+
+Reply with JSON: {{"language_selector": <dropdown number, 0 if none>, "signup_button": <button number, 0 if none>}}"""
+
+
+def parse_answer(answer, selector_count, button_count):
+    """
+    Validate the model's JSON against the schema
+    Returns: {'language_selector': index or None, 'signup_button': index or None}
+             (0-based indexes), or None if the answer is not valid
+    """
+    try:
+        data = json.loads(answer)
+    except (TypeError, ValueError):
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    parsed = {}
+    for field, count in (('language_selector', selector_count), ('signup_button', button_count)):
+        value = data.get(field)
+        # bool is an int subclass; "true" is not a valid index
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= count:
+            return None
+        parsed[field] = value - 1 if value else None
+
+    return parsed
+
+
+def page_state_key(url, selectors, buttons):
+    """Identifies a page state: same URL and same candidates -> same answer"""
+    digest = hashlib.sha1()
+    digest.update(url.encode('utf-8'))
+    for s in selectors:
+        digest.update(f"S|{s['id']}|{s['name']}|{'|'.join(s['options'])}".encode('utf-8'))
+    for b in buttons:
+        digest.update(f"B|{b['text']}|{b.get('href') or ''}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def classify(client, selectors, buttons, cache=None, options=None):
+    """
+    One structured request for both questions
+    Returns: (parsed or None, raw answer text or None)
+    """
+    if not selectors and not buttons:
+        return {'language_selector': None, 'signup_button': None}, None
+
+    answer = client.generate(
+        build_prompt(selectors, buttons),
+        options=options or {"temperature": 0.1, "num_predict": 40},
+        cache=cache,
+        format=build_schema(len(selectors), len(buttons)),
+        validate=lambda text: parse_answer(text, len(selectors), len(buttons)) is not None
+    )
+    if answer is None:
+        return None, None
+
+    return parse_answer(answer, len(selectors), len(buttons)), answer
@@ -0,0 +1,380 @@
+"""
+Parallel Test Runner for Sign-Up Localization Audit
+Audits N sites at once with a pool of headless Chrome workers
+
+Each worker runs a SignupLocalizationAudit in-process (no subprocess per site),
+with its own throwaway Chrome profile and its own per-site deadline.
+WebDriver calls are HTTP round trips to chromedriver, so threads scale close to
+linearly until the machine runs out of CPU/RAM for the browsers themselves.
+"""
+
+import io
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import audit_log
+from change_detection import ChangeDetector
+from checkpoint import SuiteCheckpoint, latest_run
+from driver_pool import DriverPool
+from llm_cache import get_llm_cache
+from llm_client import get_ollama_client
+from resource_policy import ResourcePolicy
+import tracing
+from run_test_suite import TestRunner
+from scheduler import SiteScheduler, get_latency_history, load_sites
+from signup_localization_audit_v2_integrated import SignupLocalizationAudit
+
+
+class _ThreadOutput:
+    """
+    sys.stdout stand-in that sends each worker thread's prints to its own buffer
+    Threads that are not capturing write straight through to the real stream
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def start_capture(self):
+        self._local.buffer = io.StringIO()
+
+    def stop_capture(self):
+        buffer = getattr(self._local, 'buffer', None)
+        self._local.buffer = None
+        return buffer.getvalue() if buffer else ''
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        buffer = getattr(self._local, 'buffer', None)
+        (buffer or self._stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class ParallelAuditRunner(TestRunner):
+    """
+    Runs audits concurrently and collects the same result dicts as TestRunner,
+    so print_summary() and write_results() work unchanged
+    """
+
+    def __init__(self, workers=4, timeout=120, headless=True, ollama_url="http://localhost:11434",
+                 output_file=None, reuse_browsers=True, max_uses=25, llm_concurrency=2, matcher="llm",
+                 http_precheck=False, resource_policy=None, checkpoint=None, max_per_domain=1,
+                 domain_interval=2.0, adaptive_timeouts=True, change_detector=None):
+        """
+        Args:
+            workers: Number of sites audited at the same time (one Chrome each)
+            timeout: Per-site budget in seconds (the default when a site has no latency history);
+                     the browser is killed when it runs out
+            headless: Run Chrome headless (recommended for more than one worker)
+            ollama_url: URL of local Ollama instance
+            output_file: Results file (default: timestamped, like TestRunner)
+            reuse_browsers: Lease warm browsers from a DriverPool instead of launching per site
+            max_uses: Sites per pooled browser before it is recycled
+            llm_concurrency: LLM requests in flight at once across all workers
+            matcher: "llm" or "embedding" (see SignupLocalizationAudit)
+            http_precheck: Decide homepage tests over HTTP where possible (browser only for signup)
+            resource_policy: ResourcePolicy shared by all audits (None loads everything)
+            checkpoint: SuiteCheckpoint for resumable runs (see TestRunner)
+            max_per_domain: Audits of one organisation (amazon.com, amazon.es, ...) running at once
+            domain_interval: Seconds between two audit starts on the same organisation
+            adaptive_timeouts: Budget each site from its recorded latency instead of a flat `timeout`
+            change_detector: ChangeDetector for incremental runs (see TestRunner)
+        """
+        super().__init__(output_file=output_file, checkpoint=checkpoint, change_detector=change_detector)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.headless = headless
+        self.ollama_url = ollama_url
+        self.matcher = matcher
+        self.http_precheck = http_precheck
+        self.resource_policy = resource_policy
+        self.max_per_domain = max_per_domain
+        self.domain_interval = domain_interval
+        self.history = get_latency_history() if adaptive_timeouts else None
+        self.llm = get_ollama_client(ollama_url, max_concurrency=llm_concurrency)
+        self.driver_pool = DriverPool(headless=headless, max_uses=max_uses, max_idle=self.workers) if reuse_browsers else None
+        self.outputs = {}  # site -> captured audit output
+        self._lock = threading.Lock()
+
+    def audit_site(self, site_url, locale='es', timeout=None, **audit_options):
+        """
+        Audit one site in the calling thread; returns a TestRunner-style result dict
+        timeout overrides the runner's per-site budget (seconds)
+        audit_options are passed to SignupLocalizationAudit (e.g. signup_url from a matrix discovery run)
+        """
+        timeout = timeout or self.timeout
+        # Pooled browsers bring their own profile; direct launches get a throwaway one
+        profile_dir = None if self.driver_pool else tempfile.mkdtemp(prefix='l10n-audit-')
+        audit = SignupLocalizationAudit(
+            base_url=site_url,
+            target_locale=locale,
+            ollama_url=self.ollama_url,
+            llm_client=self.llm,
+            matcher=self.matcher,
+            http_precheck=self.http_precheck,
+            resource_policy=self.resource_policy,
+            headless=self.headless,
+            profile_dir=profile_dir,
+            driver_pool=self.driver_pool,
+            **audit_options
+        )
+
+        timed_out = threading.Event()
+
+        def on_deadline():
+            timed_out.set()
+            audit.abort()
+
+        timer = threading.Timer(timeout, on_deadline)
+        timer.daemon = True
+        started = time.perf_counter()
+        error = None
+
+        timer.start()
+        try:
+            audit.run_full_audit(interactive=False)
+        except Exception as e:
+            error = str(e)
+        finally:
+            timer.cancel()
+            if profile_dir:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+
+        duration = time.perf_counter() - started
+
+        if timed_out.is_set():
+            return {
+                'site': site_url,
+                'status': 'TIMEOUT',
+                'error': f'Test exceeded {timeout:.0f} seconds',
+                'duration': duration
+            }
+
+        if error:
+            return {
+                'site': site_url,
+                'status': 'ERROR',
+                'error': error,
+                'duration': duration
+            }
+
+        return {**audit.to_record(), 'site': site_url, 'duration': duration}
+
+    def _run_one(self, output, site_url, locale, timeout=None):
+        output.start_capture()
+        try:
+            result = self.audit_site(site_url, locale, timeout=timeout)
+        finally:
+            captured = output.stop_capture()
+
+        with self._lock:
+            self.outputs[site_url] = captured
+
+        if self.change_detector:
+            self.change_detector.store(site_url, locale, result)
+
+        return result
+
+    def run(self, sites, locale='es', priorities=None):
+        """
+        Audit all sites with `workers` concurrent browsers
+        Results keep the order of `sites`; progress is printed as sites finish.
+        Sites start in priority order ({site: number}, higher first) under the per-organisation
+        limits of SiteScheduler. Every result is checkpointed as it arrives; sites the checkpoint
+        already has a final result for are skipped and failed ones retried after their backoff.
+        """
+        self.locale = locale
+        output = _ThreadOutput(sys.stdout)
+        sys.stdout = output
+
+        started = time.perf_counter()
+        ran = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='audit') as pool:
+                for batch in self.checkpoint.rounds(sites, locale):
+                    batch = self._reuse_unchanged(batch, locale)
+                    scheduler = SiteScheduler(batch, priorities, max_per_domain=self.max_per_domain,
+                                              min_interval=self.domain_interval, history=self.history,
+                                              default_timeout=self.timeout)
+                    running = {}
+                    done = 0
+
+                    while not scheduler.finished:
+                        # Keep every worker busy with whatever the politeness limits allow
+                        while len(running) < self.workers:
+                            site = scheduler.next_ready()
+                            if site is None:
+                                break
+                            future = pool.submit(self._run_one, output, site, locale, scheduler.timeout_for(site))
+                            running[future] = site
+
+                        if not running:
+                            time.sleep(scheduler.seconds_until_ready() or 0.1)
+                            continue
+
+                        # All workers busy: wait for one; otherwise also wake up when a rate-limited domain may start
+                        wake_up = None if len(running) >= self.workers else scheduler.seconds_until_ready()
+                        finished, _ = wait(running, timeout=wake_up, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            site = running.pop(future)
+                            try:
+                                result = future.result()
+                            except Exception as e:
+                                result = {'site': site, 'status': 'ERROR', 'error': str(e)}
+                            scheduler.release(site, result)
+                            self.checkpoint.record(site, locale, self._fill_defaults(result))
+                            ran.append(result)
+                            done += 1
+
+                            duration = result.get('duration')
+                            took = f" in {duration:.1f}s" if duration is not None else ""
+                            print(f"[{done}/{len(batch)}] {site}: {result['status']}{took}")
+        finally:
+            sys.stdout = output._stream
+            if self.driver_pool:
+                self.driver_pool.close()
+
+        results = self.checkpoint.results(sites, locale)
+        self.results.extend(self._fill_defaults(results[site]) for site in sites if site in results)
+
+        elapsed = time.perf_counter() - started
+        print(f"\nAudited {len(ran)} site(s) with {self.workers} worker(s) in {elapsed:.1f}s")
+        if self.driver_pool:
+            stats = self.driver_pool.stats
+            print(f"Browsers: {stats['launched']} launched, {stats['reused']} reused, {stats['recycled']} recycled")
+        if self.resource_policy:
+            blocked = sum(r.get('blocked_requests', 0) for r in ran)
+            saved = sum(r.get('bytes_saved', 0) for r in ran)
+            print(f"Resource blocking: {blocked} request(s) blocked, ~{saved / 1e6:.1f} MB saved")
+
+        cache = get_llm_cache().stats()
+        print(f"LLM cache: {cache['hits']} hit(s), {cache['misses']} miss(es) ({cache['hit_rate']*100:.0f}% hit rate)")
+        if self.llm.histogram.total:
+            print("LLM latency:")
+            print(self.llm.histogram.report())
+        if tracing.get_tracer().enabled:
+            print("Time per phase:")
+            print(tracing.get_tracer().report())
+
+        return self.results
+
+    def full_output(self, sites):
+        """Captured per-site output in suite order, formatted like TestRunner's full output"""
+        parts = []
+        for i, site in enumerate(sites, 1):
+            if self.outputs.get(site):
+                parts.append(f"\n{'='*70}\n")
+                parts.append(f"TEST {i}: {site}\n")
+                parts.append(f"{'='*70}\n")
+                parts.append(self.outputs[site])
+        return ''.join(parts)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Audit many sites concurrently with headless Chrome")
+    parser.add_argument('sites', nargs='*', help="Sites to audit (default: the 10-site suite)")
+    parser.add_argument('-w', '--workers', type=int, default=4, help="Concurrent browsers (default: 4)")
+    parser.add_argument('-t', '--timeout', type=int, default=120,
+                        help="Per-site timeout in seconds for sites without latency history (default: 120)")
+    parser.add_argument('-l', '--locale', default='es', help="Target locale (default: es)")
+    parser.add_argument('--sites-file', help="CSV with a site column and optional priority column, or one site per line")
+    parser.add_argument('--per-domain', type=int, default=1,
+                        help="Audits of one organisation (amazon.com, amazon.es, ...) at once (default: 1)")
+    parser.add_argument('--domain-interval', type=float, default=2.0,
+                        help="Seconds between audit starts on one organisation (default: 2)")
+    parser.add_argument('--flat-timeouts', action='store_true',
+                        help="Give every site --timeout instead of a budget from its recorded latency")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reuse stored results for sites whose homepage and signup page haven't changed")
+    parser.add_argument('--headed', action='store_true', help="Show browser windows")
+    parser.add_argument('--ollama-url', default="http://localhost:11434",
+                        help="Ollama server (point at fake_ollama.py for offline/benchmark runs)")
+    parser.add_argument('--llm-concurrency', type=int, default=2, help="LLM requests in flight at once (default: 2)")
+    parser.add_argument('--matcher', choices=['llm', 'embedding'], default='llm',
+                        help="How ambiguous candidates are picked: generative LLM prompt or embedding similarity")
+    parser.add_argument('--http-precheck', action='store_true',
+                        help="Test homepages over plain HTTP when possible; Chrome only for the signup step")
+    parser.add_argument('--block-resources', action='store_true',
+                        help="Block images, fonts, media and trackers (CDP) to speed up page loads")
+    parser.add_argument('--fresh-browsers', action='store_true', help="Launch a new Chrome per site instead of pooling")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="Record per-step timings and write a Chrome trace (chrome://tracing, Perfetto) to PATH")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Include the audits' DEBUG output")
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='RUN_ID',
+                        help="Continue an interrupted run (default: the latest): skip finished sites, retry failed ones")
+    parser.add_argument('--retries', type=int, default=2, help="Retries per site after ERROR/TIMEOUT (default: 2)")
+    parser.add_argument('--retry-backoff', type=float, default=30,
+                        help="Seconds before the first retry, doubling after each failure (default: 30)")
+    args = parser.parse_args()
+    if args.verbose:
+        audit_log.configure(logging.DEBUG)
+    if args.trace:
+        tracing.enable()
+
+    sites = list(args.sites)
+    priorities = {}
+    if args.sites_file:
+        listed, priorities = load_sites(args.sites_file)
+        given = set(sites)
+        sites.extend(site for site in listed if site not in given)
+    if not sites:
+        sites = [
+            'www.shopify.com',
+            'www.stripe.com',
+            'www.amazon.com',
+            'www.bbc.com',
+            'www.netflix.com',
+            'www.walmart.com',
+            'www.cnn.com',
+            'www.openai.com',
+            'www.microsoft.com',
+            'www.anthropic.com',
+        ]
+
+    run_id = latest_run() if args.resume == 'latest' else args.resume
+    checkpoint = SuiteCheckpoint(run_id=run_id, max_attempts=args.retries + 1, backoff=args.retry_backoff)
+    if args.resume:
+        progress = checkpoint.progress(sites, args.locale)
+        print(f"Resuming run {checkpoint.run_id}: {progress['done']} done, "
+              f"{progress['retrying']} to retry, {progress['not_started']} not started")
+    else:
+        print(f"Run {checkpoint.run_id} (continue it with --resume {checkpoint.run_id})")
+
+    runner = ParallelAuditRunner(
+        workers=args.workers,
+        timeout=args.timeout,
+        headless=not args.headed,
+        ollama_url=args.ollama_url,
+        reuse_browsers=not args.fresh_browsers,
+        llm_concurrency=args.llm_concurrency,
+        matcher=args.matcher,
+        http_precheck=args.http_precheck,
+        resource_policy=ResourcePolicy() if args.block_resources else None,
+        checkpoint=checkpoint,
+        max_per_domain=args.per_domain,
+        domain_interval=args.domain_interval,
+        adaptive_timeouts=not args.flat_timeouts,
+        change_detector=ChangeDetector() if args.incremental else None
+    )
+    runner.run(sites, locale=args.locale, priorities=priorities)
+
+    runner.print_summary()
+    runner.write_results(full_output=runner.full_output(sites))
+
+    print(f"\nResults saved to: {runner.output_file}")
+    if args.trace:
+        tracing.get_tracer().export_chrome_trace(args.trace)
+        print(f"Trace saved to: {args.trace}")
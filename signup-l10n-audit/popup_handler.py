@@ -3,193 +3,425 @@ Popup and Cookie Banner Handler
 Auto-dismiss common overlays that interrupt testing
 """
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
 
+from readiness import PageReadiness
+from popup_memory import domain_of, get_popup_memory
+import dom_candidates
+import tracing
+import audit_log
+
+log = audit_log.get_logger('popups')
+
+# One pass over the page that finds overlays and ranks their dismiss targets.
+#
+# Fast path: a handful of elementFromPoint() probes, known-CMP selectors and an
+# iframe check. If none of them finds an overlay we return [] right away.
+# Otherwise only the overlay subtrees (fixed/sticky ancestors, modal dialogs,
+# known consent containers) are searched, including same-origin iframes.
+# Cross-origin consent iframes are returned as frame targets for Python to enter.
+#
+# Labels match on word boundaries ("agree" is not in "Disagree"), accept words
+# don't count on manage/reject buttons, and close controls recognised only by
+# their class name count only inside dialog-like roots, not sticky headers/menus.
+SCAN_OVERLAYS_JS = dom_candidates.HELPERS_JS + """
+var wholeDocument = arguments[0];
+
+var ACCEPT = ['accept all', 'accept', 'agree', 'allow all', 'allow', 'consent', 'got it', 'ok', 'okay',
+              'aceptar', 'acepto', 'aceptar todo', 'accepter', "j'accepte", 'tout accepter',
+              'akzeptieren', 'alle akzeptieren', 'zustimmen', 'einverstanden', 'aceitar', 'accetta',
+              'accetto', '\u540c\u610f', '\u627f\u8afe', '\ub3d9\uc758', '\u043f\u0440\u0438\u043d\u044f\u0442\u044c'];
+var CLOSE = ['close', 'dismiss', 'no thanks', 'not now', 'fermer', 'cerrar', 'schlie\u00dfen', 'fechar',
+             'chiudi', '\u00d7', '\u2715', '\u2716', 'x'];
+// [selector, kind]: consent-manager buttons first, then generic close controls
+var KNOWN = [
+    ['#onetrust-accept-btn-handler', 'cookie-banner'],
+    ['#accept-recommended-btn-handler', 'cookie-banner'],
+    ['#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll', 'cookie-banner'],
+    ['#CybotCookiebotDialogBodyButtonAccept', 'cookie-banner'],
+    ['#didomi-notice-agree-button', 'cookie-banner'],
+    ['#truste-consent-button', 'cookie-banner'],
+    ['.qc-cmp2-summary-buttons button[mode="primary"]', 'cookie-banner'],
+    ['[data-testid="uc-accept-all-button"]', 'cookie-banner'],
+    ['.fc-cta-consent', 'cookie-banner'],
+    ['.sp_choice_type_11', 'cookie-banner'],
+    ['.accept-cookies', 'cookie-banner'],
+    ['#accept-cookies', 'cookie-banner'],
+    ["[data-consent='accept']", 'cookie-banner'],
+    ["[data-dismiss='modal']", 'modal'],
+    ['.modal-close', 'modal'],
+    ['.close-button', 'modal']
+];
+// Labels that contain an accept word but don't accept ("Manage consent", "Disagree and close")
+var NOT_ACCEPT = ['manage', 'settings', 'preferences', 'customize', 'customise', 'options', 'more',
+                  'reject', 'decline', 'disagree', 'deny', 'refuse', "don't", 'do not',
+                  'rechazar', 'configurar', 'refuser', 'param\u00e8tres', 'ablehnen', 'einstellungen'];
+var CONSENT_WORDS = ['consent', 'privacy', 'cookie', 'gdpr'];
+var NOT_OVERLAY = 'header, nav, [role=navigation], [role=banner], [role=menu], [role=menubar]';
+var DIALOG = 'dialog, [role=dialog], [role=alertdialog], [aria-modal=true]';
+var LETTER = /[\\p{L}\\p{N}]/u;
+var UNSPACED = /\\p{Lo}/u;  // CJK, Hangul, ...: scripts written without spaces between words
+var CLICKABLE = 'button, [role=button], a, input[type=button], input[type=submit], span, div[aria-label]';
+
+// word occurs in text as a word: no letter right before it, and none right after unless
+// the word is in a script written without spaces (CJK/Hangul: "\u540c\u610f\u3059\u308b" has "\u540c\u610f").
+// prefixOnly drops the right boundary (tokens like "cookielaw" in iframe URLs).
+function hasWord(text, word, prefixOnly) {
+    var spaced = !UNSPACED.test(word);
+    for (var i = text.indexOf(word); i >= 0; i = text.indexOf(word, i + 1)) {
+        var before = text.charAt(i - 1), after = text.charAt(i + word.length);
+        if (before && LETTER.test(before)) continue;
+        if (!prefixOnly && spaced && after && LETTER.test(after)) continue;
+        return true;
+    }
+    return false;
+}
+
+function words(text, list) {
+    text = (text || '').toLowerCase().trim();
+    if (!text || text.length > 40) return false;
+    for (var i = 0; i < list.length; i++) {
+        // Short words ("ok", "x") must be the whole label, or "Book" would match
+        var exact = list[i].length <= 3 && !UNSPACED.test(list[i]);
+        if (exact ? text === list[i] : hasWord(text, list[i])) return true;
+    }
+    return false;
+}
+
+function accepts(label) {
+    return words(label, ACCEPT) && !words(label, NOT_ACCEPT);
+}
+
+// Roots where a bare class name ("close", "dismiss") is trusted: dialogs, consent
+// containers and overlays covering a good part of the viewport
+function dialogLike(root, win) {
+    if (root.matches(DIALOG)) return true;
+    var label = ((root.id || '') + ' ' + (typeof root.className === 'string' ? root.className : '')).toLowerCase();
+    if (/modal|dialog|popup|overlay|consent|cookie|lightbox|interstitial/.test(label)) return true;
+    var r = root.getBoundingClientRect();
+    return r.width * r.height >= 0.25 * win.innerWidth * win.innerHeight;
+}
+
+function overlayRoot(el, win, doc) {
+    for (var n = el; n && n !== doc.body && n !== doc.documentElement; n = n.parentElement) {
+        var pos = win.getComputedStyle(n).position;
+        if (pos === 'fixed' || pos === 'sticky') return n;
+    }
+    return null;
+}
+
+function frameKey(frame) {
+    return frame.id || (frame.getAttribute('src') || '').split('?')[0];
+}
+
+function scanDocument(doc, win, frameHandle, frameId, whole) {
+    var targets = [], roots = [];
+
+    KNOWN.forEach(function (known, rank) {
+        var el = doc.querySelector(known[0]);
+        if (el && visible(el)) {
+            targets.push({handle: handle(el), kind: known[1], score: 100 - rank,
+                          text: (el.innerText || '').trim().slice(0, 40), selector: known[0],
+                          frame: frameHandle, frameKey: frameId});
+        }
+    });
+
+    if (whole) {
+        roots.push(doc.body || doc.documentElement);
+    } else {
+        var w = win.innerWidth, h = win.innerHeight;
+        [[0.5, 0.5], [0.5, 0.95], [0.5, 0.05], [0.1, 0.9], [0.9, 0.9]].forEach(function (p) {
+            var root = overlayRoot(doc.elementFromPoint(w * p[0], h * p[1]), win, doc);
+            if (root && roots.indexOf(root) < 0) roots.push(root);
+        });
+        var dialogs = doc.querySelectorAll('[role=dialog][aria-modal=true], [role=alertdialog], dialog[open]');
+        for (var d = 0; d < dialogs.length; d++) {
+            if (roots.indexOf(dialogs[d]) < 0 && visible(dialogs[d])) roots.push(dialogs[d]);
+        }
+    }
+
+    roots.forEach(function (root) {
+        if (!whole && root.matches(NOT_OVERLAY)) return;  // Sticky site header / nav menu
+        var trustClass = whole || dialogLike(root, win);
+        var els = root.querySelectorAll(CLICKABLE);
+        for (var i = 0; i < els.length; i++) {
+            var el = els[i];
+            var text = (el.innerText || el.value || '').trim();
+            var aria = el.getAttribute('aria-label') || '';
+            var cls = typeof el.className === 'string' ? el.className.toLowerCase() : '';
+            var score = 0, kind = 'modal';
+
+            if (el.tagName === 'SPAN' && !words(text, CLOSE)) continue;
+
+            if (accepts(text) || accepts(aria)) { score = 80; kind = 'cookie-banner'; }
+            else if (words(text, CLOSE) || words(aria, CLOSE)) { score = 60; }
+            else if (trustClass && /(^|[\\s_-])(close|dismiss)/.test(cls)) { score = 40; }
+            if (!score || !visible(el)) continue;
+
+            if (/\\b(all|tout|todo|alle)\\b/i.test(text)) score += 5;  // "Accept all" over "Accept selected"
+            targets.push({handle: handle(el), kind: kind, score: score, text: text.slice(0, 40),
+                          selector: null, frame: frameHandle, frameKey: frameId});
+        }
+    });
+
+    return targets;
+}
+
+var targets = scanDocument(document, window, null, null, wholeDocument);
+
+if (!wholeDocument) {
+    var frames = document.getElementsByTagName('iframe');
+    for (var f = 0; f < frames.length; f++) {
+        var frame = frames[f];
+        if (!visible(frame)) continue;
+        var frameDoc = null;
+        try { frameDoc = frame.contentDocument; } catch (e) {}
+
+        if (frameDoc && frameDoc.body) {
+            targets = targets.concat(scanDocument(frameDoc, frame.contentWindow, handle(frame), frameKey(frame), false));
+        } else {
+            var label = ((frame.src || '') + ' ' + (frame.title || '') + ' ' + (frame.id || '')).toLowerCase();
+            if (CONSENT_WORDS.some(function (k) { return hasWord(label, k, true); })) {
+                targets.push({handle: null, kind: 'consent-iframe', score: 70, text: '',
+                              selector: null, frame: handle(frame), frameKey: frameKey(frame)});
+            }
+        }
+    }
+}
+
+targets.sort(function (a, b) { return b.score - a.score; });
+return targets;
+"""
+
+# Looks up a remembered target (see popup_memory): the iframe first if it lives
+# in one, then the element by selector or, failing that, by its exact label.
+FIND_REMEMBERED_JS = dom_candidates.HELPERS_JS + """
+var selector = arguments[0], text = arguments[1], frameId = arguments[2];
+if (frameId) {
+    var frames = document.getElementsByTagName('iframe');
+    for (var f = 0; f < frames.length; f++) {
+        var key = frames[f].id || (frames[f].getAttribute('src') || '').split('?')[0];
+        if (key === frameId && visible(frames[f])) return {frame: handle(frames[f])};
+    }
+    return null;
+}
+var el = selector ? document.querySelector(selector) : null;
+if (el && visible(el)) return {handle: handle(el)};
+if (!text) return null;
+var els = document.querySelectorAll('button, [role=button], a, input[type=button], input[type=submit], span, div[aria-label]');
+for (var i = 0; i < els.length; i++) {
+    if ((els[i].innerText || els[i].value || '').trim().slice(0, 40) === text && visible(els[i])) {
+        return {handle: handle(els[i])};
+    }
+}
+return null;
+"""
+
 class PopupHandler:
     """
     Handles common popups and overlays that interrupt testing
     """
     
-    def __init__(self, driver):
+    def __init__(self, driver, readiness=None, max_rounds=3, memory=None, use_memory=True, recheck_delay=0.5):
+        """
+        Args:
+            driver: Selenium WebDriver
+            readiness: Shared PageReadiness (a private one is created if omitted)
+            max_rounds: Scan/click rounds per call (stacked overlays need more than one)
+            memory: PopupMemory of per-domain dismiss targets (default: the shared on-disk one)
+            use_memory: Set False to always run the full scan
+            recheck_delay: When the first scan finds nothing, wait at most this long for the DOM
+                           to go quiet and scan once more if it changed (consent banners are
+                           often injected just after load)
+        """
         self.driver = driver
+        self.readiness = readiness or PageReadiness(driver)
+        self.max_rounds = max_rounds
+        self.memory = (memory or get_popup_memory()) if use_memory else None
+        self.recheck_delay = recheck_delay
     
+    @tracing.traced('popups: dismiss all', 'popups')
     def dismiss_all_popups(self, wait_time=3):
         """
         Try to dismiss all common popups/overlays
         Call this after page load or before clicking elements
+        
+        Scans right away instead of waiting for the page to settle first. A page
+        without popups costs one scan: the re-check for late-injected banners only
+        waits while the DOM is still changing (at most recheck_delay) and only
+        rescans if it changed since the first scan. wait_time bounds the
+        wait for a remembered target, which is only waited for while an overlay
+        is actually up.
         """
-        print("  -> Checking for popups/overlays...")
+        log.info("  -> Checking for popups/overlays...")
         
         dismissed = []
+        domain = self._current_domain()
+        remembered = self.memory.get(domain) if self.memory and domain else None
         
-        # Wait a moment for popups to appear
-        time.sleep(wait_time)
+        if remembered:
+            # Known site: one immediate look for the remembered target
+            self._remembered_hit(domain, self._dismiss_remembered(remembered, 0), dismissed)
         
-        # Try common cookie banner dismissal
-        dismissed.extend(self._dismiss_cookie_banners())
+        mutations = self.readiness.install_observer()
+        targets = self._scan()
+        if not targets and not dismissed:
+            targets = self._recheck(wait_time, mutations)
         
-        # Try common modal overlays
-        dismissed.extend(self._dismiss_modals())
+        if remembered and not dismissed and targets:
+            # An overlay is up without the remembered target: it may still be rendering, so poll
+            # for it. Only now does its absence count as a miss - a page with no overlay at all
+            # (e.g. the banner was already dismissed on an earlier page) says nothing about it.
+            kind = self._dismiss_remembered(remembered, wait_time)
+            if self._remembered_hit(domain, kind, dismissed):
+                targets = self._scan()
+            else:
+                self.memory.miss(domain)
         
-        # Try consent iframes
-        dismissed.extend(self._dismiss_consent_iframes())
+        # Click best target -> rescan, until the page reports no overlay
+        for _ in range(self.max_rounds):
+            if not targets:
+                break
+            
+            clicked = self._dismiss_first(targets)
+            if not clicked:
+                break
+            
+            dismissed.append(clicked['kind'])
+            if self.memory and domain and len(dismissed) == 1:
+                self.memory.remember(domain, clicked.get('selector'), clicked.get('text'),
+                                     clicked.get('frameKey'), clicked['kind'])
+            self.readiness.settle('popup click', budget=0.5)
+            targets = self._scan()
         
         if dismissed:
-            print(f"    [+] Dismissed {len(dismissed)} popup(s): {', '.join(dismissed)}")
-            time.sleep(1)  # Let page settle
+            log.info("    [+] Dismissed %s popup(s): %s", len(dismissed), ', '.join(dismissed))
+            self.readiness.settle('popup dismissed', budget=1)  # Let page settle
         else:
-            print("    [i] No popups detected")
+            log.info("    [i] No popups detected")
         
         return len(dismissed)
     
-    def _dismiss_cookie_banners(self):
-        """Dismiss cookie consent banners"""
-        dismissed = []
+    @tracing.traced('popups: scan', 'popups')
+    def _scan(self, whole_document=False):
+        """Ranked dismiss targets for the current document (one round trip)"""
+        try:
+            return self.driver.execute_script(SCAN_OVERLAYS_JS, whole_document) or []
+        except Exception:
+            return []
+    
+    def _remembered_hit(self, domain, kind, dismissed):
+        """Book a click on the remembered target (kind None: nothing was clicked)"""
+        if not kind:
+            return False
+        log.info("    [+] Remembered %s target worked", kind)
+        dismissed.append(kind)
+        self.memory.hit(domain)
+        self.readiness.settle('popup click', budget=0.5)
+        return True
+    
+    def _recheck(self, wait_time, mutations):
+        """
+        After an empty scan, for banners injected after load: wait until the DOM is quiet
+        (returns at once on a settled page), then rescan only if it mutated since `mutations`
+        """
+        started = time.monotonic()
+        budget = min(wait_time, self.recheck_delay)
+        self.readiness.wait_for_dom_quiet(started + budget, quiet_ms=150)
+        self.readiness.stats.record('popup appear', budget, time.monotonic() - started)
+        if mutations is not None and self.readiness.install_observer() == mutations:
+            return []  # Nothing was added: the first scan still holds
+        return self._scan()
+    
+    def _current_domain(self):
+        try:
+            return domain_of(self.driver.current_url)
+        except Exception:
+            return None
+    
+    @tracing.traced('popups: remembered target', 'popups')
+    def _dismiss_remembered(self, entry, wait_time):
+        """Poll for the remembered target until it appears (up to wait_time; 0 = look once) and click it"""
+        started = time.monotonic()
+        deadline = started + wait_time
+        clicked = False
         
-        # Common cookie banner button selectors
-        cookie_selectors = [
-            # Text-based (most reliable)
-            "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'accept')]",
-            "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'agree')]",
-            "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'allow')]",
-            "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'consent')]",
-            "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'ok')]",
-            
-            # Multilingual
-            "//button[contains(text(), 'Aceptar')]",  # Spanish
-            "//button[contains(text(), 'Accepter')]",  # French
-            "//button[contains(text(), 'Akzeptieren')]",  # German
-            "//button[contains(text(), '同意')]",  # Japanese
+        while True:
+            try:
+                found = self.driver.execute_script(FIND_REMEMBERED_JS, entry['selector'], entry['text'], entry['frame'])
+                if found and found.get('frame'):
+                    self.driver.switch_to.frame(dom_candidates.resolve(self.driver, found['frame']))
+                    found = self.driver.execute_script(FIND_REMEMBERED_JS, entry['selector'], entry['text'], None)
+                if found:
+                    clicked = self._click(found['handle'])
+            except Exception:
+                pass
+            finally:
+                if entry['frame']:
+                    self._leave_frame()
             
-            # ID/Class based
-            "#onetrust-accept-btn-handler",
-            ".accept-cookies",
-            "#accept-cookies",
-            "[data-consent='accept']",
-            "[aria-label*='Accept']",
-            "[aria-label*='Agree']",
-        ]
+            if clicked or time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
         
-        for selector in cookie_selectors:
+        if wait_time:
+            self.readiness.stats.record('popup appear', wait_time, time.monotonic() - started)
+        return entry['kind'] if clicked else None
+    
+    def _dismiss_first(self, targets):
+        """Click the highest-ranked target that works; returns the clicked target or None"""
+        for target in targets:
             try:
-                if selector.startswith('//'):
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                elif selector.startswith('#'):
-                    elements = self.driver.find_elements(By.ID, selector[1:])
-                elif selector.startswith('.'):
-                    elements = self.driver.find_elements(By.CLASS_NAME, selector[1:])
+                if target.get('frame'):
+                    clicked = self._click_in_frame(target)
                 else:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                
-                for element in elements:
-                    if element.is_displayed():
-                        element.click()
-                        dismissed.append("cookie-banner")
-                        time.sleep(0.5)
-                        break
-            except:
-                continue
+                    clicked = target if self._click(target['handle']) else None
+            except Exception:
+                clicked = None
+            finally:
+                if target.get('frame'):
+                    self._leave_frame()
+            
+            if clicked:
+                return clicked
         
-        return dismissed
+        return None
     
-    def _dismiss_modals(self):
-        """Dismiss common modal overlays"""
-        dismissed = []
+    def _click(self, handle):
+        """Click a scanned element by handle; JavaScript click if the real click is refused"""
+        element = dom_candidates.resolve(self.driver, handle)
+        try:
+            element.click()
+        except Exception:
+            self.driver.execute_script("arguments[0].click();", element)
+        return True
+    
+    def _click_in_frame(self, target):
+        """
+        Consent iframes: same-origin ones were already scanned from the top document,
+        so the handle is ready; cross-origin ones are scanned once from inside
+        """
+        iframe = dom_candidates.resolve(self.driver, target['frame'])
+        self.driver.switch_to.frame(iframe)
         
-        # Common modal close button selectors
-        close_selectors = [
-            # Generic close buttons
-            "//button[contains(@aria-label, 'Close')]",
-            "//button[contains(@aria-label, 'Fermer')]",  # French
-            "//button[contains(@aria-label, 'Cerrar')]",  # Spanish
-            "//button[@class*='close']",
-            "//button[@class*='dismiss']",
-            "[data-dismiss='modal']",
-            ".modal-close",
-            ".close-button",
-            
-            # X buttons
-            "//button[text()='×']",
-            "//button[text()='✕']",
-            "//span[text()='×']",
-        ]
+        if target.get('handle'):
+            return target if self._click(target['handle']) else None
         
-        for selector in close_selectors:
+        for inner in self._scan(whole_document=True):
             try:
-                if selector.startswith('//'):
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                else:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                
-                for element in elements:
-                    if element.is_displayed():
-                        element.click()
-                        dismissed.append("modal")
-                        time.sleep(0.5)
-                        break
-            except:
+                if self._click(inner['handle']):
+                    return {**inner, 'kind': target['kind'], 'frameKey': target['frameKey']}
+            except Exception:
                 continue
-        
-        return dismissed
+        return None
     
-    def _dismiss_consent_iframes(self):
-        """Handle consent management iframes (like The Economist)"""
-        dismissed = []
-        
+    def _leave_frame(self):
         try:
-            # Find consent iframes
-            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-            
-            for iframe in iframes:
-                src = iframe.get_attribute('src') or ''
-                title = iframe.get_attribute('title') or ''
-                
-                # Check if it's a consent iframe
-                if any(keyword in src.lower() or keyword in title.lower() 
-                       for keyword in ['consent', 'privacy', 'cookie', 'gdpr']):
-                    
-                    # Switch to iframe
-                    self.driver.switch_to.frame(iframe)
-                    
-                    # Try to find accept button inside
-                    accept_selectors = [
-                        "//button[contains(text(), 'Accept')]",
-                        "//button[contains(text(), 'Agree')]",
-                        "//button[@title='Accept']",
-                        ".sp_choice_type_11",  # SourcePoint consent
-                    ]
-                    
-                    for selector in accept_selectors:
-                        try:
-                            if selector.startswith('//'):
-                                button = self.driver.find_element(By.XPATH, selector)
-                            else:
-                                button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                            
-                            if button.is_displayed():
-                                button.click()
-                                dismissed.append("consent-iframe")
-                                time.sleep(0.5)
-                                break
-                        except:
-                            continue
-                    
-                    # Switch back to main content
-                    self.driver.switch_to.default_content()
-                    break
-        
-        except:
-            # Make sure we're back to default content even if error
-            try:
-                self.driver.switch_to.default_content()
-            except:
-                pass
-        
-        return dismissed
+            self.driver.switch_to.default_content()
+        except Exception:
+            pass
     
+    @tracing.traced('popups: safe click', 'popups')
     def wait_and_click_safely(self, element, max_retries=3):
         """
         Click element with popup handling
@@ -210,14 +442,14 @@ class PopupHandler:
                 
                 # If click intercepted, try to dismiss overlays
                 if 'intercepted' in error_msg or 'clickable' in error_msg:
-                    print(f"    [!] Click blocked by overlay, attempt {attempt + 1}/{max_retries}")
+                    log.warning("    [!] Click blocked by overlay, attempt %s/%s", attempt + 1, max_retries)
                     self.dismiss_all_popups(wait_time=1)
                     
                     # Last attempt: try JavaScript click
                     if attempt == max_retries - 1:
                         try:
                             self.driver.execute_script("arguments[0].click();", element)
-                            print("    [+] Clicked using JavaScript")
+                            log.info("    [+] Clicked using JavaScript")
                             return True
                         except:
                             pass
@@ -0,0 +1,125 @@
+"""
+Per-Domain Popup Memory
+Remembers which selector (and frame) dismissed each site's overlay
+
+A site's consent banner rarely changes between runs, so PopupHandler tries the
+remembered target first and only falls back to the full scan when it is
+missing. Entries expire after a TTL and are dropped after repeated misses.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import audit_log
+
+log = audit_log.get_logger('popup_memory')
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'popup_memory.json')
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def domain_of(url):
+    """'https://www.stripe.com/en-ca' -> 'stripe.com'"""
+    host = urlparse(url).netloc.lower().split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def get_popup_memory(path=DEFAULT_PATH, ttl_days=30):
+    """Shared PopupMemory per file, so concurrent audits don't overwrite each other"""
+    with _instances_lock:
+        if path not in _instances:
+            _instances[path] = PopupMemory(path, ttl_days)
+        return _instances[path]
+
+
+class PopupMemory:
+    """
+    Small JSON store: domain -> remembered dismiss target
+
+    Entry: {'selector', 'text', 'frame', 'kind', 'saved', 'hits', 'misses'}
+    - selector: CSS selector of a known consent button (None for text matches)
+    - text: visible label of the clicked element
+    - frame: iframe id or src (without query) when the button lives in a frame
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl_days=30, max_misses=2):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_misses = max_misses
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def get(self, domain):
+        """Remembered target for the domain, or None (missing or expired)"""
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry and time.time() - entry['saved'] > self.ttl:
+                del self._entries[domain]
+                self._save()
+                return None
+            return dict(entry) if entry else None
+
+    def remember(self, domain, selector, text, frame, kind):
+        """Record what just dismissed an overlay on this domain"""
+        with self._lock:
+            old = self._entries.get(domain) or {}
+            same = old.get('selector') == selector and old.get('text') == text and old.get('frame') == frame
+            self._entries[domain] = {
+                'selector': selector,
+                'text': text,
+                'frame': frame,
+                'kind': kind,
+                'saved': time.time(),
+                'hits': old.get('hits', 0) if same else 0,
+                'misses': 0
+            }
+            self._save()
+
+    def hit(self, domain):
+        """The remembered target worked again"""
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry:
+                entry['hits'] += 1
+                entry['misses'] = 0
+                entry['saved'] = time.time()
+                self._save()
+
+    def miss(self, domain):
+        """The remembered target was not found; forget it after max_misses in a row"""
+        with self._lock:
+            entry = self._entries.get(domain)
+            if not entry:
+                return
+            entry['misses'] += 1
+            if entry['misses'] >= self.max_misses:
+                del self._entries[domain]
+            self._save()
+
+    def forget(self, domain):
+        with self._lock:
+            if self._entries.pop(domain, None) is not None:
+                self._save()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """Atomic write (temp file + rename) so a crash never leaves half a file"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("    [!] Could not save popup memory: %s", e)
@@ -0,0 +1,316 @@
+"""
+Page Readiness Detection
+Event-driven replacement for fixed time.sleep() waits
+
+Three signals, each bounded by a deadline:
+- document.readyState == 'complete'
+- network idle: no in-flight requests (read from Chrome's CDP Network events
+  via the performance log; falls back to Resource Timing when unavailable)
+- DOM quiescence: no mutations for a quiet window (MutationObserver)
+
+The old fixed sleep becomes the budget, so a step is never slower than before,
+and the time not spent waiting is recorded per step.
+"""
+
+import json
+import time
+
+import tracing
+
+# Installs (once per document) a MutationObserver that counts mutations and
+# remembers when the last one happened. Shared by later samplers.
+INSTALL_OBSERVER_JS = """
+if (!window.__l10nObserver) {
+    window.__l10nObserver = {mutations: 0, last: performance.now()};
+    var target = document.documentElement || document;
+    new MutationObserver(function (records) {
+        // Ignore the candidate handles we stamp ourselves (dom_candidates.HANDLE_ATTR)
+        var real = records.filter(function (r) { return r.attributeName !== 'data-l10n-id'; }).length;
+        if (!real) return;
+        window.__l10nObserver.mutations += real;
+        window.__l10nObserver.last = performance.now();
+    }).observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return window.__l10nObserver.mutations;
+"""
+
+# Resolves once the DOM has been quiet for quietMs, or at the deadline.
+# One WebDriver round trip for the whole wait.
+WAIT_DOM_QUIET_JS = INSTALL_OBSERVER_JS.replace("return window.__l10nObserver.mutations;", "") + """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var started = performance.now();
+(function check() {
+    var now = performance.now();
+    if (now - window.__l10nObserver.last >= quietMs) { done(true); return; }
+    if (now - started >= timeoutMs) { done(false); return; }
+    setTimeout(check, Math.min(50, quietMs));
+})();
+"""
+
+RESOURCE_COUNT_JS = "return performance.getEntriesByType('resource').length;"
+
+# Identifies the current document: a navigation changes the URL (also pushState) or timeOrigin
+NAVIGATION_MARKER_JS = "return [window.location.href, performance.timeOrigin];"
+
+
+class ReadinessStats:
+    """Per-step totals of the fixed-sleep budget vs the time actually waited"""
+
+    def __init__(self):
+        self.steps = {}  # step -> {'count', 'budget', 'waited'}
+
+    def record(self, step, budget, waited):
+        entry = self.steps.setdefault(step, {'count': 0, 'budget': 0.0, 'waited': 0.0})
+        entry['count'] += 1
+        entry['budget'] += budget
+        entry['waited'] += waited
+
+    @property
+    def total_saved(self):
+        return sum(max(0.0, s['budget'] - s['waited']) for s in self.steps.values())
+
+    def report(self):
+        """Formatted table of time saved per step"""
+        lines = [f"  {'Step':<24} {'Calls':>5} {'Budget':>8} {'Waited':>8} {'Saved':>8}"]
+        for step, s in self.steps.items():
+            saved = max(0.0, s['budget'] - s['waited'])
+            lines.append(f"  {step:<24} {s['count']:>5} {s['budget']:>7.1f}s {s['waited']:>7.1f}s {saved:>7.1f}s")
+        lines.append(f"  Total saved: {self.total_saved:.1f}s")
+        return '\n'.join(lines)
+
+
+class PageReadiness:
+    """
+    Waits for a page to be ready instead of sleeping a fixed time
+
+    Usage:
+        readiness = PageReadiness(driver)
+        driver.get(url)
+        readiness.wait_until_ready('homepage load', budget=3)
+
+        marker = readiness.navigation_marker()
+        button.click()
+        readiness.settle('signup navigation', budget=3, since=marker)
+    """
+
+    def __init__(self, driver, network_idle_ms=500, max_inflight=0, poll_interval=0.05):
+        """
+        Args:
+            driver: Selenium WebDriver
+            network_idle_ms: How long the network must stay idle to count as idle
+            max_inflight: Requests allowed to stay open while "idle" (long-polls, beacons)
+            poll_interval: Seconds between checks for the polled signals
+        """
+        self.driver = driver
+        self.network_idle_ms = network_idle_ms
+        self.max_inflight = max_inflight
+        self.poll_interval = poll_interval
+        self.stats = ReadinessStats()
+        self.listeners = []  # Callables(method, params) that also see each drained Network event
+
+        self._inflight = {}  # requestId -> time first seen
+        self._documents = 0  # Document requests seen (navigations, including frames)
+        self._perf_log = None  # None = not probed yet, then True/False
+
+    # ------------------------------------------------------------------
+    # Combined waits (what the audit calls)
+    # ------------------------------------------------------------------
+
+    def wait_until_ready(self, step, budget, quiet_ms=300):
+        """
+        After navigation: document complete, then network idle, then DOM quiet
+        Never waits longer than `budget` seconds in total. Returns True if ready.
+        """
+        started = time.monotonic()
+        deadline = started + budget
+
+        with tracing.span(f"wait: {step}", 'wait', budget=budget):
+            ready = (self.wait_for_document_ready(deadline)
+                     and self.wait_for_network_idle(deadline)
+                     and self.wait_for_dom_quiet(deadline, quiet_ms))
+
+        self.stats.record(step, budget, time.monotonic() - started)
+        return ready
+
+    def settle(self, step, budget, quiet_ms=200, since=None):
+        """
+        After an in-page action (click, select, dismiss): network idle, then DOM quiet
+        A click that starts a navigation shows up as a document request, so this
+        also waits for the new page. Pass since=navigation_marker() (taken before an
+        action expected to navigate) to first wait for the navigation to begin: the
+        old page is still complete and idle right after the click.
+        """
+        started = time.monotonic()
+        deadline = started + budget
+
+        with tracing.span(f"wait: {step}", 'wait', budget=budget):
+            ready = ((since is None or self.wait_for_navigation(since, deadline))
+                     and self.wait_for_network_idle(deadline, idle_ms=quiet_ms)
+                     and self.wait_for_document_ready(deadline)
+                     and self.wait_for_dom_quiet(deadline, quiet_ms))
+
+        self.stats.record(step, budget, time.monotonic() - started)
+        return ready
+
+    # ------------------------------------------------------------------
+    # Individual signals (each takes an absolute time.monotonic() deadline)
+    # ------------------------------------------------------------------
+
+    def navigation_marker(self):
+        """Snapshot of the current document for settle(since=...) / wait_for_navigation()"""
+        if self._has_perf_log():
+            self._drain_network_events()  # Count the documents loaded so far
+        try:
+            url, time_origin = self.driver.execute_script(NAVIGATION_MARKER_JS)
+        except Exception:
+            url, time_origin = None, None
+        return {'url': url, 'time_origin': time_origin, 'documents': self._documents}
+
+    def wait_for_navigation(self, marker, deadline):
+        """Wait until the page left `marker`: new URL or document, or a document request was sent"""
+        while True:
+            if self._has_perf_log():
+                self._drain_network_events()
+                if self._documents > marker['documents']:
+                    return True
+
+            try:
+                url, time_origin = self.driver.execute_script(NAVIGATION_MARKER_JS)
+                if url != marker['url'] or time_origin != marker['time_origin']:
+                    return True
+            except Exception:
+                return True  # The old document is being torn down: navigation under way
+
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def wait_for_document_ready(self, deadline):
+        """Poll document.readyState until 'complete'"""
+        while True:
+            try:
+                if self.driver.execute_script("return document.readyState") == 'complete':
+                    return True
+            except Exception:
+                pass  # Mid-navigation: the old document is gone
+
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def wait_for_network_idle(self, deadline, idle_ms=None):
+        """Wait until no more than max_inflight requests were open for idle_ms (default network_idle_ms)"""
+        idle_ms = idle_ms or self.network_idle_ms
+        if not self._has_perf_log():
+            return self._wait_for_resource_timing_idle(deadline, idle_ms)
+
+        idle_since = None
+        while True:
+            self._drain_network_events()
+
+            now = time.monotonic()
+            if len(self._inflight) <= self.max_inflight:
+                idle_since = idle_since or now
+                if (now - idle_since) * 1000 >= idle_ms:
+                    return True
+            else:
+                idle_since = None
+
+            if now >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def wait_for_dom_quiet(self, deadline, quiet_ms=300):
+        """Wait in the browser until no DOM mutation happened for quiet_ms"""
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            return False
+
+        try:
+            self.driver.set_script_timeout(remaining_ms / 1000 + 1)
+            return bool(self.driver.execute_async_script(WAIT_DOM_QUIET_JS, quiet_ms, remaining_ms))
+        except Exception:
+            return False
+
+    def install_observer(self):
+        """Start counting DOM mutations on the current document; returns the count so far"""
+        try:
+            return self.driver.execute_script(INSTALL_OBSERVER_JS)
+        except Exception:
+            return None
+
+    # ------------------------------------------------------------------
+    # Network tracking
+    # ------------------------------------------------------------------
+
+    def _has_perf_log(self):
+        """Performance logging is enabled by build_chrome_options; probe once"""
+        if self._perf_log is None:
+            try:
+                entries = self.driver.get_log('performance')
+            except Exception:
+                self._perf_log = False
+            else:
+                self._perf_log = True
+                # Reading the log drains it: the probe's entries are the page's first requests
+                self._drain_network_events(entries)
+        return self._perf_log
+
+    def _drain_network_events(self, entries=None):
+        """Update the in-flight request set from buffered CDP Network events (or entries already read)"""
+        if entries is None:
+            try:
+                entries = self.driver.get_log('performance')
+            except Exception:
+                return
+
+        now = time.monotonic()
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+
+            method = message.get('method', '')
+            params = message.get('params', {})
+            for listener in self.listeners:
+                listener(method, params)
+
+            if method == 'Network.requestWillBeSent' and params.get('type') == 'Document':
+                self._documents += 1
+
+            request_id = params.get('requestId')
+            if not request_id:
+                continue
+
+            if method == 'Network.requestWillBeSent':
+                self._inflight.setdefault(request_id, now)
+            elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                self._inflight.pop(request_id, None)
+
+        # Websockets/streams never finish; stop counting them after a while
+        stale = [rid for rid, seen in self._inflight.items() if now - seen > 10]
+        for request_id in stale:
+            del self._inflight[request_id]
+
+    def _wait_for_resource_timing_idle(self, deadline, idle_ms):
+        """Fallback: the Resource Timing entry count stops growing for idle_ms"""
+        last_count = None
+        stable_since = time.monotonic()
+
+        while True:
+            try:
+                count = self.driver.execute_script(RESOURCE_COUNT_JS)
+            except Exception:
+                count = None
+
+            now = time.monotonic()
+            if count != last_count:
+                last_count = count
+                stable_since = now
+            elif (now - stable_since) * 1000 >= idle_ms:
+                return True
+
+            if now >= deadline:
+                return False
+            time.sleep(self.poll_interval)
@@ -0,0 +1,148 @@
+"""
+Resource Blocking Policy
+Keeps images, fonts, media and ad/analytics trackers out of audited pages
+
+The audit only reads DOM text, html[lang], buttons and selectors, so these
+resources are pure load time. They are blocked per browser session with CDP
+Network.setBlockedURLs (URL patterns, applied before navigation). Sites that
+break without some of them get per-domain allow-list overrides, which also
+cover the domain's subdomains (an override for site.com follows the audit onto
+accounts.site.com). When the top frame navigates to a domain with a different
+allow-list, the blocklist is swapped from that navigation's event on.
+
+Blocked requests are counted from the Network.loadingFailed events that
+PageReadiness already drains from the performance log - only those blocked by
+setBlockedURLs (blockedReason 'inspector'), not CSP/mixed-content/CORP blocks
+the page would have hit anyway; bytes saved are an estimate from typical
+transfer sizes per resource type.
+"""
+
+from popup_memory import domain_of
+
+
+def _extensions(*extensions):
+    """URL patterns for files with these extensions, with or without a query string"""
+    return [pattern for ext in extensions for pattern in (f'*.{ext}', f'*.{ext}?*')]
+
+
+BLOCK_PATTERNS = {
+    'images': _extensions('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'ico', 'bmp'),
+    'fonts': _extensions('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': _extensions('mp4', 'webm', 'm3u8', 'ts', 'mp3', 'm4a', 'ogg', 'mov'),
+    # Ads and analytics only - consent managers (OneTrust, Cookiebot, ...) stay, the popup test needs them
+    'trackers': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+        '*adservice.google.*', '*connect.facebook.net*', '*facebook.com/tr*', '*hotjar.com*',
+        '*scorecardresearch.com*', '*segment.io*', '*segment.com/analytics*', '*criteo.com*',
+        '*criteo.net*', '*taboola.com*', '*outbrain.com*', '*amazon-adsystem.com*', '*adsrvr.org*',
+        '*bing.com/bat*', '*clarity.ms*', '*newrelic.com*', '*nr-data.net*', '*quantserve.com*',
+        '*chartbeat.com*', '*optimizely.com*', '*tiktok.com/i18n/pixel*', '*ads-twitter.com*'
+    ]
+}
+
+# CDP resource type -> category, for requests blocked by a tracker pattern the type is Script/XHR/...
+TYPE_CATEGORIES = {'Image': 'images', 'Font': 'fonts', 'Media': 'media'}
+
+# Typical transfer sizes (bytes) used to estimate what a blocked request would have cost
+TYPICAL_BYTES = {'images': 40_000, 'fonts': 30_000, 'media': 400_000, 'trackers': 25_000}
+
+# Domains that need some categories to work (e.g. icon fonts carrying button labels)
+DEFAULT_SITE_OVERRIDES = {}
+
+
+class BlockReport:
+    """Blocked-request tally for one audit; fed by PageReadiness network events"""
+
+    def __init__(self, categories, on_navigation=None):
+        """
+        Args:
+            categories: Categories blocked when the audit started
+            on_navigation: Callable(params) for each Document request (re-applies the policy)
+        """
+        self.categories = categories
+        self.blocked = {category: 0 for category in categories}
+        self.loaded_bytes = 0
+        self.on_navigation = on_navigation
+
+    def on_network_event(self, method, params):
+        # 'inspector' is setBlockedURLs; csp, mixed-content, corp, coep-* ... are the page's own blocks
+        if method == 'Network.loadingFailed' and params.get('blockedReason') == 'inspector':
+            category = TYPE_CATEGORIES.get(params.get('type'), 'trackers')
+            self.blocked[category] = self.blocked.get(category, 0) + 1
+        elif method == 'Network.loadingFinished':
+            self.loaded_bytes += params.get('encodedDataLength', 0) or 0
+        elif method == 'Network.requestWillBeSent' and params.get('type') == 'Document' and self.on_navigation:
+            self.on_navigation(params)
+
+    @property
+    def blocked_requests(self):
+        return sum(self.blocked.values())
+
+    @property
+    def bytes_saved(self):
+        """Estimate (blocked requests x typical size for their category)"""
+        return sum(count * TYPICAL_BYTES.get(category, 0) for category, count in self.blocked.items())
+
+    def report(self):
+        if not self.categories:
+            return "  Resource blocking disabled for this site"
+        per_category = ', '.join(f"{category}: {count}" for category, count in self.blocked.items() if count)
+        return (f"  Blocked {self.blocked_requests} request(s) ({per_category or 'none seen'}), "
+                f"~{self.bytes_saved / 1e6:.1f} MB saved; {self.loaded_bytes / 1e6:.1f} MB loaded")
+
+
+class ResourcePolicy:
+    """
+    Usage:
+        policy = ResourcePolicy()
+        report = policy.apply(driver, url)       # before driver.get(url)
+        readiness.listeners.append(report.on_network_event)
+    """
+
+    def __init__(self, categories=('images', 'fonts', 'media', 'trackers'), site_overrides=None):
+        """
+        Args:
+            categories: Categories of BLOCK_PATTERNS blocked by default
+            site_overrides: {domain: categories to allow} - 'all' disables blocking for the domain
+        """
+        self.categories = tuple(categories)
+        self.site_overrides = {**DEFAULT_SITE_OVERRIDES, **(site_overrides or {})}
+
+    def categories_for(self, url):
+        """Categories blocked for url's domain after its allow-list (or its closest parent domain's)"""
+        labels = domain_of(url).split('.')
+        allowed = next((self.site_overrides['.'.join(labels[i:])] for i in range(len(labels))
+                        if '.'.join(labels[i:]) in self.site_overrides), ())
+        if allowed == 'all':
+            return ()
+        return tuple(category for category in self.categories if category not in allowed)
+
+    def patterns_for(self, url):
+        return [pattern for category in self.categories_for(url) for pattern in BLOCK_PATTERNS[category]]
+
+    def apply(self, driver, url):
+        """
+        Install the blocklist for url's site on this browser session; returns its BlockReport.
+        The report re-applies the policy when the top frame navigates to a domain with another
+        allow-list (e.g. signup on a separate auth domain); requests already sent keep the old one.
+        """
+        patterns = self.patterns_for(url)
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        try:
+            top_frame = driver.execute_cdp_cmd('Page.getFrameTree', {})['frameTree']['frame']['id']
+        except Exception:
+            top_frame = None  # Can't tell frames apart: keep the first site's policy
+
+        def follow(params):
+            nonlocal patterns
+            target = params.get('documentURL') or ''
+            if top_frame is None or params.get('frameId') != top_frame or not target.startswith('http'):
+                return
+            if self.patterns_for(target) != patterns:
+                patterns = self.patterns_for(target)
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+                report.categories = self.categories_for(target)
+
+        report = BlockReport(self.categories_for(url), on_navigation=follow)
+        return report
@@ -35,7 +35,7 @@ for %%S in (%SITES%) do (
     echo ========================================== >> %OUTPUT_FILE%
     
     REM Run the audit script with site and locale
-    (echo %%S && echo es) | python signup_localization_audit_v2_integrated.py >> %OUTPUT_FILE% 2>&1
+    python signup_localization_audit_v2_integrated.py %%S --locale es >> %OUTPUT_FILE% 2>&1
     
     echo. >> %OUTPUT_FILE%
     echo ------------------------------------------ >> %OUTPUT_FILE%
@@ -3,64 +3,170 @@ Automated Test Runner for Sign-Up Localization Audit
 Tests multiple sites and generates summary report
 """
 
+import json
+import os
 import subprocess
 import sys
+import tempfile
+import time
 from datetime import datetime
 
+from change_detection import ChangeDetector
+from checkpoint import SuiteCheckpoint, latest_run
+from scheduler import TIMED_OUT_STATUSES, get_latency_history, load_sites
+from watchdog import ProcessWatchdog
+
 class TestRunner:
-    def __init__(self, output_file=None):
+    def __init__(self, output_file=None, checkpoint=None, history=None, change_detector=None,
+                 max_rss_mb=None, max_cpu_seconds=None):
+        """
+        Args:
+            output_file: Results file (default: timestamped)
+            checkpoint: SuiteCheckpoint every finished site is saved to (default: in-memory, no retries)
+            history: scheduler.LatencyHistory - run_suite() budgets each site from its recorded
+                     latency instead of a flat 120 s
+            change_detector: ChangeDetector - sites whose pages haven't changed since their last
+                             audit reuse the stored result instead of being audited again
+            max_rss_mb: Kill an audit whose process tree (python + chromedriver + Chrome) uses more
+                        memory than this; the site is reported as KILLED (needs psutil)
+            max_cpu_seconds: Same for the tree's total CPU time
+        """
         self.output_file = output_file or f"audit_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        self.checkpoint = checkpoint or SuiteCheckpoint(':memory:', max_attempts=1)
+        self.history = history
+        self.change_detector = change_detector
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_seconds = max_cpu_seconds
         self.results = []
+        self.locale = 'es'  # Target locale(s) named in the results header
+    
+    def run_suite(self, sites, locale='es'):
+        """
+        Audit sites one at a time. Sites the checkpoint already has a final result for are
+        skipped; failed ones are retried after their backoff; unchanged ones (with a change
+        detector) reuse their stored result. self.results ends up in `sites` order.
+        Returns: the captured output of the audits run now
+        """
+        position = {site: i for i, site in enumerate(sites, 1)}
+        full_output = []
         
-    def run_test(self, site_url, locale='es'):
-        """Run audit test for a single site"""
+        for batch in self.checkpoint.rounds(sites, locale):
+            for site in self._reuse_unchanged(batch, locale):
+                print(f"\n[{position[site]}/{len(sites)}] Testing {site}...")
+                timeout = self.history.timeout_for(site) if self.history else 120
+                output, error = self.run_test(site, locale=locale, timeout=timeout)
+                
+                result = self.results[-1]
+                if self.history:
+                    self.history.record_result(site, result, budget=timeout)
+                if self.change_detector:
+                    self.change_detector.store(site, locale, result)
+                
+                if output:
+                    full_output.append(f"\n{'='*70}\n")
+                    full_output.append(f"TEST {position[site]}: {site}\n")
+                    full_output.append(f"{'='*70}\n")
+                    full_output.append(output)
+        
+        self.locale = locale
+        self.results = [self._fill_defaults(r) for r in self.checkpoint.results(sites, locale).values()]
+        return ''.join(full_output)
+        
+    def run_test(self, site_url, locale='es', timeout=120):
+        """
+        Run audit test for a single site
+        The audit writes its result as one JSON line on stdout (--jsonl), read as it arrives;
+        its human-readable log goes to a temp file instead of being buffered in a pipe.
+        Returns: (log, error)
+        """
+        self.locale = locale
         print(f"\n{'='*70}")
         print(f"Testing: {site_url}")
         print(f"Locale: {locale}")
         print(f"{'='*70}\n")
         
+        log = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+        started = time.perf_counter()
         try:
-            # Run the audit script
-            process = subprocess.Popen(
-                ['python', 'signup_localization_audit_v2_integrated.py'],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            # Run the audit script in its own process group: on a timeout or a resource breach the
+            # watchdog kills it together with its chromedriver and Chrome processes
+            with ProcessWatchdog(timeout, max_rss_mb=self.max_rss_mb,
+                                 max_cpu_seconds=self.max_cpu_seconds) as supervisor:
+                process = supervisor.start(
+                    [sys.executable, 'signup_localization_audit_v2_integrated.py', site_url, '--locale', locale, '--jsonl'],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=log,
+                    text=True,
+                    encoding='utf-8',
+                    env={**os.environ, 'PYTHONIOENCODING': 'utf-8'}
+                )
+                record = None
+                for line in process.stdout:
+                    if line.startswith('{'):
+                        record = json.loads(line)
+                process.wait()
             
-            # Send inputs
-            stdout, stderr = process.communicate(input=f"{site_url}\n{locale}\n\n", timeout=120)
+            log.seek(0)
+            output = log.read()
             
-            # Parse results
-            result = self.parse_output(site_url, stdout)
-            self.results.append(result)
+            if record is not None:
+                self._add_result({**record, 'site': site_url, 'duration': time.perf_counter() - started}, locale)
+                return output, None
             
-            return stdout, stderr
-        
-        except subprocess.TimeoutExpired:
-            print(f"✗ Test timed out for {site_url}")
-            self.results.append({
-                'site': site_url,
-                'status': 'TIMEOUT',
-                'error': 'Test exceeded 120 seconds'
-            })
-            return None, "Timeout"
+            if supervisor.reason == 'timeout':
+                print(f"✗ Test timed out for {site_url}")
+                error = f'Test exceeded {timeout:.0f} seconds'
+                self._add_result({'site': site_url, 'status': 'TIMEOUT', 'error': error, 'duration': timeout}, locale)
+                return output, "Timeout"
+            
+            if supervisor.reason:
+                print(f"✗ Test killed for {site_url}: {supervisor.detail}")
+                self._add_result({'site': site_url, 'status': 'KILLED', 'error': supervisor.detail,
+                                  'duration': time.perf_counter() - started}, locale)
+                return output, supervisor.detail
+            
+            last_line = output.strip().splitlines()[-1] if output.strip() else f"exit code {process.returncode}"
+            print(f"✗ No result from {site_url}: {last_line}")
+            self._add_result({'site': site_url, 'status': 'ERROR', 'error': last_line,
+                              'duration': time.perf_counter() - started}, locale)
+            return output, last_line
         
         except Exception as e:
             print(f"✗ Error testing {site_url}: {e}")
-            self.results.append({
+            self._add_result({
                 'site': site_url,
                 'status': 'ERROR',
-                'error': str(e)
-            })
+                'error': str(e),
+                'duration': time.perf_counter() - started
+            }, locale)
             return None, str(e)
+        
+        finally:
+            log.close()
+    
+    def _reuse_unchanged(self, sites, locale):
+        """Checkpoint stored results for sites that haven't changed; returns the sites that need an audit"""
+        if not self.change_detector:
+            return sites
+        
+        unchanged = self.change_detector.check_many(sites, locale)
+        for site, record in unchanged.items():
+            self.checkpoint.record(site, locale, self._fill_defaults({**record, 'site': site, 'reused': True}))
+        if unchanged:
+            print(f"{len(unchanged)} of {len(sites)} site(s) unchanged since their last audit - reusing stored results")
+        
+        return [site for site in sites if site not in unchanged]
     
-    def parse_output(self, site_url, output):
-        """Parse test output to extract key results"""
-        result = {
-            'site': site_url,
-            'status': 'UNKNOWN',
+    def _add_result(self, result, locale):
+        """Keep a finished site's result and checkpoint it right away"""
+        result = self._fill_defaults(result)
+        self.results.append(result)
+        self.checkpoint.record(result['site'], locale, result)
+    
+    def _fill_defaults(self, result):
+        """TIMEOUT/KILLED/ERROR results carry only an error; add the keys the summary expects"""
+        defaults = {
             'llm_response': None,
             'button_found': None,
             'button_text': None,
@@ -68,47 +174,7 @@ class TestRunner:
             'tests_passed': 0,
             'tests_total': 0
         }
-        
-        lines = output.split('\n')
-        
-        for line in lines:
-            # Extract LLM response
-            if '[DEBUG] LLM raw response:' in line:
-                result['llm_response'] = line.split("'")[1] if "'" in line else line.split(':')[1].strip()
-            
-            # Extract button found
-            if '✓ LLM selected #' in line or '✓ Fallback matched' in line:
-                result['button_found'] = 'LLM' if 'LLM selected' in line else 'FALLBACK'
-                if ':' in line:
-                    result['button_text'] = line.split("'")[1] if "'" in line else None
-            
-            # Check if signup button was found
-            if '✓ Found signup button:' in line:
-                result['signup_tested'] = True
-                if "'" in line:
-                    result['button_text'] = line.split("'")[1]
-            
-            if '✗ Could not identify signup button' in line:
-                result['button_found'] = 'NONE'
-            
-            # Extract test results
-            if 'Overall:' in line and 'tests passed' in line:
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if '/' in part:
-                        passed, total = part.split('/')
-                        result['tests_passed'] = int(passed)
-                        result['tests_total'] = int(total)
-            
-            # Extract final verdict
-            if '✓ EXCELLENT:' in line:
-                result['status'] = 'EXCELLENT'
-            elif '⚠ PARTIAL:' in line:
-                result['status'] = 'PARTIAL'
-            elif '✗ POOR:' in line:
-                result['status'] = 'POOR'
-        
-        return result
+        return {**defaults, **result}
     
     def write_results(self, full_output=None):
         """Write results to output file"""
@@ -117,7 +183,7 @@ class TestRunner:
             f.write("SIGN-UP LOCALIZATION AUDIT - TEST SUITE RESULTS\n")
             f.write("="*70 + "\n")
             f.write(f"Test Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Target Locale: Spanish (es)\n")
+            f.write(f"Target Locale: {self.locale}\n")
             f.write("="*70 + "\n\n")
             
             # Summary table
@@ -157,15 +223,19 @@ class TestRunner:
             f.write("-"*70 + "\n")
             
             total_tests = len(self.results)
+            heuristic_success = sum(1 for r in self.results if r['button_found'] == 'HEURISTIC')
+            embedding_success = sum(1 for r in self.results if r['button_found'] == 'EMBEDDING')
             llm_success = sum(1 for r in self.results if r['button_found'] == 'LLM')
             fallback_success = sum(1 for r in self.results if r['button_found'] == 'FALLBACK')
             failures = sum(1 for r in self.results if r['button_found'] == 'NONE' or r['button_found'] is None)
             
             f.write(f"Total Sites Tested: {total_tests}\n")
+            f.write(f"Heuristic Success: {heuristic_success} ({heuristic_success/total_tests*100:.1f}%)\n")
+            f.write(f"Embedding Success: {embedding_success} ({embedding_success/total_tests*100:.1f}%)\n")
             f.write(f"LLM Success: {llm_success} ({llm_success/total_tests*100:.1f}%)\n")
             f.write(f"Fallback Success: {fallback_success} ({fallback_success/total_tests*100:.1f}%)\n")
             f.write(f"Failures: {failures} ({failures/total_tests*100:.1f}%)\n")
-            f.write(f"Overall Success Rate: {(llm_success+fallback_success)/total_tests*100:.1f}%\n")
+            f.write(f"Overall Success Rate: {(heuristic_success+embedding_success+llm_success+fallback_success)/total_tests*100:.1f}%\n")
             f.write("="*70 + "\n")
             
             # Full output if provided
@@ -195,18 +265,49 @@ class TestRunner:
         print("-"*70)
         
         total = len(self.results)
+        heuristic = sum(1 for r in self.results if r['button_found'] == 'HEURISTIC')
+        embedding = sum(1 for r in self.results if r['button_found'] == 'EMBEDDING')
         llm = sum(1 for r in self.results if r['button_found'] == 'LLM')
         fallback = sum(1 for r in self.results if r['button_found'] == 'FALLBACK')
         failures = sum(1 for r in self.results if r['button_found'] in ['NONE', None])
         
-        print(f"\nLLM Success: {llm}/{total} ({llm/total*100:.1f}%)")
+        print(f"\nHeuristic Success: {heuristic}/{total} ({heuristic/total*100:.1f}%)")
+        print(f"Embedding Success: {embedding}/{total} ({embedding/total*100:.1f}%)")
+        print(f"LLM Success: {llm}/{total} ({llm/total*100:.1f}%)")
         print(f"Fallback Success: {fallback}/{total} ({fallback/total*100:.1f}%)")
         print(f"Failures: {failures}/{total} ({failures/total*100:.1f}%)")
-        print(f"Overall Success: {(llm+fallback)/total*100:.1f}%")
+        print(f"Overall Success: {(heuristic+embedding+llm+fallback)/total*100:.1f}%")
+        reused = sum(1 for r in self.results if r.get('reused'))
+        if reused:
+            print(f"Reused (pages unchanged): {reused}/{total}")
+        killed = [r for r in self.results if r['status'] in TIMED_OUT_STATUSES]
+        if killed:
+            print(f"\nKilled by the watchdog ({len(killed)}):")
+            for result in killed:
+                print(f"  {result['site']}: {result.get('error') or result['status']}")
         print("="*70)
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run the sign-up localization audit over the test suite")
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='RUN_ID',
+                        help="Continue an interrupted run (default: the latest): skip finished sites, retry failed ones")
+    parser.add_argument('--retries', type=int, default=2, help="Retries per site after ERROR/TIMEOUT/KILLED (default: 2)")
+    parser.add_argument('--retry-backoff', type=float, default=30,
+                        help="Seconds before the first retry, doubling after each failure (default: 30)")
+    parser.add_argument('--sites-file', help="CSV with a site column (or one site per line) instead of the built-in suite")
+    parser.add_argument('--flat-timeouts', action='store_true',
+                        help="120 s for every site instead of a budget from its recorded latency")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reuse stored results for sites whose homepage and signup page haven't changed")
+    parser.add_argument('--max-rss-mb', type=float,
+                        help="Kill an audit whose python/chromedriver/Chrome tree exceeds this much memory (needs psutil)")
+    parser.add_argument('--max-cpu', type=float, metavar='SECONDS',
+                        help="Kill an audit whose process tree has used this much CPU time (needs psutil)")
+    args = parser.parse_args()
+    
     # Test sites - comprehensive suite
     sites = [
         # Original 4 sites
@@ -222,37 +323,42 @@ if __name__ == "__main__":
         'www.microsoft.com',
         'www.anthropic.com',  # Save the best for last!
     ]
+    if args.sites_file:
+        sites, _ = load_sites(args.sites_file)
     
-    print("""
+    print(f"""
 ====================================================================
       AUTOMATED SIGN-UP LOCALIZATION AUDIT TEST SUITE
-                    FINAL RUN - 10 SITES
+                    FINAL RUN - {len(sites)} SITES
 ====================================================================
     """)
     
-    runner = TestRunner()
-    
-    full_output = []
+    run_id = latest_run() if args.resume == 'latest' else args.resume
+    checkpoint = SuiteCheckpoint(run_id=run_id, max_attempts=args.retries + 1, backoff=args.retry_backoff)
+    if args.resume:
+        progress = checkpoint.progress(sites, 'es')
+        print(f"Resuming run {checkpoint.run_id}: {progress['done']} done, "
+              f"{progress['retrying']} to retry, {progress['not_started']} not started")
+    else:
+        print(f"Run {checkpoint.run_id} (continue it with --resume {checkpoint.run_id})")
     
-    for i, site in enumerate(sites, 1):
-        print(f"\n[{i}/{len(sites)}] Testing {site}...")
-        stdout, stderr = runner.run_test(site, locale='es')
-        
-        if stdout:
-            full_output.append(f"\n{'='*70}\n")
-            full_output.append(f"TEST {i}: {site}\n")
-            full_output.append(f"{'='*70}\n")
-            full_output.append(stdout)
+    runner = TestRunner(
+        checkpoint=checkpoint,
+        history=None if args.flat_timeouts else get_latency_history(),
+        change_detector=ChangeDetector() if args.incremental else None,
+        max_rss_mb=args.max_rss_mb,
+        max_cpu_seconds=args.max_cpu
+    )
+    full_output = runner.run_suite(sites, locale='es')
     
     # Print summary
     runner.print_summary()
     
     # Write results
-    runner.write_results(full_output=''.join(full_output))
+    runner.write_results(full_output=full_output)
     
     print(f"\nResults saved to: {runner.output_file}")
     print("\nOpening results file...")
     
     # Open results file
-    import os
     os.startfile(runner.output_file)
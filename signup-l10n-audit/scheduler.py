@@ -0,0 +1,290 @@
+"""
+Site Scheduler
+Orders large site lists (10k+ domains from a CSV) for the parallel runner
+
+- Priority queue: higher-priority sites start first (CSV "priority" column)
+- Per-organisation politeness: amazon.com, amazon.es and amazon.co.uk share one
+  key, so at most `max_per_domain` of them run at once and consecutive starts
+  are at least `min_interval` seconds apart
+- Fair interleaving: among equally important sites, domains take turns instead
+  of one big domain's pages occupying every worker
+- Adaptive timeouts: each site gets a budget from its own recorded latency
+  (p90 of recent runs x factor + margin) instead of a flat 120 s
+
+The scheduler is not thread-safe on purpose: one dispatcher thread (the runner's
+main thread) asks next_ready() and reports release(); workers only run audits.
+"""
+
+import csv
+import heapq
+import ipaddress
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'site_latency.sqlite')
+
+# Public suffixes with two labels, common enough in site lists to matter
+# (everything else is treated as a one-label TLD)
+TWO_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'com.au', 'net.au', 'org.au', 'co.nz', 'co.jp', 'ne.jp',
+    'or.jp', 'co.kr', 'com.br', 'com.mx', 'com.ar', 'com.co', 'com.tr', 'com.cn', 'com.tw', 'com.hk',
+    'com.sg', 'co.in', 'co.za', 'co.id', 'com.my', 'com.ph', 'com.vn', 'com.pl', 'com.ua', 'co.il'
+}
+
+# Audits stopped for running too long or too big: escalate the budget instead of averaging them in
+TIMED_OUT_STATUSES = {'TIMEOUT', 'KILLED'}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def organisation_key(site):
+    """
+    Politeness key: the registrable name without its public suffix
+    'www.amazon.com' / 'amazon.es' / 'https://smile.amazon.co.uk/x' -> 'amazon'
+    """
+    host = urlparse(site if '://' in site else f"https://{site}").hostname or site
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+
+    labels = host.lower().split('.')
+    suffix = 2 if '.'.join(labels[-2:]) in TWO_LABEL_SUFFIXES else 1
+    return labels[-suffix - 1] if len(labels) > suffix else host
+
+
+def load_sites(path):
+    """
+    Sites from a CSV with a `site` (or `url`/`domain`) column and an optional `priority`
+    column, or from a plain one-site-per-line file. '#' lines are skipped.
+    Returns: (sites in file order without duplicates, {site: priority})
+    """
+    sites, priorities = [], {}
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [row for row in csv.reader(f) if row and row[0].strip() and not row[0].startswith('#')]
+
+    header = [cell.strip().lower() for cell in rows[0]] if rows else []
+    site_column = next((header.index(name) for name in ('site', 'url', 'domain') if name in header), None)
+    if site_column is not None:
+        priority_column = header.index('priority') if 'priority' in header else None
+        rows = rows[1:]
+    else:
+        site_column, priority_column = 0, 1 if rows and len(rows[0]) > 1 else None
+
+    for row in rows:
+        site = row[site_column].strip()
+        if not site or site in priorities:
+            continue
+        priority = 0.0
+        if priority_column is not None and len(row) > priority_column:
+            try:
+                priority = float(row[priority_column])
+            except ValueError:
+                pass
+        sites.append(site)
+        priorities[site] = priority
+
+    return sites, priorities
+
+
+def get_latency_history(path=DEFAULT_PATH):
+    """Shared LatencyHistory per file"""
+    with _instances_lock:
+        if path not in _instances:
+            _instances[path] = LatencyHistory(path)
+        return _instances[path]
+
+
+class LatencyHistory:
+    """Per-site audit durations across runs, for adaptive timeouts"""
+
+    def __init__(self, path=DEFAULT_PATH, window=10, factor=2.0, margin=20, minimum=45, maximum=300):
+        """
+        Args:
+            path: SQLite file (':memory:' for a throwaway history)
+            window: Most recent runs per site considered
+            factor, margin: timeout = p90 duration * factor + margin
+            minimum, maximum: Bounds for every adaptive timeout (seconds)
+        """
+        self.window = window
+        self.factor = factor
+        self.margin = margin
+        self.minimum = minimum
+        self.maximum = maximum
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS latencies (
+                site TEXT NOT NULL,
+                duration REAL NOT NULL,
+                timed_out INTEGER NOT NULL,
+                recorded REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS latencies_site ON latencies (site, recorded)")
+        self._db.commit()
+
+    def record(self, site, duration, timed_out=False):
+        with self._lock:
+            self._db.execute("INSERT INTO latencies (site, duration, timed_out, recorded) VALUES (?, ?, ?, ?)",
+                             (site, duration, int(timed_out), time.time()))
+            self._db.commit()
+
+    def record_result(self, site, result, budget=None):
+        """
+        Record a finished audit. Completed audits count with their duration; TIMEOUT and KILLED
+        (the watchdog stopped it) count as a timed-out run of at least `budget`, so the next budget
+        grows; ERROR results are not recorded - a crash after 3s says nothing about the site.
+        """
+        status = result.get('status')
+        duration = result.get('duration') or 0.0
+        if status in TIMED_OUT_STATUSES:
+            self.record(site, max(duration, budget or 0.0), timed_out=True)
+        elif status != 'ERROR':
+            self.record(site, duration)
+
+    def timeout_for(self, site, default=120):
+        """
+        Budget for the next audit of site: `default` without history; after a timeout,
+        1.5x the budget that ran out (so slow sites get more room instead of failing again)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT duration, timed_out FROM latencies WHERE site = ? ORDER BY recorded DESC LIMIT ?",
+                (site, self.window)
+            ).fetchall()
+        if not rows:
+            return default
+
+        last_duration, last_timed_out = rows[0]
+        if last_timed_out:
+            return min(self.maximum, max(last_duration * 1.5, self.minimum))
+
+        durations = sorted(duration for duration, timed_out in rows if not timed_out)
+        p90 = durations[int(0.9 * (len(durations) - 1))]
+        return min(self.maximum, max(self.minimum, p90 * self.factor + self.margin))
+
+
+class SiteScheduler:
+    """
+    Usage (one dispatcher thread):
+        scheduler = SiteScheduler(sites, priorities, history=get_latency_history())
+        while not scheduler.finished:
+            site = scheduler.next_ready()            # None: everything eligible is running/rate-limited
+            ... submit audit(site, timeout=scheduler.timeout_for(site)) ...
+            ... on completion: scheduler.release(site, result) ...
+    """
+
+    def __init__(self, sites, priorities=None, max_per_domain=1, min_interval=2.0, history=None,
+                 default_timeout=120, key=organisation_key):
+        """
+        Args:
+            sites: Sites to schedule (order breaks priority ties)
+            priorities: {site: number}, higher runs first (default 0)
+            max_per_domain: Audits of one organisation running at once
+            min_interval: Seconds between two starts on the same organisation
+            history: LatencyHistory for adaptive timeouts (None: default_timeout for every site)
+            default_timeout: Budget for sites without history
+            key: site -> politeness key
+        """
+        priorities = priorities or {}
+        self.max_per_domain = max(1, max_per_domain)
+        self.min_interval = min_interval
+        self.history = history
+        self.default_timeout = default_timeout
+        self.key = key
+
+        self._seq = itertools.count()
+        self._queues = {}        # domain -> heap of (-priority, seq, site)
+        self._active = {}        # domain -> audits running
+        self._last_start = {}    # domain -> monotonic time of its last start
+        self._ready = []         # heap of (-priority of the domain's best site, seq, domain)
+        self._delayed = []       # heap of (monotonic time the domain may start again, seq, domain)
+        self._scheduled = set()  # domains currently in _ready or _delayed
+        self._started = {}       # site -> (domain, monotonic start time)
+        self.queued = 0
+
+        for site in sites:
+            domain = self.key(site)
+            heapq.heappush(self._queues.setdefault(domain, []), (-priorities.get(site, 0), next(self._seq), site))
+            self.queued += 1
+        for domain in self._queues:
+            self._schedule(domain)
+
+    @property
+    def running(self):
+        return len(self._started)
+
+    @property
+    def finished(self):
+        return not self._started and not self.queued
+
+    def timeout_for(self, site):
+        return self.history.timeout_for(site, self.default_timeout) if self.history else self.default_timeout
+
+    def next_ready(self):
+        """Highest-priority site whose domain may start now, or None"""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, domain = heapq.heappop(self._delayed)
+            heapq.heappush(self._ready, (self._queues[domain][0][0], next(self._seq), domain))
+
+        if not self._ready:
+            return None
+
+        _, _, domain = heapq.heappop(self._ready)
+        self._scheduled.discard(domain)
+        _, _, site = heapq.heappop(self._queues[domain])
+        self.queued -= 1
+
+        self._active[domain] = self._active.get(domain, 0) + 1
+        self._last_start[domain] = now
+        self._started[site] = (domain, now)
+        # Re-queued behind every other domain of the same priority: domains take turns
+        self._schedule(domain)
+        return site
+
+    def seconds_until_ready(self):
+        """Wait before a rate-limited domain may start again (None if nothing is waiting on time)"""
+        if self._ready:
+            return 0.0
+        if self._delayed:
+            return max(0.0, self._delayed[0][0] - time.monotonic())
+        return None
+
+    def release(self, site, result=None):
+        """Report a finished audit: frees the domain's slot and records its latency (completed audits only)"""
+        domain, started = self._started.pop(site)
+        self._active[domain] -= 1
+
+        if self.history and result is not None:
+            if result.get('duration') is None:
+                result = {**result, 'duration': time.monotonic() - started}
+            self.history.record_result(site, result, budget=self.timeout_for(site))
+
+        self._schedule(domain)
+
+    def _schedule(self, domain):
+        """Put a domain with queued sites and a free slot back in line (ready now or after min_interval)"""
+        if domain in self._scheduled or not self._queues.get(domain):
+            return
+        if self._active.get(domain, 0) >= self.max_per_domain:
+            return  # release() reschedules it
+
+        self._scheduled.add(domain)
+        allowed = self._last_start.get(domain, float('-inf')) + self.min_interval
+        if allowed > time.monotonic():
+            heapq.heappush(self._delayed, (allowed, next(self._seq), domain))
+        else:
+            heapq.heappush(self._ready, (self._queues[domain][0][0], next(self._seq), domain))
@@ -0,0 +1,127 @@
+"""
+Heuristic Signup Button Ranker
+Scores every button/link candidate before any LLM call
+
+Features: multilingual signup keywords in the text and aria-label, signup vs
+login hrefs, login/navigation negatives, and position (header, above the fold).
+When the top candidate is clearly ahead we skip the LLM entirely; otherwise
+only the top-k go to the LLM, ranked so the real button can't be cut off by
+DOM order.
+"""
+
+import re
+
+# Multilingual signup phrases (also the audit's keyword fallback)
+SIGNUP_PATTERNS = {
+    # English
+    'en': ['sign up', 'signup', 'get started', 'start free', 'try free',
+           'free trial', 'create account', 'register', 'start for free', 'join'],
+    # Spanish
+    'es': ['registrarse', 'empezar', 'comenzar', 'crear cuenta', 'prueba gratis',
+           'identifícate', 'cuenta y listas', 'cuenta'],
+    # French
+    'fr': ['s\'inscrire', 'commencer', 'créer un compte', 'essai gratuit',
+           'démarrer', 'créer compte'],
+    # German
+    'de': ['anmelden', 'loslegen', 'kostenlos testen', 'registrieren'],
+    # Portuguese
+    'pt': ['inscrever-se', 'cadastrar', 'teste grátis', 'criar conta'],
+}
+
+ALL_SIGNUP_PATTERNS = [pattern for patterns in SIGNUP_PATTERNS.values() for pattern in patterns]
+
+# Patterns that also appear on non-signup controls ("Cuenta" is often login, "anmelden"
+# means both sign up and log in, "join" shows up in "Join our newsletter")
+WEAK_PATTERNS = {'cuenta', 'identifícate', 'cuenta y listas', 'anmelden', 'join', 'commencer',
+                 'empezar', 'comenzar'}
+
+LOGIN_PATTERNS = ['log in', 'login', 'sign in', 'signin', 'iniciar sesión', 'se connecter', 'connexion',
+                  'einloggen', 'entrar', 'accedi', 'ログイン', '로그인']
+
+NEGATIVE_PATTERNS = ['contact sales', 'talk to sales', 'pricing', 'about', 'products', 'blog',
+                     'help', 'support', 'careers', 'learn more']
+
+SIGNUP_HREF = re.compile(r'/(sign[-_]?up|register|registration|join|create[-_]?account|'
+                         r'enroll|free[-_]?trial|trial|get[-_]?started|start)(?:[/?#.]|$)', re.IGNORECASE)
+LOGIN_HREF = re.compile(r'/(log[-_]?in|sign[-_]?in|signin|auth/login)(?:[/?#.]|$)', re.IGNORECASE)
+
+HEADER_HEIGHT = 150
+FOLD_HEIGHT = 900
+
+
+def score_candidate(candidate):
+    """
+    Heuristic signup score for one extracted candidate
+    Returns: (score, reasons)
+    """
+    text = candidate['text'].lower()
+    aria = (candidate.get('aria') or '').lower()
+    href = candidate.get('href') or ''
+    box = candidate.get('box') or [0, 0, 0, 0]
+
+    score = 0.0
+    reasons = []
+
+    matched = [p for p in ALL_SIGNUP_PATTERNS if p in text]
+    if matched:
+        strong = [p for p in matched if p not in WEAK_PATTERNS]
+        score += 3.0 if strong else 1.5
+        # Short labels that are basically the phrase ("Sign up") beat sentences mentioning it
+        if len(text) <= max(len(p) for p in matched) + 8:
+            score += 1.0
+        reasons.append(f"text:{matched[0]}")
+
+    if aria and any(p in aria for p in ALL_SIGNUP_PATTERNS):
+        score += 1.5
+        reasons.append("aria")
+
+    if SIGNUP_HREF.search(href):
+        score += 2.5
+        reasons.append("href:signup")
+    elif LOGIN_HREF.search(href):
+        score -= 3.0
+        reasons.append("href:login")
+
+    if any(p in text for p in LOGIN_PATTERNS):
+        score -= 4.0
+        reasons.append("login")
+
+    if any(p in text for p in NEGATIVE_PATTERNS):
+        score -= 2.0
+        reasons.append("nav")
+
+    if box[1] < HEADER_HEIGHT:
+        score += 0.5
+        reasons.append("header")
+    elif box[1] < FOLD_HEIGHT:
+        score += 0.25
+
+    if candidate.get('tag') == 'button':
+        score += 0.25
+
+    return score, reasons
+
+
+def rank(candidates):
+    """All candidates as (score, candidate, reasons), best first (DOM order breaks ties)"""
+    scored = [(*score_candidate(c), i, c) for i, c in enumerate(candidates)]
+    scored.sort(key=lambda item: (-item[0], item[2]))
+    return [(score, candidate, reasons) for score, reasons, _, candidate in scored]
+
+
+def confident_pick(ranked, min_score=5.0, min_margin=2.0):
+    """The top candidate if it clearly wins (high score and well ahead of #2), else None"""
+    if not ranked:
+        return None
+
+    top_score = ranked[0][0]
+    runner_up = ranked[1][0] if len(ranked) > 1 else 0.0
+
+    if top_score >= min_score and top_score - runner_up >= min_margin:
+        return ranked[0][1]
+    return None
+
+
+def shortlist(ranked, k=10):
+    """Top-k candidates for the LLM"""
+    return [candidate for _, candidate, _ in ranked[:k]]
@@ -0,0 +1,40 @@
+import checkpoint
+
+
+def test_final_results_are_not_rerun(tmp_path):
+    path = str(tmp_path / 'runs.sqlite')
+    first = checkpoint.SuiteCheckpoint(path, run_id='run')
+    first.record('a.com', 'es', {'status': 'EXCELLENT'})
+
+    resumed = checkpoint.SuiteCheckpoint(path, run_id=checkpoint.latest_run(path))
+    assert resumed.run_id == 'run'
+    assert resumed.pending(['a.com', 'b.com'], 'es') == ['b.com']
+    assert resumed.results(['a.com', 'b.com'], 'es') == {'a.com': {'status': 'EXCELLENT'}}
+
+
+def test_failures_are_retried_with_backoff_until_max_attempts():
+    store = checkpoint.SuiteCheckpoint(':memory:', max_attempts=3, backoff=0.0, backoff_factor=2.0)
+    attempts = []
+    for batch in store.rounds(['a.com'], 'es'):
+        for site in batch:
+            attempts.append(site)
+            store.record(site, 'es', {'status': 'KILLED' if len(attempts) < 3 else 'TIMEOUT'})
+
+    assert attempts == ['a.com'] * 3
+    assert store.results(['a.com'], 'es')['a.com']['status'] == 'TIMEOUT'
+    assert store.progress(['a.com'], 'es') == {'done': 1, 'retrying': 0, 'not_started': 0}
+
+
+def test_retry_waits_for_its_backoff():
+    store = checkpoint.SuiteCheckpoint(':memory:', backoff=60.0)
+    store.record('a.com', 'es', {'status': 'ERROR'})
+    assert store.pending(['a.com'], 'es') == ['a.com']
+    assert 55 < store.seconds_until_due(['a.com'], 'es') <= 60
+    assert store.seconds_until_due(['a.com', 'b.com'], 'es') == 0.0
+
+
+def test_locales_are_tracked_separately():
+    store = checkpoint.SuiteCheckpoint(':memory:')
+    store.record('a.com', 'es', {'status': 'POOR'})
+    assert store.pending(['a.com'], 'es') == []
+    assert store.pending(['a.com'], 'fr') == ['a.com']
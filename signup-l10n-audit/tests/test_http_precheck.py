@@ -0,0 +1,36 @@
+import codecs
+
+import http_precheck
+
+JAPANESE = 'アカウントを作成して今すぐ始めましょう。登録は無料です。'
+
+
+def test_utf8_without_charset_is_not_read_as_latin1():
+    body = f'<html><body>{JAPANESE}</body></html>'.encode('utf-8')
+    assert JAPANESE in http_precheck.decode_body(body, 'text/html')
+
+
+def test_header_charset_wins():
+    body = 'Créer un compte'.encode('latin-1')
+    assert http_precheck.decode_body(body, 'text/html; charset=ISO-8859-1') == 'Créer un compte'
+
+
+def test_meta_charset_is_used_when_the_header_has_none():
+    body = f'<html><head><meta charset="shift_jis"></head><body>{JAPANESE}</body></html>'.encode('shift_jis')
+    assert JAPANESE in http_precheck.decode_body(body, 'text/html')
+
+
+def test_bom_wins_over_everything():
+    body = codecs.BOM_UTF8 + 'Ünïcödé'.encode('utf-8')
+    assert http_precheck.decode_body(body, 'text/html; charset=ISO-8859-1') == 'Ünïcödé'
+
+
+def test_body_cut_mid_character_stays_utf8():
+    body = f'<p>{JAPANESE}</p>'.encode('utf-8')[:-5]
+    text = http_precheck.decode_body(body)
+    assert text.startswith('<p>' + JAPANESE[:10])
+
+
+def test_unknown_charset_name_falls_through():
+    body = 'Регистрация'.encode('utf-8')
+    assert http_precheck.decode_body(body, 'text/html; charset=x-bogus') == 'Регистрация'
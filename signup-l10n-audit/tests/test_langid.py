@@ -0,0 +1,43 @@
+import itertools
+
+import pytest
+
+pytest.importorskip('numpy')
+
+import langid
+
+
+@pytest.fixture(scope='module')
+def identifier():
+    return langid.get_identifier()
+
+
+def page(language):
+    return ' '.join(text for code, text in langid.LABELLED_SAMPLES if code == language)
+
+
+@pytest.mark.parametrize('language', ['en', 'es', 'pt', 'fr', 'de', 'it', 'ru', 'ar', 'ja', 'zh', 'ko'])
+def test_single_language_pages_pass(identifier, language):
+    assert identifier.is_language(page(language), language)[0]
+
+
+@pytest.mark.parametrize('text', ['Sign up', 'Registrarse', 'Create your account Crea tu cuenta'])
+def test_too_short_sample_gets_no_label(identifier, text):
+    assert identifier.detect(text) == (None, 0.0)
+    assert not identifier.is_language(text, 'es')[0]
+
+
+def test_mixed_script_sample_gets_no_label(identifier):
+    text = page('ja') + ' ' + page('en')
+    assert identifier.detect(text) == (None, 0.0)
+    assert not identifier.is_language(text, 'ja')[0]
+
+
+def test_most_half_and_half_latin_pages_are_not_confident(identifier):
+    latin = ['en', 'es', 'pt', 'fr', 'de', 'it']
+    accepted = 0
+    pairs = list(itertools.combinations(latin, 2))
+    for first, second in pairs:
+        text = page(first) + ' ' + page(second)
+        accepted += identifier.is_language(text, first)[0] or identifier.is_language(text, second)[0]
+    assert accepted <= len(pairs) // 3
@@ -0,0 +1,38 @@
+import threading
+import time
+
+import llm_client
+
+
+class SlowLoad:
+    """Stands in for the session: /api/generate takes `delay` seconds to load the model"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.started = threading.Event()
+
+    def post(self, url, json=None, timeout=None):
+        self.calls += 1
+        self.started.set()
+        time.sleep(self.delay)
+        return type('Response', (), {'status_code': 200})()
+
+
+def test_second_caller_does_not_wait_for_an_inflight_preload():
+    client = llm_client.OllamaClient('http://preload-test:11434', 'model')
+    client._session = SlowLoad(delay=1.0)
+
+    client.preload_in_background()
+    assert client._session.started.wait(1)
+
+    started = time.perf_counter()
+    client.preload_in_background()
+    assert time.perf_counter() - started < 0.1
+    assert client._session.calls == 1
+
+    deadline = time.monotonic() + 3
+    while 'model' not in client._preloaded and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert client.preload() is True
+    assert client._session.calls == 1
@@ -0,0 +1,84 @@
+import locale_probe
+
+
+def urls(url, locale='fr-ca', hreflang=None):
+    return {candidate: (kind, scope) for kind, candidate, scope in locale_probe.candidate_urls(url, locale, hreflang)}
+
+
+def test_culture_segment_is_replaced_not_nested():
+    found = urls('https://www.site.com/en-ca/pricing')
+    assert found['https://www.site.com/fr-ca/pricing'] == ('path', 'region')
+    assert found['https://www.site.com/fr/pricing'] == ('path', 'language')
+    assert not any('/en-ca/' in url for url in found)
+
+
+def test_cctld_swap_handles_two_label_suffixes():
+    found = urls('https://www.site.co.uk/')
+    assert found['https://www.site.ca/'] == ('cctld', 'region')
+    assert 'https://www.site.co.ca/' not in found
+
+
+def test_subdomain_replaces_an_existing_subdomain():
+    found = urls('https://app.site.com/')
+    assert found['https://fr.site.com/'] == ('subdomain', 'language')
+    assert found['https://fr-ca.site.com/'] == ('subdomain', 'region')
+    assert not any('fr.app.' in url for url in found)
+
+
+def test_hreflang_for_another_region_is_not_fr_ca_evidence():
+    hreflang = {'fr-fr': 'https://site.com/france', 'fr': 'https://site.com/francais',
+                'fr-ca': 'https://site.com/quebec', 'en': 'https://site.com/english'}
+    found = urls('https://site.com/', hreflang=hreflang)
+    assert found['https://site.com/quebec'] == ('hreflang', 'region')
+    assert found['https://site.com/francais'] == ('hreflang', 'language')
+    assert 'https://site.com/france' not in found
+    assert 'https://site.com/english' not in found
+
+
+def test_language_only_locale_has_no_region_scope():
+    found = urls('https://site.com/', locale='fr')
+    assert {scope for _, scope in found.values()} == {'language'}
+    assert found['https://site.fr/'] == ('cctld', 'language')
+
+
+def test_ip_hosts_get_no_host_variants():
+    found = urls('http://127.0.0.1:8000/')
+    assert {kind for kind, _ in found.values()} == {'path', 'query'}
+
+
+def test_variants_are_fetched_with_the_source_accept_language(monkeypatch):
+    requested = []
+
+    def fetch_page(url, locale, **kwargs):
+        requested.append(locale)
+        return {'url': url, 'final_url': url, 'status': 404, 'redirects': [], 'elapsed': 0.0}
+
+    monkeypatch.setattr(locale_probe.http_precheck, 'fetch_page', fetch_page)
+    variants = locale_probe.probe('https://site.com/en-ca/', 'fr-ca', lambda *args: (True, 'fr', ''),
+                                  hreflang={}, source_locale='en-ca')
+    assert variants and not any(v['serves'] for v in variants)
+    assert set(requested) == {'en-ca'}
+
+
+def test_regional_candidates_redirected_to_the_language_page_are_language_only(monkeypatch):
+    def fetch_page(url, locale, **kwargs):
+        landing = 'https://site.com/fr/'  # The site only has France-French
+        return {'url': url, 'final_url': landing, 'status': 200, 'elapsed': 0.0,
+                'redirects': [] if landing == url else [landing],
+                'text': 'Bonjour', 'html_lang': 'fr', 'content_language': ''}
+
+    monkeypatch.setattr(locale_probe.http_precheck, 'fetch_page', fetch_page)
+    variants = locale_probe.probe('https://site.com/', 'fr-ca', lambda *args: (True, 'fr', ''), hreflang={},
+                                  source_locale='en-ca')
+    served = [v for v in variants if v['serves']]
+    assert served
+    assert {v['scope'] for v in served} == {'language'}
+
+
+def test_redirect_that_keeps_the_region_stays_regional():
+    assert locale_probe.pins_region('https://www.site.com/fr-CA/accueil', 'fr', 'ca')
+    assert locale_probe.pins_region('https://fr-ca.site.com/', 'fr', 'ca')
+    assert locale_probe.pins_region('https://site.ca/', 'fr', 'ca')
+    assert locale_probe.pins_region('https://site.com/?locale=fr_CA', 'fr', 'ca')
+    assert not locale_probe.pins_region('https://site.com/fr/', 'fr', 'ca')
+    assert not locale_probe.pins_region('https://site.com/fr-fr/', 'fr', 'ca')
@@ -0,0 +1,28 @@
+import pytest
+
+import page_classifier
+
+
+def test_one_based_indexes_become_zero_based():
+    assert page_classifier.parse_answer('{"language_selector": 1, "signup_button": 3}', 2, 3) == \
+        {'language_selector': 0, 'signup_button': 2}
+
+
+def test_zero_means_none_found():
+    assert page_classifier.parse_answer('{"language_selector": 0, "signup_button": 0}', 2, 3) == \
+        {'language_selector': None, 'signup_button': None}
+
+
+@pytest.mark.parametrize('answer', [
+    'not json',
+    None,
+    '[1, 2]',
+    '{"language_selector": 1}',                              # missing field
+    '{"language_selector": 3, "signup_button": 1}',          # out of range
+    '{"language_selector": -1, "signup_button": 1}',
+    '{"language_selector": true, "signup_button": 1}',       # bool is not an index
+    '{"language_selector": "1", "signup_button": 1}',
+    '{"language_selector": 1.0, "signup_button": 1}',
+])
+def test_invalid_answers_are_rejected(answer):
+    assert page_classifier.parse_answer(answer, 2, 3) is None
@@ -0,0 +1,61 @@
+import json
+
+import readiness
+
+
+class NavigatingDriver:
+    """The click's navigation becomes visible after `delay_polls` polls; no DOM observer needed"""
+
+    def __init__(self, delay_polls, navigate=True, document_event=False):
+        self.url = 'https://site.com/'
+        self.polls = 0
+        self.delay_polls = delay_polls
+        self.navigate = navigate
+        self.document_event = document_event
+        self.events = []
+
+    def get_log(self, kind):
+        events, self.events = self.events, []
+        return events
+
+    def execute_script(self, script, *args):
+        if script == readiness.NAVIGATION_MARKER_JS:
+            self.polls += 1
+            if self.navigate and self.polls > self.delay_polls:
+                if self.document_event and not self.url.endswith('signup'):
+                    self.events.append({'message': json.dumps({'message': {
+                        'method': 'Network.requestWillBeSent',
+                        'params': {'requestId': '1', 'type': 'Document'}}})})
+                self.url = 'https://site.com/signup'
+            return [self.url, 1.0]
+        if script == "return document.readyState":
+            return 'complete'
+        return 0
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return True
+
+
+def test_settle_waits_for_the_click_to_navigate():
+    driver = NavigatingDriver(delay_polls=5)
+    page = readiness.PageReadiness(driver, network_idle_ms=10, poll_interval=0.01)
+    marker = page.navigation_marker()
+    assert page.settle('signup navigation', budget=2, quiet_ms=10, since=marker)
+    assert driver.url.endswith('/signup')
+
+
+def test_document_request_counts_as_navigation():
+    driver = NavigatingDriver(delay_polls=1, document_event=True)
+    page = readiness.PageReadiness(driver, poll_interval=0.01)
+    marker = page.navigation_marker()
+    driver.execute_script(readiness.NAVIGATION_MARKER_JS)  # The click
+    assert page.wait_for_navigation(marker, deadline=float('inf'))
+    assert page._documents == 1
+
+
+def test_no_navigation_is_bounded_by_the_budget():
+    page = readiness.PageReadiness(NavigatingDriver(0, navigate=False), poll_interval=0.01)
+    assert not page.settle('signup navigation', budget=0.1, quiet_ms=10, since=page.navigation_marker())
@@ -0,0 +1,46 @@
+import resource_policy
+
+
+class CdpDriver:
+    def __init__(self):
+        self.blocked_urls = []
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Network.setBlockedURLs':
+            self.blocked_urls.append(params['urls'])
+        if command == 'Page.getFrameTree':
+            return {'frameTree': {'frame': {'id': 'top'}}}
+        return {}
+
+
+def navigate(report, url, frame='top'):
+    report.on_network_event('Network.requestWillBeSent', {'type': 'Document', 'frameId': frame, 'documentURL': url})
+
+
+def test_only_blocklist_hits_count_as_savings():
+    report = resource_policy.BlockReport(('images', 'trackers'))
+    for reason in ('inspector', 'csp', 'mixed-content', 'corp-not-same-origin'):
+        report.on_network_event('Network.loadingFailed', {'blockedReason': reason, 'type': 'Script'})
+    report.on_network_event('Network.loadingFailed', {'errorText': 'net::ERR_FAILED', 'type': 'Image'})
+    assert report.blocked == {'images': 0, 'trackers': 1}
+
+
+def test_override_covers_subdomains():
+    policy = resource_policy.ResourcePolicy(site_overrides={'site.com': ['fonts']})
+    assert 'fonts' not in policy.categories_for('https://accounts.site.com/signup')
+    assert 'fonts' in policy.categories_for('https://othersite.com/')
+
+
+def test_policy_follows_top_frame_navigation_to_another_site():
+    driver = CdpDriver()
+    policy = resource_policy.ResourcePolicy(site_overrides={'auth.example': 'all'})
+    report = policy.apply(driver, 'https://www.site.com/')
+    assert driver.blocked_urls[-1]
+
+    navigate(report, 'https://ads.example/frame', frame='child')
+    navigate(report, 'https://accounts.site.com/')
+    assert len(driver.blocked_urls) == 1  # Frames and same-policy navigations change nothing
+
+    navigate(report, 'https://login.auth.example/signup')
+    assert driver.blocked_urls[-1] == []
+    assert report.categories == ()
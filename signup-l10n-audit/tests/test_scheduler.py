@@ -0,0 +1,52 @@
+import scheduler
+
+
+def test_organisation_key_groups_one_company():
+    assert scheduler.organisation_key('www.amazon.com') == 'amazon'
+    assert scheduler.organisation_key('amazon.es') == 'amazon'
+    assert scheduler.organisation_key('https://smile.amazon.co.uk/x') == 'amazon'
+    assert scheduler.organisation_key('10.0.0.1') == '10.0.0.1'
+
+
+def test_load_sites_reads_priorities_and_drops_duplicates(tmp_path):
+    path = tmp_path / 'sites.csv'
+    path.write_text('site,priority\n# comment\na.com,1\nb.com,5\na.com,2\n', encoding='utf-8')
+    sites, priorities = scheduler.load_sites(str(path))
+    assert sites == ['a.com', 'b.com']
+    assert priorities['b.com'] == 5
+
+
+def test_domains_take_turns_and_share_one_slot():
+    sites = ['a.com', 'www.a.com', 'b.com']
+    plan = scheduler.SiteScheduler(sites, max_per_domain=1, min_interval=0)
+    first, second = plan.next_ready(), plan.next_ready()
+    assert {first, second} == {'a.com', 'b.com'}
+    assert plan.next_ready() is None  # www.a.com waits for a.com's slot
+
+    plan.release('a.com', {'status': 'EXCELLENT', 'duration': 1.0})
+    assert plan.next_ready() == 'www.a.com'
+
+
+def test_priority_runs_first():
+    plan = scheduler.SiteScheduler(['low.com', 'high.com'], priorities={'high.com': 10}, min_interval=0)
+    assert plan.next_ready() == 'high.com'
+
+
+def test_only_completed_audits_feed_the_latency_history():
+    history = scheduler.LatencyHistory(':memory:', minimum=45, maximum=300)
+    history.record_result('a.com', {'status': 'ERROR', 'duration': 2.0})
+    assert history.timeout_for('a.com') == 120  # Still no history
+
+    history.record_result('a.com', {'status': 'EXCELLENT', 'duration': 40.0})
+    assert history.timeout_for('a.com') == 100  # p90 * 2 + 20
+
+
+def test_killed_escalates_the_budget_like_a_timeout():
+    history = scheduler.LatencyHistory(':memory:')
+    plan = scheduler.SiteScheduler(['a.com'], history=history, default_timeout=100)
+    site = plan.next_ready()
+    plan.release(site, {'status': 'KILLED', 'duration': 12.0})
+    assert history.timeout_for('a.com') == 150
+
+    history.record_result('b.com', {'status': 'TIMEOUT', 'duration': 80.0}, budget=80)
+    assert history.timeout_for('b.com') == 120
@@ -0,0 +1,33 @@
+import signup_ranker
+
+
+def candidate(text, href=None, top=400, tag='a'):
+    return {'text': text, 'href': href, 'box': [0, top, 100, 30], 'tag': tag}
+
+
+def test_clear_signup_button_is_picked_without_the_llm():
+    ranked = signup_ranker.rank([
+        candidate('Pricing', '/pricing'),
+        candidate('Sign up', '/signup', top=40, tag='button'),
+        candidate('Blog', '/blog'),
+    ])
+    assert signup_ranker.confident_pick(ranked)['text'] == 'Sign up'
+
+
+def test_close_runner_up_is_left_to_the_llm():
+    ranked = signup_ranker.rank([
+        candidate('Sign up', '/signup'),
+        candidate('Create account', '/register'),
+    ])
+    assert signup_ranker.confident_pick(ranked) is None
+
+
+def test_login_link_is_never_confident():
+    ranked = signup_ranker.rank([candidate('Sign in', '/login', top=40)])
+    assert ranked[0][0] < 0
+    assert signup_ranker.confident_pick(ranked) is None
+
+
+def test_single_strong_candidate_and_empty_list():
+    assert signup_ranker.confident_pick(signup_ranker.rank([candidate('Sign up', '/signup')]))['href'] == '/signup'
+    assert signup_ranker.confident_pick([]) is None
@@ -0,0 +1,183 @@
+"""
+Span-Based Timing Instrumentation
+Where does an audit's time go: Chrome launch, page loads, popups, selector
+detection, the LLM, readiness waits?
+
+Spans are recorded by one process-wide Tracer, exported as Chrome trace-event
+JSON (open in chrome://tracing or https://ui.perfetto.dev) and summarised as a
+p50/p95 table per phase. Disabled (the default), span() returns a shared no-op
+context manager and traced() calls straight through: one attribute check.
+
+    tracing.enable()
+    with tracing.span('homepage load'):
+        driver.get(url)
+    tracing.get_tracer().export_chrome_trace('trace.json')
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """What span() returns while tracing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ended = time.perf_counter()
+        if exc_type is not None:
+            self.args = {**self.args, 'error': exc_type.__name__}
+        self.tracer.record(self.name, self.category, self.started, ended, self.args)
+        return False
+
+
+class Tracer:
+    """Collects complete ("X") trace events from all threads"""
+
+    def __init__(self, enabled=False, max_events=200_000):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._context = threading.local()
+        self._thread_names = {}
+
+    def set_context(self, **args):
+        """Args (site, locale, ...) attached to every span this thread records from now on"""
+        self._context.args = args
+
+    def span(self, name, category='audit', **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def record(self, name, category, started, ended, args=None):
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (started - self._origin) * 1e6,
+            'dur': (ended - started) * 1e6,
+            'pid': os.getpid(),
+            'tid': thread.ident,
+            'args': {**getattr(self._context, 'args', {}), **(args or {})}
+        }
+        with self._lock:
+            self._thread_names.setdefault(thread.ident, thread.name)
+            if len(self.events) < self.max_events:
+                self.events.append(event)
+            else:
+                self.dropped += 1
+
+    def clear(self):
+        with self._lock:
+            self.events = []
+            self.dropped = 0
+
+    def export_chrome_trace(self, path):
+        """Write the Trace Event Format JSON (thread names included as metadata events)"""
+        with self._lock:
+            events = list(self.events)
+            names = dict(self._thread_names)
+
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+            for tid, name in names.items()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+
+    def summary(self):
+        """{name: {'category', 'count', 'total', 'p50', 'p95', 'max'}} in seconds"""
+        with self._lock:
+            events = list(self.events)
+
+        durations = {}
+        categories = {}
+        for event in events:
+            durations.setdefault(event['name'], []).append(event['dur'] / 1e6)
+            categories[event['name']] = event['cat']
+
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {
+                'category': categories[name],
+                'count': len(values),
+                'total': sum(values),
+                'p50': values[int(0.5 * (len(values) - 1))],
+                'p95': values[int(0.95 * (len(values) - 1))],
+                'max': values[-1]
+            }
+        return summary
+
+    def report(self):
+        """Per-phase table, slowest total first"""
+        summary = self.summary()
+        if not summary:
+            return "  (no spans recorded)"
+
+        lines = [f"  {'Phase':<32} {'Calls':>6} {'p50':>8} {'p95':>8} {'Max':>8} {'Total':>9}"]
+        for name, s in sorted(summary.items(), key=lambda item: -item[1]['total']):
+            lines.append(f"  {name[:32]:<32} {s['count']:>6} {s['p50']:>7.2f}s {s['p95']:>7.2f}s "
+                         f"{s['max']:>7.2f}s {s['total']:>8.1f}s")
+        if self.dropped:
+            lines.append(f"  ({self.dropped} span(s) dropped past max_events)")
+        return '\n'.join(lines)
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    return _tracer
+
+
+def enable(enabled=True):
+    _tracer.enabled = enabled
+
+
+def span(name, category='audit', **args):
+    """Context manager timing a block (no-op while tracing is disabled)"""
+    return _tracer.span(name, category, **args)
+
+
+def traced(name=None, category='audit'):
+    """Decorator: time every call of a function/method as one span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
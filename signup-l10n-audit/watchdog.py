@@ -0,0 +1,219 @@
+"""
+Process Watchdog
+Runs an audit subprocess in its own process group and kills the whole tree
+(python -> chromedriver -> Chrome and its helpers) when it overruns
+
+Killing only the Python child leaves chromedriver and every Chrome process
+running; over a long suite those leftovers eat the machine. Here:
+- POSIX: the child starts a new session, so one killpg() reaches every
+  descendant that stayed in its process group. kill_tree() also snapshots the
+  descendants (psutil, or `ps` without it) before signalling. A target in the
+  caller's own group is never killpg()'d - e.g. chromedriver, which Selenium's
+  Service starts without a new session, so it shares the group of the audit
+  calling abort() - and there the snapshot is the only way to reach Chrome. It
+  also catches helpers that left the group (setsid/daemonized)
+- Windows: CREATE_NEW_PROCESS_GROUP + `taskkill /F /T`, which walks the tree
+- Limits: wall-clock timeout always; with psutil also the RSS of the whole tree
+  and its total CPU time, polled every poll_interval seconds
+- Leftovers: whatever is still alive in the group when the audit exits normally
+  is killed too
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import psutil  # Optional: memory/CPU limits and exact descendant tracking
+except ImportError:
+    psutil = None
+
+IS_WINDOWS = sys.platform == 'win32'
+
+
+def _descendants(pid):
+    """Pids of every descendant of pid: psutil, else `ps` on POSIX ([] when neither works)"""
+    if psutil is not None:
+        try:
+            return [p.pid for p in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    if IS_WINDOWS:
+        return []
+
+    try:
+        table = subprocess.run(['ps', '-A', '-o', 'pid=', '-o', 'ppid='], capture_output=True,
+                               text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    children = {}
+    for line in table.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[0].isdigit() and fields[1].isdigit():
+            children.setdefault(int(fields[1]), []).append(int(fields[0]))
+
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def kill_tree(pid, grace=3.0):
+    """Terminate pid and all its descendants; SIGKILL whatever survives `grace` seconds"""
+    if IS_WINDOWS:
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+
+    # Snapshot first: once the parent dies its children are re-parented and can't be found from it
+    descendants = _descendants(pid)
+    try:
+        group = os.getpgid(pid)
+    except OSError:
+        group = None
+
+    def signal_all(sig):
+        if group is not None and group != os.getpgrp():
+            try:
+                os.killpg(group, sig)
+            except OSError:
+                pass
+        for target in [pid] + descendants:
+            try:
+                os.kill(target, sig)
+            except OSError:
+                pass
+
+    signal_all(signal.SIGTERM)
+    if psutil is not None:
+        processes = []
+        for target in [pid] + descendants:
+            try:
+                processes.append(psutil.Process(target))
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(processes, timeout=grace)
+        if not alive:
+            return
+    else:
+        time.sleep(min(grace, 1.0))
+    signal_all(signal.SIGKILL)
+
+
+def tree_usage(pid):
+    """(RSS in MB, CPU seconds) summed over pid and its descendants; None without psutil"""
+    if psutil is None:
+        return None
+    rss = cpu = 0.0
+    try:
+        processes = [psutil.Process(pid)] + psutil.Process(pid).children(recursive=True)
+    except psutil.Error:
+        return None
+    for process in processes:
+        try:
+            rss += process.memory_info().rss / (1024 * 1024)
+            times = process.cpu_times()
+            cpu += times.user + times.system
+        except psutil.Error:
+            continue
+    return rss, cpu
+
+
+class ProcessWatchdog:
+    """
+    Usage:
+        with ProcessWatchdog(timeout=120, max_rss_mb=3000) as watchdog:
+            process = watchdog.start(['python', 'audit.py', ...], stdout=subprocess.PIPE)
+            ... read process.stdout ...
+            process.wait()
+        if watchdog.reason: ...   # 'timeout', 'memory' or 'cpu' when the tree was killed
+    """
+
+    def __init__(self, timeout=120, max_rss_mb=None, max_cpu_seconds=None, poll_interval=1.0):
+        """
+        Args:
+            timeout: Wall-clock budget in seconds
+            max_rss_mb: Limit for the RSS of the whole process tree (needs psutil)
+            max_cpu_seconds: Limit for the tree's total user+system CPU time (needs psutil)
+            poll_interval: Seconds between checks
+        """
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_seconds = max_cpu_seconds
+        self.poll_interval = poll_interval
+        self.process = None
+        self.reason = None  # Why the tree was killed, None if it wasn't
+        self.detail = None
+        self.peak_rss_mb = 0.0
+        self._stop = threading.Event()
+        self._monitor = None
+
+    def start(self, args, **popen_kwargs):
+        """Popen args in a new process group/session and start watching it"""
+        if IS_WINDOWS:
+            popen_kwargs['creationflags'] = popen_kwargs.get('creationflags', 0) | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            popen_kwargs['start_new_session'] = True
+
+        self.process = subprocess.Popen(args, **popen_kwargs)
+        self._monitor = threading.Thread(target=self._watch, daemon=True, name='watchdog')
+        self._monitor.start()
+        return self.process
+
+    def _watch(self):
+        deadline = time.monotonic() + self.timeout
+        limited = psutil is not None and (self.max_rss_mb or self.max_cpu_seconds)
+
+        while not self._stop.wait(self.poll_interval):
+            if self.process.poll() is not None:
+                return
+
+            if time.monotonic() >= deadline:
+                self._kill('timeout', f"exceeded {self.timeout:.0f} seconds")
+                return
+
+            if not limited:
+                continue
+            usage = tree_usage(self.process.pid)
+            if usage is None:
+                continue
+            rss, cpu = usage
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            if self.max_rss_mb and rss > self.max_rss_mb:
+                self._kill('memory', f"process tree RSS {rss:.0f} MB over the {self.max_rss_mb:.0f} MB limit")
+                return
+            if self.max_cpu_seconds and cpu > self.max_cpu_seconds:
+                self._kill('cpu', f"process tree used {cpu:.0f} CPU-seconds (limit {self.max_cpu_seconds:.0f})")
+                return
+
+    def _kill(self, reason, detail):
+        self.reason = reason
+        self.detail = detail
+        kill_tree(self.process.pid)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join()
+        if self.process is None:
+            return False
+
+        if self.process.poll() is None:
+            # Caller bailed out (exception) while the audit was still running
+            kill_tree(self.process.pid)
+        elif not IS_WINDOWS:
+            # The audit exited; anything left in its session (an orphaned chromedriver/Chrome) goes too
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self.process.wait()
+        return False